@@ -0,0 +1,59 @@
+"""add_account_balances
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "account_balances",
+        sa.Column(
+            "account_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("accounts.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("transactions_total", sa.Numeric(18, 6), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+    # Backfill the ledger from existing transactions
+    op.execute(
+        """
+        INSERT INTO account_balances (account_id, transactions_total)
+        SELECT account_id, SUM(amount)
+        FROM (
+            SELECT
+                account_id,
+                CASE
+                    WHEN type = 'income' THEN COALESCE(amount_account, amount)
+                    WHEN type IN ('expense', 'transfer') THEN -COALESCE(amount_account, amount)
+                    ELSE 0
+                END AS amount
+            FROM transactions
+            UNION ALL
+            SELECT transfer_to_account_id, COALESCE(amount_account, amount)
+            FROM transactions
+            WHERE type = 'transfer' AND transfer_to_account_id IS NOT NULL
+        ) AS movements
+        GROUP BY account_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("account_balances")
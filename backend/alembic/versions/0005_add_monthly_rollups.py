@@ -0,0 +1,56 @@
+"""add_monthly_rollups
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "monthly_rollups",
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("year_month", sa.String(7), primary_key=True),
+        sa.Column("category_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("type", sa.String(16), primary_key=True),
+        sa.Column("amount_base", sa.Numeric(18, 6), nullable=False, server_default="0"),
+        sa.Column("tx_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # Backfill from existing transactions; uncategorized rows use the all-zero UUID
+    op.execute(
+        """
+        INSERT INTO monthly_rollups (user_id, year_month, category_id, type, amount_base, tx_count)
+        SELECT
+            user_id,
+            to_char(date, 'YYYY-MM'),
+            COALESCE(category_id, '00000000-0000-0000-0000-000000000000'::uuid),
+            type,
+            SUM(amount_base),
+            COUNT(*)
+        FROM transactions
+        WHERE type IN ('income', 'expense')
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("monthly_rollups")
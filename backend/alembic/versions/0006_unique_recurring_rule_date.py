@@ -0,0 +1,53 @@
+"""unique_recurring_rule_date
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicates left by concurrent job runs would block the index. Keep the oldest
+    # row per (rule, date) linked and detach the rest, so balances and rollups
+    # stay as they are and the extra rows remain visible as manual transactions.
+    op.execute(
+        """
+        UPDATE transactions SET recurring_rule_id = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY recurring_rule_id, date ORDER BY created_at, id
+                ) AS rn
+                FROM transactions
+                WHERE recurring_rule_id IS NOT NULL
+            ) ranked
+            WHERE rn > 1
+        )
+        """
+    )
+
+    # The composite index also serves lookups by recurring_rule_id alone
+    op.drop_index("ix_transactions_recurring_rule_id", table_name="transactions")
+    op.create_index(
+        "uq_transactions_recurring_rule_date",
+        "transactions",
+        ["recurring_rule_id", "date"],
+        unique=True,
+        postgresql_where=sa.text("recurring_rule_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_transactions_recurring_rule_date", table_name="transactions")
+    op.create_index("ix_transactions_recurring_rule_id", "transactions", ["recurring_rule_id"])
@@ -0,0 +1,71 @@
+"""add_budget_period_spend
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "budget_period_spend",
+        sa.Column(
+            "budget_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("budgets.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("category_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("period_start", sa.Date(), primary_key=True),
+        sa.Column("amount", sa.Numeric(18, 6), nullable=False, server_default="0"),
+        sa.Column("tx_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # Backfill from existing budgeted expenses. Periods match budget_period_bounds:
+    # calendar months and years, weeks from Monday, and a single period from the
+    # start date for custom budgets, each clipped to start on or after the budget's
+    # start date. Expenses outside the budget's dates are not counted.
+    op.execute(
+        """
+        INSERT INTO budget_period_spend (budget_id, category_id, period_start, amount, tx_count)
+        SELECT
+            b.id,
+            COALESCE(t.category_id, '00000000-0000-0000-0000-000000000000'::uuid),
+            GREATEST(
+                CASE b.period_type
+                    WHEN 'monthly' THEN date_trunc('month', t.date)::date
+                    WHEN 'weekly' THEN date_trunc('week', t.date)::date
+                    WHEN 'yearly' THEN date_trunc('year', t.date)::date
+                    ELSE b.start_date
+                END,
+                b.start_date
+            ),
+            SUM(
+                CASE WHEN t.account_currency = b.currency AND t.amount_account IS NOT NULL
+                     THEN t.amount_account ELSE t.amount END
+            ),
+            COUNT(*)
+        FROM transactions t
+        JOIN budgets b ON b.id = t.budget_id
+        WHERE t.type = 'expense'
+          AND t.date >= b.start_date
+          AND (b.end_date IS NULL OR t.date <= b.end_date)
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("budget_period_spend")
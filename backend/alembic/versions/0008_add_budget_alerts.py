@@ -0,0 +1,54 @@
+"""add_budget_alerts
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "budget_alerts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "budget_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("budgets.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("category_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("threshold", sa.Integer(), nullable=False),
+        sa.Column("spent_amount", sa.Numeric(18, 6), nullable=False),
+        sa.Column("limit_amount", sa.Numeric(18, 6), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+        sa.Column("delivered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint(
+            "budget_id", "category_id", "period_start", "threshold", name="uq_budget_alert"
+        ),
+    )
+    # The delivery job only ever scans undelivered rows
+    op.create_index(
+        "ix_budget_alerts_pending",
+        "budget_alerts",
+        ["created_at"],
+        postgresql_where=sa.text("delivered_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("budget_alerts")
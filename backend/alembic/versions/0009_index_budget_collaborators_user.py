@@ -0,0 +1,29 @@
+"""index_budget_collaborators_user
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Budget listings and access maps look collaborators up by user. The unique
+    # (budget_id, user_id) constraint only serves lookups by budget.
+    op.create_index(
+        "ix_budget_collaborators_user_accepted",
+        "budget_collaborators",
+        ["user_id", "accepted_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_budget_collaborators_user_accepted", table_name="budget_collaborators")
@@ -17,9 +17,57 @@ class Settings(BaseSettings):
     # Currency
     base_currency: str = "USD"
     frankfurter_base_url: str = "https://api.frankfurter.app"
+    # Bases fetched by the nightly refresh, so that direct lookups by any common
+    # user base_currency work; fetched concurrently, at most this many at a time
+    exchange_rate_bases: List[str] = ["EUR", "USD", "GBP", "CHF", "JPY", "CAD", "AUD"]
+    exchange_rate_fetch_concurrency: int = 4
+    # Historical rate backfill: the weekly job refills gaps in the last N days;
+    # ranges are fetched in chunks; a JSON file path replaces the Frankfurter API
+    rate_backfill_days: int = 30
+    rate_backfill_chunk_days: int = 90
+    rate_backfill_source: str = ""
+
+    # Statement import: rows inserted (and committed) per chunk
+    import_chunk_size: int = 1000
+
+    # Report result cache (in-process LRU)
+    report_cache_enabled: bool = True
+    report_cache_max_entries: int = 2048
+    report_cache_ttl_seconds: int = 300
+
+    # Exchange rate snapshot (in-process); reloaded after refreshes and when older than this
+    rate_cache_ttl_seconds: int = 900
+    # Currency through which pairs without a stored rate are triangulated
+    rate_pivot_currency: str = "EUR"
+    # Days of rate history kept in memory for as-of lookups; older dates query the DB
+    rate_cache_history_days: int = 730
+
+    # Authenticated user rows (in-process, keyed by token sub); writes invalidate on commit
+    user_cache_enabled: bool = True
+    user_cache_max_entries: int = 10000
+    user_cache_ttl_seconds: int = 60
+    # Verified token claims (in-process, keyed by token digest); entries expire at the token's exp
+    token_cache_enabled: bool = True
+    token_cache_max_entries: int = 10000
+
+    # Per-user budget access maps (budget_id -> role); collaborator changes invalidate on commit
+    budget_access_cache_enabled: bool = True
+    budget_access_cache_max_entries: int = 10000
+    budget_access_cache_ttl_seconds: int = 60
+
+    # Budget alerts: percentages of a category limit whose crossing writes an outbox row
+    # (empty disables); the delivery job drains the outbox in batches of this size
+    budget_alert_thresholds: List[int] = [80, 100]
+    budget_alert_delivery_batch_size: int = 500
+
+    # bcrypt runs in its own thread pool; logins beyond the queue limit get 503
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 64
 
     # Scheduler
     scheduler_timezone: str = "UTC"
+    # Recurring rules processed (and committed) per chunk by the generation job
+    recurring_chunk_size: int = 1000
 
     # Local auth
     local_auth_enabled: bool = False
@@ -1,5 +1,5 @@
 from collections.abc import AsyncGenerator
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -10,7 +10,14 @@ from app.config import get_settings
 from app.db.session import get_db
 from app.models.user import User
 from app.repositories.user import UserRepository
-from app.services.auth import get_or_create_user, validate_local_token, validate_oidc_token
+from app.services.auth import (
+    get_or_create_user,
+    jwks_generation,
+    validate_local_token,
+    validate_oidc_token,
+)
+from app.services.token_cache import claims_cache
+from app.services.user_cache import user_cache
 
 settings = get_settings()
 bearer_scheme = HTTPBearer()
@@ -20,7 +27,23 @@ async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
     session: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
-    token = credentials.credentials
+    claims = await _verify_token(credentials.credentials)
+    auth_provider = "local" if claims.get("iss") == "local" else "oidc"
+
+    sub = claims["sub"]
+    user = user_cache.get(session, sub) or await user_cache.load(session, sub)
+    if user is not None:
+        return user
+    user_repo = UserRepository(session)
+    return await get_or_create_user(claims, user_repo, auth_provider)
+
+
+async def _verify_token(token: str) -> dict[str, Any]:
+    """Return the token's verified claims, from the claims cache when possible."""
+    claims = claims_cache.get(token, jwks_generation())
+    if claims is not None:
+        return claims
+
     try:
         # Peek at the issuer without full validation
         from jose import jwt as jose_jwt
@@ -38,10 +61,11 @@ async def get_current_user(
                     },
                 )
             claims = validate_local_token(token)
-            auth_provider = "local"
+            claims_cache.put(token, claims, None)
         else:
             claims = await validate_oidc_token(token)
-            auth_provider = "oidc"
+            # Validation may have refreshed the JWKS; tag the entry with the keys it passed
+            claims_cache.put(token, claims, jwks_generation())
 
     except JWTError as exc:
         raise HTTPException(
@@ -49,8 +73,7 @@ async def get_current_user(
             detail={"detail": "Invalid or expired token", "code": "invalid_token"},
         ) from exc
 
-    user_repo = UserRepository(session)
-    return await get_or_create_user(claims, user_repo, auth_provider)
+    return claims
 
 
 async def get_admin_user(user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,46 @@
+"""Background job: deliver budget threshold alerts from the outbox (v1: log only)."""
+
+import logging
+from datetime import UTC, datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.repositories.budget import BudgetAlertRepository
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+async def deliver_pending(session: AsyncSession, batch_size: int) -> int:
+    """Deliver undelivered alerts in batches, committing each; returns how many were sent."""
+    repo = BudgetAlertRepository(session)
+    delivered = 0
+    while alerts := await repo.get_pending(batch_size):
+        for alert in alerts:
+            logger.info(
+                "Budget alert: budget_id=%s category_id=%s period_start=%s threshold=%d%% "
+                "spent=%s limit=%s",
+                alert.budget_id,
+                alert.category_id,
+                alert.period_start,
+                alert.threshold,
+                alert.spent_amount,
+                alert.limit_amount,
+            )
+        await repo.mark_delivered([a.id for a in alerts], datetime.now(UTC))
+        await session.commit()
+        delivered += len(alerts)
+    return delivered
+
+
+async def deliver_budget_alerts() -> None:
+    """Drain the budget_alerts outbox. Alerts are only marked delivered once sent."""
+    async with AsyncSessionLocal() as session:
+        try:
+            delivered = await deliver_pending(session, settings.budget_alert_delivery_batch_size)
+            if delivered:
+                logger.info("Budget alert delivery complete: %d alerts", delivered)
+        except Exception as exc:
+            logger.error("Error delivering budget alerts: %s", exc)
@@ -1,26 +1,35 @@
 """Background job: fetch and cache exchange rates from Frankfurter API."""
 
+import asyncio
 import logging
+import time
 import uuid
+from collections.abc import Iterable
 from datetime import date, datetime, timezone
+from decimal import Decimal
 
 import httpx
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.db.session import AsyncSessionLocal
+from app.repositories.currency import ExchangeRateRepository
+from app.services.rate_cache import rate_cache
+from app.services.report_cache import invalidate_all
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# Bases to fetch so that lookups by any common user base_currency work.
-_BASES_TO_FETCH = ["EUR", "USD", "GBP", "CHF", "JPY", "CAD", "AUD"]
+FetchResult = tuple[str, date, dict]
 
 
-async def _fetch_for_base(client: httpx.AsyncClient, base: str) -> tuple[str, date, dict] | None:
+async def _fetch_for_base(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, base: str
+) -> FetchResult | None:
     url = f"{settings.frankfurter_base_url}/latest?base={base}"
     try:
-        resp = await client.get(url)
+        async with semaphore:
+            resp = await client.get(url)
         resp.raise_for_status()
         data = resp.json()
         return data.get("base", base), date.fromisoformat(data["date"]), data.get("rates", {})
@@ -29,47 +38,74 @@ async def _fetch_for_base(client: httpx.AsyncClient, base: str) -> tuple[str, da
         return None
 
 
+async def fetch_latest_rates(
+    client: httpx.AsyncClient, bases: Iterable[str], concurrency: int
+) -> list[FetchResult]:
+    """Fetch every base concurrently, at most ``concurrency`` requests in flight.
+
+    Wall-clock time grows with ``len(bases) / concurrency`` rather than with the
+    number of bases. Bases that fail are logged and left out.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(
+        *(_fetch_for_base(client, semaphore, base) for base in bases)
+    )
+    return [r for r in results if r is not None]
+
+
+async def store_rates(session: AsyncSession, results: Iterable[FetchResult]) -> int:
+    """Upsert fetched rates with one multi-row statement per base. Returns rows written."""
+    repo = ExchangeRateRepository(session)
+    fetched_at = datetime.now(timezone.utc)
+    total = 0
+    for base, rate_date, rates in results:
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "base_currency": base,
+                "target_currency": target,
+                "rate": Decimal(str(rate)),
+                "date": rate_date,
+                "fetched_at": fetched_at,
+            }
+            for target, rate in rates.items()
+        ]
+        await repo.upsert_many(rows)
+        total += len(rows)
+    return total
+
+
 async def refresh_exchange_rates() -> None:
-    """Fetch latest rates for multiple base currencies and upsert. Idempotent."""
+    """Fetch latest rates for the configured base currencies and upsert. Idempotent."""
     logger.info("Starting exchange rate refresh")
+    started = time.perf_counter()
 
     async with httpx.AsyncClient(timeout=30) as client:
-        results = []
-        for base in _BASES_TO_FETCH:
-            result = await _fetch_for_base(client, base)
-            if result:
-                results.append(result)
+        results = await fetch_latest_rates(
+            client, settings.exchange_rate_bases, settings.exchange_rate_fetch_concurrency
+        )
+    fetched = time.perf_counter()
 
     if not results:
         logger.error("No exchange rates could be fetched")
         return
 
-    now = datetime.now(timezone.utc).isoformat()
     async with AsyncSessionLocal() as session:
         try:
-            for base, rate_date, rates in results:
-                for target, rate in rates.items():
-                    await session.execute(
-                        text(
-                            """
-                            INSERT INTO exchange_rates (id, base_currency, target_currency, rate, date, fetched_at)
-                            VALUES (:id, :base, :target, :rate, :date, :fetched_at)
-                            ON CONFLICT (base_currency, target_currency, date)
-                            DO UPDATE SET rate = EXCLUDED.rate, fetched_at = EXCLUDED.fetched_at
-                            """
-                        ),
-                        {
-                            "id": str(uuid.uuid4()),
-                            "base": base,
-                            "target": target,
-                            "rate": rate,
-                            "date": rate_date,
-                            "fetched_at": now,
-                        },
-                    )
+            total = await store_rates(session, results)
+            stored = time.perf_counter()
+            invalidate_all(session)
             await session.commit()
-            total = sum(len(r[2]) for r in results)
-            logger.info("Exchange rates refreshed: %d rows across %d bases", total, len(results))
+            await rate_cache.load(ExchangeRateRepository(session))
+            logger.info(
+                "Exchange rates refreshed: %d rows across %d bases "
+                "(fetch %.3fs, upsert %.3fs, commit+reload %.3fs)",
+                total,
+                len(results),
+                fetched - started,
+                stored - fetched,
+                time.perf_counter() - stored,
+            )
         except Exception as exc:
             await session.rollback()
             logger.error("Failed to store exchange rates: %s", exc)
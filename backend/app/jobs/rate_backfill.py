@@ -0,0 +1,137 @@
+"""Background job: backfill historical exchange rates in date-range chunks."""
+
+import logging
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import UTC, date, datetime, timedelta
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.repositories.currency import ExchangeRateRepository
+from app.services.rate_cache import rate_cache
+from app.services.rate_providers import FileRateProvider, FrankfurterProvider, RateProvider
+from app.services.report_cache import invalidate_all
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def date_chunks(from_date: date, to_date: date, chunk_days: int) -> Iterator[tuple[date, date]]:
+    """Split [from_date, to_date] into consecutive ranges of at most ``chunk_days`` days."""
+    start = from_date
+    while start <= to_date:
+        end = min(start + timedelta(days=chunk_days - 1), to_date)
+        yield start, end
+        start = end + timedelta(days=1)
+
+
+def _is_complete(existing: set[date], start: date, end: date) -> bool:
+    """Whether a chunk was already backfilled.
+
+    Rates are only published on business days, and a few of those are holidays.
+    So a chunk counts as done once at most one weekday in twenty is missing.
+    """
+    weekdays = [
+        start + timedelta(days=i)
+        for i in range((end - start).days + 1)
+        if (start + timedelta(days=i)).weekday() < 5
+    ]
+    missing = sum(1 for day in weekdays if day not in existing)
+    return missing <= len(weekdays) // 20
+
+
+async def backfill_rates(
+    session: AsyncSession,
+    provider: RateProvider,
+    bases: Iterable[str],
+    from_date: date,
+    to_date: date,
+    chunk_days: int,
+) -> int:
+    """Fill exchange_rates for every base over [from_date, to_date]. Returns rows inserted.
+
+    Each chunk is fetched as one time-series request and committed with bulk
+    inserts, so an interrupted run keeps its progress. Chunks that are already
+    complete are not fetched again, and rates already stored for a (pair, date)
+    are never overwritten. A rerun therefore resumes where the last one stopped.
+    """
+    repo = ExchangeRateRepository(session)
+    inserted = 0
+    for base in bases:
+        existing = await repo.get_dates(base, from_date, to_date)
+        for start, end in date_chunks(from_date, to_date, chunk_days):
+            if _is_complete(existing, start, end):
+                continue
+            t0 = time.perf_counter()
+            try:
+                series = await provider.time_series(base, start, end)
+            except Exception as exc:
+                logger.warning("Failed to fetch rates for base=%s %s..%s: %s", base, start, end, exc)
+                continue
+            fetched_at = datetime.now(UTC)
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "base_currency": base,
+                    "target_currency": target,
+                    "rate": rate,
+                    "date": day,
+                    "fetched_at": fetched_at,
+                }
+                for day, rates in series.items()
+                for target, rate in rates.items()
+                if target != base
+            ]
+            t1 = time.perf_counter()
+            written = await repo.insert_missing(rows)
+            invalidate_all(session)
+            await session.commit()
+            existing.update(series)
+            inserted += written
+            logger.info(
+                "Rate backfill %s %s..%s: %d rows (fetch %.3fs, insert+commit %.3fs)",
+                base,
+                start,
+                end,
+                written,
+                t1 - t0,
+                time.perf_counter() - t1,
+            )
+
+    if inserted and rate_cache.loaded:
+        await rate_cache.load(repo)
+    logger.info("Rate backfill complete: %d rows between %s and %s", inserted, from_date, to_date)
+    return inserted
+
+
+async def backfill_recent_exchange_rates() -> None:
+    """Fill gaps in the last ``rate_backfill_days`` left by failed nightly refreshes."""
+    to_date = date.today()
+    from_date = to_date - timedelta(days=settings.rate_backfill_days)
+
+    async with httpx.AsyncClient(timeout=30) as client:
+        async with AsyncSessionLocal() as session:
+            try:
+                await backfill_rates(
+                    session,
+                    rate_provider(client),
+                    settings.exchange_rate_bases,
+                    from_date,
+                    to_date,
+                    settings.rate_backfill_chunk_days,
+                )
+            except Exception as exc:
+                await session.rollback()
+                logger.error("Error backfilling exchange rates: %s", exc)
+
+
+def rate_provider(client: httpx.AsyncClient, source: str | None = None) -> RateProvider:
+    """Return the file provider for ``source`` (or ``rate_backfill_source``), else Frankfurter."""
+    source = source or settings.rate_backfill_source
+    if source:
+        return FileRateProvider(source)
+    return FrankfurterProvider(client, settings.frankfurter_base_url)
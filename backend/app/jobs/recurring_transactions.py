@@ -1,82 +1,233 @@
 """Background job: generate transactions for due recurring rules."""
 
 import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
 from datetime import date
 from decimal import Decimal
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
 from app.db.session import AsyncSessionLocal
+from app.models.recurring import RecurringRule
+from app.repositories.account import AccountRepository
 from app.repositories.currency import ExchangeRateRepository
 from app.repositories.recurring import RecurringRepository
 from app.repositories.transaction import TransactionRepository
 from app.repositories.user import UserRepository
-from app.utils.currency import get_rate_or_1
+from app.schemas.transaction import TransactionCreate
+from app.services.transaction import build_transaction_row
+from app.services.transaction_effects import TransactionEffects
+from app.utils.currency import get_rates_or_1
 from app.utils.date_utils import next_occurrence
 
 logger = logging.getLogger(__name__)
 
 
+# (dates to generate, (next_occurrence, status) to store or None to leave the rule alone)
+RulePlan = tuple[list[date], tuple[date, str] | None]
+
+
+def expand_occurrences(
+    first: date, frequency: str, until: date, end_date: date | None
+) -> tuple[list[date], date]:
+    """Return every occurrence from ``first`` through ``until`` (capped at ``end_date``).
+
+    Also returns the first occurrence after them, which becomes the rule's
+    ``next_occurrence``.
+    """
+    last = min(until, end_date) if end_date else until
+    occurrences = []
+    current = first
+    while current <= last:
+        occurrences.append(current)
+        current = next_occurrence(current, frequency)
+    return occurrences, current
+
+
+def _schedule_after(rule: RecurringRule, following: date) -> tuple[date, str]:
+    if rule.end_date and following > rule.end_date:
+        return following, "cancelled"
+    return following, rule.status
+
+
 async def generate_recurring_transactions() -> None:
-    """Create transactions for all active recurring rules due today. Idempotent."""
+    """Create transactions for every occurrence due up to today, including missed ones. Idempotent."""
     today = date.today()
-    logger.info("Generating recurring transactions for %s", today)
+    logger.info("Generating recurring transactions up to %s", today)
 
     async with AsyncSessionLocal() as session:
         try:
-            recurring_repo = RecurringRepository(session)
-            tx_repo = TransactionRepository(session)
-            rate_repo = ExchangeRateRepository(session)
-            user_repo = UserRepository(session)
-
-            due_rules = await recurring_repo.get_due_today(today)
-            logger.info("Found %d due rules", len(due_rules))
-
-            for rule in due_rules:
-                # Skip if already generated for today (idempotency)
-                if await tx_repo.exists_for_rule_and_date(rule.id, today):
-                    logger.debug("Skipping rule %s: already has transaction for %s", rule.id, today)
-                    # Still advance next_occurrence if needed
-                    if rule.next_occurrence <= today:
-                        rule.next_occurrence = next_occurrence(today, rule.frequency)
-                        session.add(rule)
-                    continue
-
-                # Get user base currency for amount_base
-                user = await user_repo.get(rule.user_id)
-                base_currency = user.base_currency if user else "USD"
-
-                rate = await get_rate_or_1(rate_repo, rule.currency, base_currency)
-                amount = Decimal(str(rule.amount))
-                amount_base = amount * rate
-
-                await tx_repo.create(
-                    user_id=rule.user_id,
-                    account_id=rule.account_id,
-                    category_id=rule.category_id,
-                    budget_id=rule.budget_id,
-                    recurring_rule_id=rule.id,
-                    type=rule.type,
-                    amount=amount,
-                    currency=rule.currency,
-                    amount_base=amount_base,
-                    exchange_rate=rate,
-                    date=today,
-                    notes=f"Auto-generated from recurring rule: {rule.name}",
-                )
-
-                # Advance next_occurrence
-                new_next = next_occurrence(today, rule.frequency)
-                # Cancel if past end_date
-                if rule.end_date and new_next > rule.end_date:
-                    rule.status = "cancelled"
-                else:
-                    rule.next_occurrence = new_next
-                session.add(rule)
-                logger.info("Generated transaction for rule %s (%s)", rule.id, rule.name)
-
-            await session.commit()
-            logger.info("Recurring transaction generation complete")
-
+            await generate_due(session, today, get_settings().recurring_chunk_size)
         except Exception as exc:
             await session.rollback()
             logger.error("Error generating recurring transactions: %s", exc)
             raise
+
+
+async def generate_due(session: AsyncSession, up_to: date, chunk_size: int) -> int:
+    """Generate all occurrences from each due rule's ``next_occurrence`` through ``up_to``.
+
+    If the scheduler missed days, every skipped occurrence is created with its own
+    date rather than collapsing into one transaction dated today. Returns the
+    number of transactions created.
+    """
+    recurring_repo = RecurringRepository(session)
+
+    def plan(rule: RecurringRule) -> RulePlan:
+        occurrences, following = expand_occurrences(
+            rule.next_occurrence, rule.frequency, up_to, rule.end_date
+        )
+        return occurrences, _schedule_after(rule, following)
+
+    async def batches(after_id: uuid.UUID | None) -> list[RecurringRule]:
+        return await recurring_repo.get_due_batch(up_to, after_id, chunk_size)
+
+    return await _run(session, batches, plan)
+
+
+async def backfill_range(
+    session: AsyncSession, from_date: date, to_date: date, chunk_size: int
+) -> int:
+    """Generate every occurrence of active rules falling within [from_date, to_date].
+
+    Occurrences are expanded from each rule's ``start_date``. Dates that already
+    have a generated transaction are skipped, so ranges can overlap earlier runs.
+    Rules whose ``next_occurrence`` lies inside the range are advanced past it;
+    a rule still behind ``from_date`` keeps its ``next_occurrence`` so the dates
+    before the range are left for ``generate_due``.
+    """
+    recurring_repo = RecurringRepository(session)
+
+    def plan(rule: RecurringRule) -> RulePlan:
+        occurrences, following = expand_occurrences(
+            rule.start_date, rule.frequency, to_date, rule.end_date
+        )
+        in_range = [d for d in occurrences if d >= from_date]
+        if not from_date <= rule.next_occurrence <= to_date:
+            return in_range, None
+        return in_range, _schedule_after(rule, following)
+
+    async def batches(after_id: uuid.UUID | None) -> list[RecurringRule]:
+        return await recurring_repo.get_active_in_range_batch(
+            from_date, to_date, after_id, chunk_size
+        )
+
+    return await _run(session, batches, plan)
+
+
+async def _run(
+    session: AsyncSession,
+    batches: Callable[[uuid.UUID | None], Awaitable[list[RecurringRule]]],
+    plan: Callable[[RecurringRule], RulePlan],
+) -> int:
+    started = time.perf_counter()
+    created_total = 0
+    chunks = 0
+    after_id = None
+
+    while True:
+        rules = await batches(after_id)
+        if not rules:
+            break
+        after_id = rules[-1].id
+        chunks += 1
+        created_total += await _generate_chunk(
+            session, rules, {rule.id: plan(rule) for rule in rules}, chunks
+        )
+
+    logger.info(
+        "Recurring transaction generation complete: %d transactions from %d chunks in %.2fs",
+        created_total,
+        chunks,
+        time.perf_counter() - started,
+    )
+    return created_total
+
+
+async def _generate_chunk(
+    session: AsyncSession,
+    rules: list[RecurringRule],
+    plans: dict[uuid.UUID, RulePlan],
+    chunk_no: int,
+) -> int:
+    """Insert one chunk's planned occurrences with a fixed number of queries and commit.
+
+    One query each prefetches users' base currencies and account currencies;
+    rates come from the in-process snapshot (per occurrence date). Then come one INSERT ... ON CONFLICT DO NOTHING, the
+    ledger/rollup upserts for the rows actually inserted, and a single UPDATE
+    advancing the rules. Occurrences that were already generated hit the
+    unique (recurring_rule_id, date) index and are skipped, so reruns and
+    overlapping runs create no duplicates.
+    """
+    t0 = time.perf_counter()
+    base_currencies = await UserRepository(session).get_base_currencies(
+        {r.user_id for r in rules}
+    )
+    account_currencies = await AccountRepository(session).get_currencies(
+        {r.account_id for r in rules}
+    )
+
+    pending = [(rule, day) for rule in rules for day in plans[rule.id][0]]
+    pairs_by_day: dict[date, set[tuple[str, str]]] = {}
+    for rule, day in pending:
+        pairs = pairs_by_day.setdefault(day, set())
+        pairs.add((rule.currency, account_currencies.get(rule.account_id, rule.currency)))
+        pairs.add((rule.currency, base_currencies.get(rule.user_id, "USD")))
+    rate_repo = ExchangeRateRepository(session)
+    # Backfilled occurrences are converted at the rate in force on their own date
+    rates = {
+        day: await get_rates_or_1(rate_repo, pairs, on=day)
+        for day, pairs in pairs_by_day.items()
+    }
+    t1 = time.perf_counter()
+
+    rows = []
+    for rule, day in pending:
+        account_currency = account_currencies.get(rule.account_id, rule.currency)
+        base_currency = base_currencies.get(rule.user_id, "USD")
+        item = TransactionCreate(
+            account_id=rule.account_id,
+            category_id=rule.category_id,
+            budget_id=rule.budget_id,
+            type=rule.type,
+            amount=Decimal(str(rule.amount)),
+            currency=rule.currency,
+            date=day,
+            notes=f"Auto-generated from recurring rule: {rule.name}",
+        )
+        row = build_transaction_row(
+            rule.user_id,
+            item,
+            account_currency,
+            rates[day][(rule.currency, account_currency)],
+            rates[day][(rule.currency, base_currency)],
+        )
+        row["recurring_rule_id"] = rule.id
+        rows.append(row)
+
+    created = await TransactionRepository(session).create_many_for_rules(rows)
+    await TransactionEffects(session).apply(created)
+    t2 = time.perf_counter()
+
+    schedule = {rule_id: s for rule_id, (_, s) in plans.items() if s is not None}
+    await RecurringRepository(session).advance_many(schedule)
+    await session.commit()
+    # Loaded rules are stale after the bulk UPDATE and no longer needed
+    session.expunge_all()
+    t3 = time.perf_counter()
+
+    logger.info(
+        "Recurring chunk %d: %d rules, %d created, %d already present "
+        "(prefetch %.3fs, insert %.3fs, advance+commit %.3fs)",
+        chunk_no,
+        len(rules),
+        len(created),
+        len(pending) - len(created),
+        t1 - t0,
+        t2 - t1,
+        t3 - t2,
+    )
+    return len(created)
@@ -6,7 +6,9 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from app.config import get_settings
+from app.jobs.budget_alerts import deliver_budget_alerts
 from app.jobs.exchange_rates import refresh_exchange_rates
+from app.jobs.rate_backfill import backfill_recent_exchange_rates
 from app.jobs.recurring_transactions import generate_recurring_transactions
 from app.jobs.subscription_alerts import send_subscription_alerts
 
@@ -25,6 +27,13 @@ def setup_scheduler() -> AsyncIOScheduler:
         replace_existing=True,
         name="Refresh Exchange Rates",
     )
+    scheduler.add_job(
+        backfill_recent_exchange_rates,
+        CronTrigger(day_of_week="sun", hour=0, minute=45, timezone=settings.scheduler_timezone),
+        id="backfill_recent_exchange_rates",
+        replace_existing=True,
+        name="Backfill Recent Exchange Rates",
+    )
     scheduler.add_job(
         generate_recurring_transactions,
         CronTrigger(hour=1, minute=0, timezone=settings.scheduler_timezone),
@@ -39,5 +48,13 @@ def setup_scheduler() -> AsyncIOScheduler:
         replace_existing=True,
         name="Send Subscription Alerts",
     )
+    scheduler.add_job(
+        deliver_budget_alerts,
+        CronTrigger(minute="*", timezone=settings.scheduler_timezone),
+        id="deliver_budget_alerts",
+        replace_existing=True,
+        name="Deliver Budget Alerts",
+        max_instances=1,
+    )
     logger.info("Scheduler jobs registered")
     return scheduler
@@ -17,6 +17,7 @@ from app.middleware.error_handler import (
     validation_exception_handler,
 )
 from app.middleware.logging import LoggingMiddleware
+from app.repositories.currency import ExchangeRateRepository
 from app.routers import (
     accounts,
     admin,
@@ -29,6 +30,9 @@ from app.routers import (
     transactions,
     users,
 )
+from app.services.auth import close_http_client
+from app.services.passwords import hash_password, password_pool
+from app.services.rate_cache import rate_cache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -58,6 +62,8 @@ async def lifespan(app: FastAPI):  # type: ignore[type-arg]
         logger.info("Currencies seeded")
         await seed_exchange_rates(session)
         logger.info("Exchange rates bootstrapped")
+        await rate_cache.load(ExchangeRateRepository(session))
+        logger.info("Exchange rate cache loaded")
 
     # Fetch live rates immediately so the app starts with fresh data.
     # Runs in the background — startup is not blocked if the API is unreachable.
@@ -77,6 +83,8 @@ async def lifespan(app: FastAPI):  # type: ignore[type-arg]
     # Shutdown
     scheduler.shutdown(wait=False)
     logger.info("Scheduler stopped")
+    await close_http_client()
+    password_pool.shutdown()
 
 
 async def _seed_dev_user() -> None:
@@ -86,13 +94,12 @@ async def _seed_dev_user() -> None:
     connection as uvicorn — manage.py cannot reach an in-memory database.
     """
     import os
-    import bcrypt
     from app.repositories.user import LocalUserRepository, UserRepository
 
     email = os.environ.get("DEV_EMAIL", "dev@example.com")
     password = os.environ.get("DEV_PASSWORD", "password")
     display_name = os.environ.get("DEV_NAME", "Dev User")
-    password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    password_hash = await hash_password(password)
 
     async with AsyncSessionLocal() as session:
         user_repo = UserRepository(session)
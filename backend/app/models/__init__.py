@@ -1,11 +1,18 @@
 """Re-export all models so Alembic sees full Base.metadata."""
 
 from app.db.base import Base
-from app.models.account import Account
-from app.models.budget import Budget, BudgetCategory, BudgetCollaborator
+from app.models.account import Account, AccountBalance
+from app.models.budget import (
+    Budget,
+    BudgetAlert,
+    BudgetCategory,
+    BudgetCollaborator,
+    BudgetPeriodSpend,
+)
 from app.models.category import Category
 from app.models.currency import Currency, ExchangeRate
 from app.models.recurring import RecurringRule
+from app.models.rollup import MonthlyRollup
 from app.models.transaction import Transaction
 from app.models.user import LocalUser, User
 
@@ -14,12 +21,16 @@ __all__ = [
     "User",
     "LocalUser",
     "Account",
+    "AccountBalance",
     "Category",
     "Budget",
     "BudgetCategory",
     "BudgetCollaborator",
+    "BudgetPeriodSpend",
+    "BudgetAlert",
     "Transaction",
     "RecurringRule",
+    "MonthlyRollup",
     "Currency",
     "ExchangeRate",
 ]
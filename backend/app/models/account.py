@@ -1,7 +1,8 @@
 import uuid
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BOOLEAN, NUMERIC, ForeignKey, String, Uuid
+from sqlalchemy import BOOLEAN, NUMERIC, DateTime, ForeignKey, String, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDPkMixin
@@ -37,3 +38,27 @@ class Account(Base, UUIDPkMixin, TimestampMixin):
         foreign_keys="Transaction.transfer_to_account_id",
         back_populates="transfer_to_account",
     )
+
+
+class AccountBalance(Base):
+    """Materialized sum of signed transaction amounts per account.
+
+    Maintained incrementally by every transaction write so balance reads never
+    have to aggregate the transactions table. The full balance is
+    ``accounts.initial_balance + transactions_total``.
+    """
+
+    __tablename__ = "account_balances"
+
+    account_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True, native_uuid=False),
+        ForeignKey("accounts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    transactions_total: Mapped[float] = mapped_column(NUMERIC(18, 6), nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
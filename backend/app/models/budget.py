@@ -2,7 +2,19 @@ import uuid
 from datetime import date, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DATE, NUMERIC, DateTime, ForeignKey, String, UniqueConstraint, Uuid, func
+from sqlalchemy import (
+    DATE,
+    NUMERIC,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    Uuid,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDPkMixin
@@ -15,6 +27,7 @@ if TYPE_CHECKING:
 
 class Budget(Base, UUIDPkMixin, TimestampMixin):
     __tablename__ = "budgets"
+    __table_args__ = (Index("ix_budgets_owner_id", "owner_id"),)
 
     owner_id: Mapped[uuid.UUID] = mapped_column(
         Uuid(as_uuid=True, native_uuid=False), ForeignKey("users.id"), nullable=False
@@ -65,6 +78,8 @@ class BudgetCollaborator(Base, UUIDPkMixin):
     __tablename__ = "budget_collaborators"
     __table_args__ = (
         UniqueConstraint("budget_id", "user_id", name="uq_budget_collaborator"),
+        # Serves the collaborator branch of accessible_budget_ids and get_access_map
+        Index("ix_budget_collaborators_user_accepted", "user_id", "accepted_at"),
     )
 
     budget_id: Mapped[uuid.UUID] = mapped_column(
@@ -82,3 +97,68 @@ class BudgetCollaborator(Base, UUIDPkMixin):
     # Relationships
     budget: Mapped["Budget"] = relationship("Budget", back_populates="collaborators")
     user: Mapped["User"] = relationship("User", back_populates="budget_collaborations")
+
+
+class BudgetPeriodSpend(Base):
+    """Expense totals per budget, category and budget period, in the budget's currency.
+
+    Maintained incrementally by every transaction write (see ``TransactionEffects``),
+    so summaries read the current period's spend without scanning transactions.
+    ``period_start`` is the first day of the period from ``budget_period_bounds``.
+    Uncategorized spend is stored under ``UNCATEGORIZED_ID``.
+    """
+
+    __tablename__ = "budget_period_spend"
+
+    budget_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True, native_uuid=False),
+        ForeignKey("budgets.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    category_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True, native_uuid=False), primary_key=True
+    )
+    period_start: Mapped[date] = mapped_column(DATE, primary_key=True)
+    amount: Mapped[float] = mapped_column(NUMERIC(18, 6), nullable=False, default=0)
+    tx_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class BudgetAlert(Base, UUIDPkMixin):
+    """Outbox of budget threshold breaches awaiting delivery.
+
+    A row is written in the same database transaction as the expense that took a
+    category's spend in a period to ``threshold`` percent of its limit or beyond.
+    The unique constraint makes each threshold fire at most once per period.
+    ``delivered_at`` is set by the delivery job.
+    """
+
+    __tablename__ = "budget_alerts"
+    __table_args__ = (
+        UniqueConstraint(
+            "budget_id", "category_id", "period_start", "threshold", name="uq_budget_alert"
+        ),
+        # The delivery job only ever scans undelivered rows
+        Index(
+            "ix_budget_alerts_pending",
+            "created_at",
+            postgresql_where=text("delivered_at IS NULL"),
+            sqlite_where=text("delivered_at IS NULL"),
+        ),
+    )
+
+    budget_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True, native_uuid=False),
+        ForeignKey("budgets.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    category_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True, native_uuid=False), nullable=False
+    )
+    period_start: Mapped[date] = mapped_column(DATE, nullable=False)
+    threshold: Mapped[int] = mapped_column(Integer, nullable=False)  # percent of the limit
+    spent_amount: Mapped[float] = mapped_column(NUMERIC(18, 6), nullable=False)
+    limit_amount: Mapped[float] = mapped_column(NUMERIC(18, 6), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    delivered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
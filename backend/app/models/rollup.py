@@ -0,0 +1,33 @@
+import uuid
+
+from sqlalchemy import NUMERIC, ForeignKey, Integer, String, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+# Primary keys cannot be NULL, so uncategorized transactions roll up under this id
+UNCATEGORIZED_ID = uuid.UUID(int=0)
+
+
+class MonthlyRollup(Base):
+    """Per-month totals of ``amount_base`` by user, category and type.
+
+    Maintained incrementally by every transaction write so the reports can
+    aggregate whole months without scanning the transactions table. Only
+    ``income`` and ``expense`` transactions are rolled up.
+    """
+
+    __tablename__ = "monthly_rollups"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True, native_uuid=False),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    year_month: Mapped[str] = mapped_column(String(7), primary_key=True)  # YYYY-MM
+    category_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True, native_uuid=False), primary_key=True
+    )  # UNCATEGORIZED_ID when the transaction has no category
+    type: Mapped[str] = mapped_column(String(16), primary_key=True)  # income, expense
+    amount_base: Mapped[float] = mapped_column(NUMERIC(18, 6), nullable=False, default=0)
+    tx_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -2,7 +2,7 @@ import uuid
 from datetime import date
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DATE, NUMERIC, ForeignKey, Index, String, Text, Uuid
+from sqlalchemy import DATE, NUMERIC, ForeignKey, Index, String, Text, Uuid, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDPkMixin
@@ -22,7 +22,16 @@ class Transaction(Base, UUIDPkMixin, TimestampMixin):
         Index("ix_transactions_account_id", "account_id"),
         Index("ix_transactions_budget_id", "budget_id"),
         Index("ix_transactions_category_id", "category_id"),
-        Index("ix_transactions_recurring_rule_id", "recurring_rule_id"),
+        # One generated transaction per rule occurrence; the recurring job inserts
+        # with ON CONFLICT DO NOTHING against this index
+        Index(
+            "uq_transactions_recurring_rule_date",
+            "recurring_rule_id",
+            "date",
+            unique=True,
+            postgresql_where=text("recurring_rule_id IS NOT NULL"),
+            sqlite_where=text("recurring_rule_id IS NOT NULL"),
+        ),
     )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -1,13 +1,40 @@
 import uuid
+from collections.abc import Iterable
 from decimal import Decimal
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, case, delete, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.account import Account
+from app.models.account import Account, AccountBalance
 from app.models.transaction import Transaction
 from app.repositories.base import BaseRepository
 
+# Tolerance used when comparing the ledger against raw sums (NUMERIC(18, 6) precision).
+LEDGER_TOLERANCE = Decimal("0.000001")
+
+
+def transaction_balance_deltas(
+    transactions: Iterable[Transaction], sign: int = 1
+) -> dict[uuid.UUID, Decimal]:
+    """Return {account_id: signed delta} that the given transactions apply to balances.
+
+    Mirrors the balance rules: income credits the account, expenses and outgoing
+    transfers debit it, and transfers credit ``transfer_to_account_id``. Amounts are
+    taken in account currency, falling back to ``amount`` for legacy rows.
+    """
+    deltas: dict[uuid.UUID, Decimal] = {}
+    for tx in transactions:
+        raw = tx.amount_account if tx.amount_account is not None else tx.amount
+        amount = Decimal(str(raw)) * sign
+        if tx.type == "income":
+            deltas[tx.account_id] = deltas.get(tx.account_id, Decimal("0")) + amount
+        elif tx.type in ("expense", "transfer"):
+            deltas[tx.account_id] = deltas.get(tx.account_id, Decimal("0")) - amount
+        if tx.type == "transfer" and tx.transfer_to_account_id is not None:
+            dest = tx.transfer_to_account_id
+            deltas[dest] = deltas.get(dest, Decimal("0")) + amount
+    return deltas
+
 
 class AccountRepository(BaseRepository[Account]):
     def __init__(self, session: AsyncSession) -> None:
@@ -25,55 +52,167 @@ class AccountRepository(BaseRepository[Account]):
         )
         return result.scalar_one_or_none()
 
-    async def compute_balance(self, account_id: uuid.UUID) -> Decimal:
-        """Compute current balance as initial_balance + SUM of signed amounts in account currency.
-
-        Uses amount_account (amount converted to the account's currency) when available,
-        falling back to amount for legacy rows created before multi-currency support.
-        """
-        account = await self.get(account_id)
-        if account is None:
-            return Decimal("0")
+    async def get_many_by_user(
+        self, ids: Iterable[uuid.UUID], user_id: uuid.UUID
+    ) -> list[Account]:
+        ids = list(ids)
+        if not ids:
+            return []
+        result = await self.session.execute(
+            select(Account).where(Account.id.in_(ids), Account.user_id == user_id)
+        )
+        return list(result.scalars().all())
 
-        # Use amount_account when available; fall back to amount for legacy rows
-        effective_amount = func.coalesce(Transaction.amount_account, Transaction.amount)
+    async def get_currencies(self, ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, str]:
+        ids = list(ids)
+        if not ids:
+            return {}
+        result = await self.session.execute(
+            select(Account.id, Account.currency).where(Account.id.in_(ids))
+        )
+        return {row.id: row.currency for row in result.all()}
 
-        income_sum = await self.session.execute(
-            select(func.coalesce(func.sum(effective_amount), 0)).where(
-                Transaction.account_id == account_id,
-                Transaction.type == "income",
+    async def get_with_balances(
+        self, user_id: uuid.UUID, active_only: bool = False
+    ) -> list[tuple[Account, Decimal]]:
+        """Return every account of the user paired with its balance in a single query."""
+        stmt = (
+            select(
+                Account,
+                func.coalesce(AccountBalance.transactions_total, 0).label("total"),
             )
+            .outerjoin(AccountBalance, AccountBalance.account_id == Account.id)
+            .where(Account.user_id == user_id)
         )
-        expense_sum = await self.session.execute(
-            select(func.coalesce(func.sum(effective_amount), 0)).where(
-                Transaction.account_id == account_id,
-                Transaction.type == "expense",
-            )
+        if active_only:
+            stmt = stmt.where(Account.is_active.is_(True))
+        result = await self.session.execute(stmt)
+        return [
+            (account, Decimal(str(account.initial_balance)) + Decimal(str(total)))
+            for account, total in result.all()
+        ]
+
+    async def transaction_totals(
+        self, user_id: uuid.UUID | None = None
+    ) -> dict[uuid.UUID, Decimal]:
+        """Aggregate signed transaction totals per account straight from transactions.
+
+        One grouped query with conditional aggregation: each transaction joins the
+        account it debits/credits (``account_id``) and, for transfers, the account it
+        credits (``transfer_to_account_id``). This is the source of truth the
+        ``account_balances`` ledger is verified and rebuilt against.
+        """
+        effective_amount = func.coalesce(Transaction.amount_account, Transaction.amount)
+        is_source = Transaction.account_id == Account.id
+        is_destination = and_(
+            Transaction.transfer_to_account_id == Account.id,
+            Transaction.type == "transfer",
         )
-        transfer_out = await self.session.execute(
-            select(func.coalesce(func.sum(effective_amount), 0)).where(
-                Transaction.account_id == account_id,
-                Transaction.type == "transfer",
-            )
+        source_amount = case(
+            (and_(is_source, Transaction.type == "income"), effective_amount),
+            (and_(is_source, Transaction.type.in_(["expense", "transfer"])), -effective_amount),
+            else_=0,
         )
-        transfer_in = await self.session.execute(
-            select(func.coalesce(func.sum(effective_amount), 0)).where(
-                Transaction.transfer_to_account_id == account_id,
-                Transaction.type == "transfer",
+        destination_amount = case((is_destination, effective_amount), else_=0)
+
+        stmt = (
+            select(
+                Account.id,
+                (func.sum(source_amount) + func.sum(destination_amount)).label("total"),
             )
+            .join(Transaction, or_(is_source, is_destination))
+            .group_by(Account.id)
         )
+        if user_id is not None:
+            stmt = stmt.where(Account.user_id == user_id)
+        result = await self.session.execute(stmt)
+        return {row.id: Decimal(str(row.total)) for row in result.all()}
 
-        balance = (
-            Decimal(str(account.initial_balance))
-            + Decimal(str(income_sum.scalar()))
-            - Decimal(str(expense_sum.scalar()))
-            - Decimal(str(transfer_out.scalar()))
-            + Decimal(str(transfer_in.scalar()))
+    async def compute_balance(self, account_id: uuid.UUID) -> Decimal:
+        """Return current balance as initial_balance + the account's ledger total.
+
+        The ledger row (``account_balances``) is kept in sync by every transaction
+        write, so this is a single primary-key lookup regardless of history size.
+        """
+        result = await self.session.execute(
+            select(
+                Account.initial_balance,
+                func.coalesce(AccountBalance.transactions_total, 0).label("total"),
+            )
+            .outerjoin(AccountBalance, AccountBalance.account_id == Account.id)
+            .where(Account.id == account_id)
         )
-        return balance
+        row = result.one_or_none()
+        if row is None:
+            return Decimal("0")
+        return Decimal(str(row.initial_balance)) + Decimal(str(row.total))
 
     async def has_transactions(self, account_id: uuid.UUID) -> bool:
         result = await self.session.execute(
             select(Transaction.id).where(Transaction.account_id == account_id).limit(1)
         )
         return result.scalar_one_or_none() is not None
+
+
+class AccountBalanceRepository(BaseRepository[AccountBalance]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(AccountBalance, session)
+
+    async def apply_transactions(
+        self, transactions: Iterable[Transaction], sign: int = 1
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) the effect of transactions on the ledger.
+
+        Runs in the caller's session so the ledger commits atomically with the
+        transaction rows themselves.
+        """
+        deltas = transaction_balance_deltas(transactions, sign)
+        await self.apply_deltas(deltas)
+
+    async def apply_deltas(self, deltas: dict[uuid.UUID, Decimal]) -> None:
+        rows = [
+            {"account_id": account_id, "transactions_total": delta}
+            for account_id, delta in deltas.items()
+            if delta
+        ]
+        if not rows:
+            return
+        stmt = self.dialect_insert().values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AccountBalance.account_id],
+            set_={
+                "transactions_total": AccountBalance.transactions_total
+                + stmt.excluded.transactions_total,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def get_totals(self) -> dict[uuid.UUID, Decimal]:
+        result = await self.session.execute(
+            select(AccountBalance.account_id, AccountBalance.transactions_total)
+        )
+        return {row.account_id: Decimal(str(row.transactions_total)) for row in result.all()}
+
+    async def totals_from_transactions(self) -> dict[uuid.UUID, Decimal]:
+        """Recompute every account's transaction total from the raw transactions table."""
+        return await AccountRepository(self.session).transaction_totals()
+
+    async def rebuild(self) -> int:
+        """Replace the whole ledger with totals recomputed from transactions."""
+        totals = await self.totals_from_transactions()
+        await self.session.execute(delete(AccountBalance))
+        await self.apply_deltas(totals)
+        return len(totals)
+
+    async def find_drift(self) -> list[tuple[uuid.UUID, Decimal, Decimal]]:
+        """Return (account_id, ledger_total, actual_total) for every mismatched account."""
+        ledger = await self.get_totals()
+        actual = await self.totals_from_transactions()
+        drift = []
+        for account_id in ledger.keys() | actual.keys():
+            stored = ledger.get(account_id, Decimal("0"))
+            expected = actual.get(account_id, Decimal("0"))
+            if abs(stored - expected) > LEDGER_TOLERANCE:
+                drift.append((account_id, stored, expected))
+        return drift
@@ -2,6 +2,7 @@ import uuid
 from typing import Any, Generic, TypeVar
 
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import Base
@@ -14,6 +15,17 @@ class BaseRepository(Generic[ModelT]):
         self.model = model
         self.session = session
 
+    def dialect_insert(self, model: type[Base] | None = None) -> Any:
+        """Return an INSERT construct supporting ON CONFLICT for the bound dialect.
+
+        PostgreSQL and SQLite share the same ``on_conflict_do_update`` /
+        ``on_conflict_do_nothing`` API, so callers can build upserts once.
+        """
+        target = model or self.model
+        if self.session.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(target)
+        return sqlite.insert(target)
+
     async def get(self, id: uuid.UUID) -> ModelT | None:
         result = await self.session.get(self.model, id)
         return result
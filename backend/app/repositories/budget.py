@@ -1,13 +1,64 @@
+from __future__ import annotations
+
 import uuid
+from collections.abc import Iterable
+from datetime import date, datetime
 from decimal import Decimal
+from typing import Any, NamedTuple, cast
 
-from sqlalchemy import case, func, or_, select
+from sqlalchemy import (
+    CompoundSelect,
+    CursorResult,
+    delete,
+    literal,
+    select,
+    tuple_,
+    union,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.budget import Budget, BudgetCategory, BudgetCollaborator
+from app.models.budget import (
+    Budget,
+    BudgetAlert,
+    BudgetCategory,
+    BudgetCollaborator,
+    BudgetPeriodSpend,
+)
+from app.models.rollup import UNCATEGORIZED_ID
 from app.models.transaction import Transaction
+from app.repositories.account import LEDGER_TOLERANCE
 from app.repositories.base import BaseRepository
+from app.repositories.rollup import UPSERT_CHUNK
+from app.utils.date_utils import budget_period_bounds
+
+SpendKey = tuple[uuid.UUID, uuid.UUID, date]  # budget_id, category_id, period_start
+
+
+class SpendChange(NamedTuple):
+    """A counter that rose in a write, with the limit of its budget category."""
+
+    key: SpendKey
+    before: Decimal
+    after: Decimal
+    limit: Decimal
+
+
+def accessible_budget_ids(user_id: uuid.UUID) -> CompoundSelect[tuple[uuid.UUID]]:
+    """Ids of the budgets a user owns, unioned with those they accepted an invite to.
+
+    Each branch is served by its own index, ``(owner_id)`` on budgets and
+    ``(user_id, accepted_at)`` on collaborators, and the UNION removes
+    duplicate ids instead of a DISTINCT over whole budget rows.
+    """
+    return union(
+        select(Budget.id).where(Budget.owner_id == user_id),
+        select(BudgetCollaborator.budget_id).where(
+            BudgetCollaborator.user_id == user_id, BudgetCollaborator.accepted_at.is_not(None)
+        ),
+    )
 
 
 class BudgetRepository(BaseRepository[Budget]):
@@ -18,30 +69,44 @@ class BudgetRepository(BaseRepository[Budget]):
         """Return budgets owned by user OR where user is an accepted collaborator."""
         result = await self.session.execute(
             select(Budget)
-            .outerjoin(BudgetCollaborator, BudgetCollaborator.budget_id == Budget.id)
-            .where(
-                or_(
-                    Budget.owner_id == user_id,
-                    (
-                        (BudgetCollaborator.user_id == user_id)
-                        & BudgetCollaborator.accepted_at.is_not(None)
-                    ),
-                )
-            )
+            .where(Budget.id.in_(accessible_budget_ids(user_id)))
             .options(
                 selectinload(Budget.budget_categories).selectinload(BudgetCategory.category)
             )
-            .distinct()
         )
         return list(result.scalars().all())
 
+    async def get_access_map(self, user_id: uuid.UUID) -> dict[uuid.UUID, str]:
+        """Return {budget_id: role} for every budget the user can access, in one query.
+
+        The role is ``owner`` for owned budgets, else the accepted collaborator's role.
+        Like ``accessible_budget_ids``, each branch of the UNION ALL uses its own index.
+        """
+        result = await self.session.execute(
+            union_all(
+                select(BudgetCollaborator.budget_id, BudgetCollaborator.role).where(
+                    BudgetCollaborator.user_id == user_id,
+                    BudgetCollaborator.accepted_at.is_not(None),
+                ),
+                select(Budget.id, literal("owner")).where(Budget.owner_id == user_id),
+            )
+        )
+        access: dict[uuid.UUID, str] = {}
+        for budget_id, role in result.all():
+            if access.get(budget_id) != "owner":
+                access[budget_id] = role
+        return access
+
+    async def exists(self, id: uuid.UUID) -> bool:
+        result = await self.session.execute(select(Budget.id).where(Budget.id == id))
+        return result.scalar_one_or_none() is not None
+
     async def get_by_id_with_categories(self, id: uuid.UUID) -> Budget | None:
         result = await self.session.execute(
             select(Budget)
             .where(Budget.id == id)
             .options(
                 selectinload(Budget.budget_categories).selectinload(BudgetCategory.category),
-                selectinload(Budget.collaborators),
             )
         )
         return result.scalar_one_or_none()
@@ -63,45 +128,299 @@ class BudgetRepository(BaseRepository[Budget]):
         )
         return list(result.scalars().all())
 
-    async def get_spending_by_category(
-        self,
-        budget_id: uuid.UUID,
-        budget_currency: str | None = None,
-        from_date: "date | None" = None,
-        to_date: "date | None" = None,
-    ) -> dict[uuid.UUID, Decimal]:
-        """Return {category_id: total_spent} for the given budget.
-
-        When budget_currency is supplied, cross-currency transactions are converted
-        to the budget currency using the stored account amount (amount_account) when
-        the account currency matches the budget currency.  Otherwise the original
-        transaction amount is used.
+
+def budget_spend_amount(tx: Any, budget_currency: str) -> Decimal:
+    """The transaction's amount in the budget currency.
+
+    That is the stored account amount when the account is in the budget's
+    currency, else the original transaction amount.
+    """
+    if tx.account_currency == budget_currency and tx.amount_account is not None:
+        return Decimal(str(tx.amount_account))
+    return Decimal(str(tx.amount))
+
+
+def transaction_spend_deltas(
+    transactions: Iterable[Any], budgets: dict[uuid.UUID, Any], sign: int = 1
+) -> dict[SpendKey, tuple[Decimal, int]]:
+    """Return {counter key: (amount delta, count delta)} for budgeted expenses.
+
+    ``budgets`` maps budget id to a row with period_type, start_date, end_date
+    and currency. Expenses outside a budget's dates count towards no period.
+    """
+    deltas: dict[SpendKey, tuple[Decimal, int]] = {}
+    for tx in transactions:
+        budget = budgets.get(tx.budget_id) if tx.type == "expense" else None
+        if budget is None:
+            continue
+        period = budget_period_bounds(
+            budget.period_type, budget.start_date, budget.end_date, tx.date
+        )
+        if period is None:
+            continue
+        key = (tx.budget_id, tx.category_id or UNCATEGORIZED_ID, period[0])
+        amount, count = deltas.get(key, (Decimal("0"), 0))
+        deltas[key] = (amount + budget_spend_amount(tx, budget.currency) * sign, count + sign)
+    return deltas
+
+
+class BudgetSpendRepository(BaseRepository[BudgetPeriodSpend]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(BudgetPeriodSpend, session)
+
+    async def _budgets(
+        self, budget_ids: Iterable[uuid.UUID]
+    ) -> tuple[dict[uuid.UUID, Any], dict[tuple[uuid.UUID, uuid.UUID], Decimal]]:
+        """Period definitions and category limits of the given budgets, in one query."""
+        result = await self.session.execute(
+            select(
+                Budget.id,
+                Budget.period_type,
+                Budget.start_date,
+                Budget.end_date,
+                Budget.currency,
+                BudgetCategory.category_id,
+                BudgetCategory.limit_amount,
+            )
+            .outerjoin(BudgetCategory, BudgetCategory.budget_id == Budget.id)
+            .where(Budget.id.in_(set(budget_ids)))
+        )
+        budgets: dict[uuid.UUID, Any] = {}
+        limits: dict[tuple[uuid.UUID, uuid.UUID], Decimal] = {}
+        for row in result.all():
+            budgets[row.id] = row
+            if row.category_id is not None:
+                limits[(row.id, row.category_id)] = Decimal(str(row.limit_amount))
+        return budgets, limits
+
+    async def apply_transactions(
+        self, transactions: Iterable[Transaction], sign: int = 1
+    ) -> list[SpendChange]:
+        """Add (sign=1) or remove (sign=-1) the effect of transactions on the counters.
+
+        Returns the counters that rose and have a category limit, with their
+        amounts before and after the write, for threshold checks.
         """
-        # Choose the amount column that best represents spending in the budget currency.
-        if budget_currency:
-            amount_col = case(
-                (
-                    (Transaction.account_currency == budget_currency)
-                    & Transaction.amount_account.isnot(None),
-                    Transaction.amount_account,
-                ),
-                else_=Transaction.amount,
+        budgeted = [tx for tx in transactions if tx.type == "expense" and tx.budget_id]
+        if not budgeted:
+            return []
+        budgets, limits = await self._budgets(
+            tx.budget_id for tx in budgeted if tx.budget_id is not None
+        )
+        deltas = transaction_spend_deltas(budgeted, budgets, sign)
+        after = await self.apply_deltas(deltas)
+        changes = []
+        for key, amount in after.items():
+            delta = deltas[key][0]
+            limit = limits.get((key[0], key[1]))
+            if delta > 0 and limit is not None:
+                changes.append(SpendChange(key, amount - delta, amount, limit))
+        return changes
+
+    async def apply_deltas(
+        self, deltas: dict[SpendKey, tuple[Decimal, int]]
+    ) -> dict[SpendKey, Decimal]:
+        """Upsert the deltas and return the resulting amount of every counter touched."""
+        rows = [
+            {
+                "budget_id": budget_id,
+                "category_id": category_id,
+                "period_start": period_start,
+                "amount": amount,
+                "tx_count": count,
+            }
+            for (budget_id, category_id, period_start), (amount, count) in deltas.items()
+            if amount or count
+        ]
+        after: dict[SpendKey, Decimal] = {}
+        for start in range(0, len(rows), UPSERT_CHUNK):
+            stmt = self.dialect_insert().values(rows[start : start + UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    BudgetPeriodSpend.budget_id,
+                    BudgetPeriodSpend.category_id,
+                    BudgetPeriodSpend.period_start,
+                ],
+                set_={
+                    "amount": BudgetPeriodSpend.amount + stmt.excluded.amount,
+                    "tx_count": BudgetPeriodSpend.tx_count + stmt.excluded.tx_count,
+                },
+            ).returning(
+                BudgetPeriodSpend.budget_id,
+                BudgetPeriodSpend.category_id,
+                BudgetPeriodSpend.period_start,
+                BudgetPeriodSpend.amount,
             )
-        else:
-            amount_col = Transaction.amount
+            for row in (await self.session.execute(stmt)).all():
+                after[(row.budget_id, row.category_id, row.period_start)] = Decimal(str(row.amount))
+
+        # Drop counters whose last transaction was removed
+        emptied = {key[0] for key, (_, count) in deltas.items() if count < 0}
+        if emptied:
+            await self.session.execute(
+                delete(BudgetPeriodSpend).where(
+                    BudgetPeriodSpend.budget_id.in_(emptied), BudgetPeriodSpend.tx_count <= 0
+                )
+            )
+        return after
+
+    async def get_spending(
+        self, periods: Iterable[tuple[uuid.UUID, date]]
+    ) -> dict[uuid.UUID, dict[uuid.UUID, Decimal]]:
+        """Return {budget_id: {category_id: spent}} for (budget_id, period_start) pairs, in one query."""
+        periods = list(periods)
+        if not periods:
+            return {}
+        result = await self.session.execute(
+            select(BudgetPeriodSpend).where(
+                tuple_(BudgetPeriodSpend.budget_id, BudgetPeriodSpend.period_start).in_(periods)
+            )
+        )
+        spending: dict[uuid.UUID, dict[uuid.UUID, Decimal]] = {}
+        for row in result.scalars().all():
+            spending.setdefault(row.budget_id, {})[row.category_id] = Decimal(str(row.amount))
+        return spending
+
+    async def get_history(self, budget_id: uuid.UUID) -> list[BudgetPeriodSpend]:
+        """Every period's counters for the budget, oldest first."""
+        result = await self.session.execute(
+            select(BudgetPeriodSpend)
+            .where(BudgetPeriodSpend.budget_id == budget_id)
+            .order_by(BudgetPeriodSpend.period_start, BudgetPeriodSpend.category_id)
+        )
+        return list(result.scalars().all())
+
+    async def delete_for_budgets(self, budget_ids: Iterable[uuid.UUID]) -> None:
+        await self.session.execute(
+            delete(BudgetPeriodSpend).where(BudgetPeriodSpend.budget_id.in_(set(budget_ids)))
+        )
 
+    async def get_totals(
+        self, budget_ids: Iterable[uuid.UUID] | None = None
+    ) -> dict[SpendKey, tuple[Decimal, int]]:
+        stmt = select(BudgetPeriodSpend)
+        if budget_ids is not None:
+            stmt = stmt.where(BudgetPeriodSpend.budget_id.in_(set(budget_ids)))
+        result = await self.session.execute(stmt)
+        return {
+            (r.budget_id, r.category_id, r.period_start): (Decimal(str(r.amount)), r.tx_count)
+            for r in result.scalars().all()
+        }
+
+    async def totals_from_transactions(
+        self, budget_ids: Iterable[uuid.UUID] | None = None
+    ) -> dict[SpendKey, tuple[Decimal, int]]:
+        """Recompute counters from the raw transactions of the given (default: all) budgets."""
         stmt = select(
+            Transaction.budget_id,
             Transaction.category_id,
-            func.sum(amount_col).label("total"),
-        ).where(
-            Transaction.budget_id == budget_id,
-            Transaction.type == "expense",
+            Transaction.date,
+            Transaction.type,
+            Transaction.amount,
+            Transaction.amount_account,
+            Transaction.account_currency,
+        ).where(Transaction.type == "expense", Transaction.budget_id.is_not(None))
+        budget_stmt = select(
+            Budget.id, Budget.period_type, Budget.start_date, Budget.end_date, Budget.currency
         )
-        if from_date:
-            stmt = stmt.where(Transaction.date >= from_date)
-        if to_date:
-            stmt = stmt.where(Transaction.date <= to_date)
-        stmt = stmt.group_by(Transaction.category_id)
+        if budget_ids is not None:
+            budget_ids = set(budget_ids)
+            stmt = stmt.where(Transaction.budget_id.in_(budget_ids))
+            budget_stmt = budget_stmt.where(Budget.id.in_(budget_ids))
+        budgets = {row.id: row for row in (await self.session.execute(budget_stmt)).all()}
+        result = await self.session.execute(stmt)
+        return transaction_spend_deltas(result.all(), budgets)
+
+    async def rebuild(self, budget_ids: Iterable[uuid.UUID] | None = None) -> int:
+        """Replace the counters of the given (default: all) budgets with recomputed totals."""
+        if budget_ids is not None:
+            budget_ids = set(budget_ids)
+        totals = await self.totals_from_transactions(budget_ids)
+        stmt = delete(BudgetPeriodSpend)
+        if budget_ids is not None:
+            stmt = stmt.where(BudgetPeriodSpend.budget_id.in_(budget_ids))
+        await self.session.execute(stmt)
+        await self.apply_deltas(totals)
+        return len(totals)
 
+    async def find_drift(
+        self,
+    ) -> list[tuple[SpendKey, tuple[Decimal, int], tuple[Decimal, int]]]:
+        """Return (key, stored, actual) for every counter that disagrees with transactions."""
+        stored = await self.get_totals()
+        actual = await self.totals_from_transactions()
+        empty = (Decimal("0"), 0)
+        drift = []
+        for key in stored.keys() | actual.keys():
+            s, a = stored.get(key, empty), actual.get(key, empty)
+            if s[1] != a[1] or abs(s[0] - a[0]) > LEDGER_TOLERANCE:
+                drift.append((key, s, a))
+        return drift
+
+
+def crossed_thresholds(change: SpendChange, thresholds: Iterable[int]) -> list[int]:
+    """The thresholds (percent of the limit) the counter reached in this change."""
+    if change.limit <= 0:
+        return []
+    return [t for t in thresholds if change.before < change.limit * t / 100 <= change.after]
+
+
+class BudgetAlertRepository(BaseRepository[BudgetAlert]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(BudgetAlert, session)
+
+    async def record_crossings(
+        self, changes: Iterable[SpendChange], thresholds: Iterable[int]
+    ) -> int:
+        """Write an outbox row for every threshold a change crossed; returns how many were new.
+
+        Thresholds already recorded for the same period are left alone, so each
+        fires at most once per period however often spending moves around it.
+        """
+        thresholds = list(thresholds)
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "budget_id": change.key[0],
+                "category_id": change.key[1],
+                "period_start": change.key[2],
+                "threshold": threshold,
+                "spent_amount": change.after,
+                "limit_amount": change.limit,
+            }
+            for change in changes
+            for threshold in crossed_thresholds(change, thresholds)
+        ]
+        if not rows:
+            return 0
+        stmt = self.dialect_insert().values(rows).on_conflict_do_nothing(
+            index_elements=[
+                BudgetAlert.budget_id,
+                BudgetAlert.category_id,
+                BudgetAlert.period_start,
+                BudgetAlert.threshold,
+            ]
+        )
         result = await self.session.execute(stmt)
-        return {row.category_id: Decimal(str(row.total)) for row in result.all()}
+        return cast(CursorResult[Any], result).rowcount or 0
+
+    async def get_pending(self, limit: int) -> list[BudgetAlert]:
+        """Undelivered alerts, oldest first; rows locked by another deliverer are skipped."""
+        result = await self.session.execute(
+            select(BudgetAlert)
+            .where(BudgetAlert.delivered_at.is_(None))
+            .order_by(BudgetAlert.created_at, BudgetAlert.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
+
+    async def mark_delivered(self, ids: Iterable[uuid.UUID], at: datetime) -> None:
+        await self.session.execute(
+            update(BudgetAlert).where(BudgetAlert.id.in_(set(ids))).values(delivered_at=at)
+        )
+
+    async def delete_for_budgets(self, budget_ids: Iterable[uuid.UUID]) -> None:
+        await self.session.execute(
+            delete(BudgetAlert).where(BudgetAlert.budget_id.in_(set(budget_ids)))
+        )
@@ -1,11 +1,19 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
 from datetime import date
+from decimal import Decimal
+from typing import Any, cast
 
-from sqlalchemy import select
+from sqlalchemy import CursorResult, Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.currency import Currency, ExchangeRate
 from app.repositories.base import BaseRepository
 
+# Rows per multi-row upsert; keeps bind parameters well under SQLite's limit
+UPSERT_CHUNK = 1000
+
 
 class CurrencyRepository(BaseRepository[Currency]):
     def __init__(self, session: AsyncSession) -> None:
@@ -15,11 +23,62 @@ class CurrencyRepository(BaseRepository[Currency]):
         result = await self.session.execute(select(Currency).order_by(Currency.code))
         return list(result.scalars().all())
 
+    async def get_codes(self) -> set[str]:
+        result = await self.session.execute(select(Currency.code))
+        return set(result.scalars().all())
+
 
 class ExchangeRateRepository(BaseRepository[ExchangeRate]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(ExchangeRate, session)
 
+    async def upsert_many(self, rows: list[dict[str, Any]]) -> None:
+        """Insert rates, overwriting rate and fetched_at of existing (base, target, date) rows."""
+        for start in range(0, len(rows), UPSERT_CHUNK):
+            stmt = self.dialect_insert().values(rows[start : start + UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    ExchangeRate.base_currency,
+                    ExchangeRate.target_currency,
+                    ExchangeRate.date,
+                ],
+                set_={"rate": stmt.excluded.rate, "fetched_at": stmt.excluded.fetched_at},
+            )
+            await self.session.execute(stmt)
+
+    async def insert_missing(self, rows: list[dict[str, Any]]) -> int:
+        """Insert rates, leaving any existing (base, target, date) row untouched.
+
+        Returns the number of rows actually inserted.
+        """
+        inserted = 0
+        for start in range(0, len(rows), UPSERT_CHUNK):
+            stmt = self.dialect_insert().values(rows[start : start + UPSERT_CHUNK])
+            result = await self.session.execute(
+                stmt.on_conflict_do_nothing(
+                    index_elements=[
+                        ExchangeRate.base_currency,
+                        ExchangeRate.target_currency,
+                        ExchangeRate.date,
+                    ]
+                )
+            )
+            inserted += cast(CursorResult[Any], result).rowcount
+        return inserted
+
+    async def get_dates(self, base: str, from_date: date, to_date: date) -> set[date]:
+        """Return the dates in [from_date, to_date] that have any rate from ``base``."""
+        result = await self.session.execute(
+            select(ExchangeRate.date)
+            .where(
+                ExchangeRate.base_currency == base,
+                ExchangeRate.date >= from_date,
+                ExchangeRate.date <= to_date,
+            )
+            .distinct()
+        )
+        return set(result.scalars().all())
+
     async def get_latest(self, base: str, target: str) -> ExchangeRate | None:
         result = await self.session.execute(
             select(ExchangeRate)
@@ -32,6 +91,94 @@ class ExchangeRateRepository(BaseRepository[ExchangeRate]):
         )
         return result.scalar_one_or_none()
 
+    async def get_latest_many(
+        self, pairs: Iterable[tuple[str, str]]
+    ) -> dict[tuple[str, str], Decimal]:
+        """Return the most recent rate for each (base, target) pair in one query.
+
+        Pairs without any stored rate are absent from the result.
+        """
+        pairs = set(pairs)
+        if not pairs:
+            return {}
+        rows = await self._latest_rows(
+            ExchangeRate.base_currency.in_({base for base, _ in pairs}),
+            ExchangeRate.target_currency.in_({target for _, target in pairs}),
+        )
+        rates = {
+            (row.base_currency, row.target_currency): Decimal(str(row.rate)) for row in rows
+        }
+        return {pair: rate for pair, rate in rates.items() if pair in pairs}
+
+    async def get_as_of(self, base: str, target: str, on: date) -> ExchangeRate | None:
+        """Return the rate in force on ``on``: the latest one dated on or before it.
+
+        If the pair's history starts after ``on``, its earliest rate is returned
+        instead. Both lookups are range scans on ``uq_exchange_rate``.
+        """
+        pair = (ExchangeRate.base_currency == base, ExchangeRate.target_currency == target)
+        result = await self.session.execute(
+            select(ExchangeRate)
+            .where(*pair, ExchangeRate.date <= on)
+            .order_by(ExchangeRate.date.desc())
+            .limit(1)
+        )
+        rate = result.scalar_one_or_none()
+        if rate is not None:
+            return rate
+        result = await self.session.execute(
+            select(ExchangeRate).where(*pair).order_by(ExchangeRate.date).limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_history(self, since: date) -> list[Row[str, str, date, float]]:
+        """Return (base_currency, target_currency, date, rate) rows from ``since`` on.
+
+        Each pair's row in force on ``since`` is included too, even if it is older,
+        so as-of lookups anywhere in [since, today] can be answered from the
+        result alone. Rows are ordered by pair, then date.
+        """
+        in_force = await self._latest_rows(ExchangeRate.date < since)
+        result = await self.session.execute(
+            select(
+                ExchangeRate.base_currency,
+                ExchangeRate.target_currency,
+                ExchangeRate.date,
+                ExchangeRate.rate,
+            ).where(ExchangeRate.date >= since)
+        )
+        return sorted(
+            [*in_force, *result.all()],
+            key=lambda row: (row.base_currency, row.target_currency, row.date),
+        )
+
+    async def _latest_rows(self, *conditions: Any) -> list[Row[str, str, date, float]]:
+        """Return the most recent (base_currency, target_currency, date, rate) per pair."""
+        latest = (
+            select(
+                ExchangeRate.base_currency,
+                ExchangeRate.target_currency,
+                func.max(ExchangeRate.date).label("max_date"),
+            )
+            .where(*conditions)
+            .group_by(ExchangeRate.base_currency, ExchangeRate.target_currency)
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(
+                ExchangeRate.base_currency,
+                ExchangeRate.target_currency,
+                ExchangeRate.date,
+                ExchangeRate.rate,
+            ).join(
+                latest,
+                (ExchangeRate.base_currency == latest.c.base_currency)
+                & (ExchangeRate.target_currency == latest.c.target_currency)
+                & (ExchangeRate.date == latest.c.max_date),
+            )
+        )
+        return list(result.all())
+
     async def get_latest_all(self, base: str) -> list[ExchangeRate]:
         """Get the most recent rate for each target currency from this base."""
         from sqlalchemy import func
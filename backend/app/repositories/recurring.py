@@ -1,7 +1,7 @@
 import uuid
 from datetime import date
 
-from sqlalchemy import select
+from sqlalchemy import case, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.recurring import RecurringRule
@@ -38,6 +38,53 @@ class RecurringRepository(BaseRepository[RecurringRule]):
         )
         return list(result.scalars().all())
 
+    async def get_due_batch(
+        self, today: date, after_id: uuid.UUID | None, limit: int
+    ) -> list[RecurringRule]:
+        """Return up to ``limit`` due active rules ordered by id, after ``after_id``."""
+        stmt = select(RecurringRule).where(
+            RecurringRule.status == "active",
+            RecurringRule.next_occurrence <= today,
+        )
+        if after_id is not None:
+            stmt = stmt.where(RecurringRule.id > after_id)
+        result = await self.session.execute(stmt.order_by(RecurringRule.id).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_active_in_range_batch(
+        self, from_date: date, to_date: date, after_id: uuid.UUID | None, limit: int
+    ) -> list[RecurringRule]:
+        """Return up to ``limit`` active rules whose lifetime overlaps the range, by id."""
+        stmt = select(RecurringRule).where(
+            RecurringRule.status == "active",
+            RecurringRule.start_date <= to_date,
+            or_(RecurringRule.end_date.is_(None), RecurringRule.end_date >= from_date),
+        )
+        if after_id is not None:
+            stmt = stmt.where(RecurringRule.id > after_id)
+        result = await self.session.execute(stmt.order_by(RecurringRule.id).limit(limit))
+        return list(result.scalars().all())
+
+    async def advance_many(self, schedule: dict[uuid.UUID, tuple[date, str]]) -> None:
+        """Set (next_occurrence, status) for many rules with a single UPDATE."""
+        if not schedule:
+            return
+        await self.session.execute(
+            update(RecurringRule)
+            .where(RecurringRule.id.in_(list(schedule)))
+            .values(
+                next_occurrence=case(
+                    {rule_id: nxt for rule_id, (nxt, _) in schedule.items()},
+                    value=RecurringRule.id,
+                ),
+                status=case(
+                    {rule_id: status for rule_id, (_, status) in schedule.items()},
+                    value=RecurringRule.id,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     async def get_subscriptions(self, user_id: uuid.UUID) -> list[RecurringRule]:
         result = await self.session.execute(
             select(RecurringRule).where(
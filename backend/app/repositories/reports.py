@@ -1,13 +1,46 @@
 import uuid
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 
-from sqlalchemy import func, select
+from dateutil.relativedelta import relativedelta  # type: ignore[import-untyped]
+from sqlalchemy import ColumnElement, and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.account import Account
 from app.models.category import Category
+from app.models.rollup import UNCATEGORIZED_ID, MonthlyRollup
 from app.models.transaction import Transaction
+from app.repositories.rollup import year_month
+
+
+def split_range(
+    from_date: date, to_date: date
+) -> tuple[tuple[str, str] | None, list[tuple[date, date]]]:
+    """Split [from_date, to_date] into whole months and partial edge ranges.
+
+    Returns ``((first_month, last_month) | None, edges)``: the whole months are
+    answered from ``monthly_rollups``, the (at most two) edge ranges that only
+    cover part of a month are aggregated from raw transactions.
+    """
+    if from_date > to_date:
+        return None, []
+    first_full = from_date if from_date.day == 1 else from_date.replace(day=1) + relativedelta(months=1)
+    if to_date == to_date + relativedelta(day=31):
+        last_full = to_date
+    else:
+        last_full = to_date.replace(day=1) - timedelta(days=1)
+    if first_full > last_full:
+        return None, [(from_date, to_date)]
+
+    edges = []
+    if from_date < first_full:
+        edges.append((from_date, first_full - timedelta(days=1)))
+    if last_full < to_date:
+        edges.append((last_full + timedelta(days=1), to_date))
+    return (year_month(first_full), year_month(last_full)), edges
+
+
+def _in_ranges(ranges: list[tuple[date, date]]) -> ColumnElement[bool]:
+    return or_(*(and_(Transaction.date >= start, Transaction.date <= end) for start, end in ranges))
 
 
 class ReportsRepository:
@@ -20,29 +53,59 @@ class ReportsRepository:
         from_date: date,
         to_date: date,
     ) -> list[dict]:
-        result = await self.session.execute(
-            select(
-                Transaction.category_id,
-                Category.name.label("category_name"),
-                func.sum(Transaction.amount_base).label("total"),
+        months, edges = split_range(from_date, to_date)
+        totals: dict[uuid.UUID | None, Decimal] = {}
+
+        if months:
+            result = await self.session.execute(
+                select(
+                    MonthlyRollup.category_id,
+                    func.sum(MonthlyRollup.amount_base).label("total"),
+                )
+                .where(
+                    MonthlyRollup.user_id == user_id,
+                    MonthlyRollup.type == "expense",
+                    MonthlyRollup.year_month.between(*months),
+                )
+                .group_by(MonthlyRollup.category_id)
+            )
+            for row in result.all():
+                key = None if row.category_id == UNCATEGORIZED_ID else row.category_id
+                totals[key] = totals.get(key, Decimal("0")) + Decimal(str(row.total))
+
+        if edges:
+            result = await self.session.execute(
+                select(
+                    Transaction.category_id,
+                    func.sum(Transaction.amount_base).label("total"),
+                )
+                .where(
+                    Transaction.user_id == user_id,
+                    Transaction.type == "expense",
+                    _in_ranges(edges),
+                )
+                .group_by(Transaction.category_id)
             )
-            .outerjoin(Category, Category.id == Transaction.category_id)
-            .where(
-                Transaction.user_id == user_id,
-                Transaction.type == "expense",
-                Transaction.date >= from_date,
-                Transaction.date <= to_date,
+            for row in result.all():
+                totals[row.category_id] = totals.get(row.category_id, Decimal("0")) + Decimal(
+                    str(row.total)
+                )
+
+        names: dict[uuid.UUID, str] = {}
+        category_ids = [c for c in totals if c is not None]
+        if category_ids:
+            result = await self.session.execute(
+                select(Category.id, Category.name).where(Category.id.in_(category_ids))
             )
-            .group_by(Transaction.category_id, Category.name)
-            .order_by(func.sum(Transaction.amount_base).desc())
-        )
+            names = {row.id: row.name for row in result.all()}
+
         return [
             {
-                "category_id": row.category_id,
-                "category_name": row.category_name or "Uncategorized",
-                "amount": Decimal(str(row.total)),
+                "category_id": category_id,
+                "category_name": (category_id and names.get(category_id)) or "Uncategorized",
+                "amount": amount,
             }
-            for row in result.all()
+            for category_id, amount in sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
         ]
 
     async def income_vs_expenses(
@@ -51,62 +114,77 @@ class ReportsRepository:
         from_date: date,
         to_date: date,
     ) -> list[dict]:
-        """Return income/expense totals grouped by year-month."""
-        result = await self.session.execute(
-            select(
-                func.extract("year", Transaction.date).label("year"),
-                func.extract("month", Transaction.date).label("month"),
-                Transaction.type,
-                func.sum(Transaction.amount_base).label("total"),
-            )
-            .where(
-                Transaction.user_id == user_id,
-                Transaction.type.in_(["income", "expense"]),
-                Transaction.date >= from_date,
-                Transaction.date <= to_date,
+        """Return income/expense totals grouped by year-month.
+
+        Whole months are read from ``monthly_rollups`` so the cost grows with the
+        number of months covered, not the number of transactions stored.
+        """
+        months, edges = split_range(from_date, to_date)
+        sums: list[tuple[str, str, Decimal]] = []
+
+        if months:
+            result = await self.session.execute(
+                select(
+                    MonthlyRollup.year_month,
+                    MonthlyRollup.type,
+                    func.sum(MonthlyRollup.amount_base).label("total"),
+                )
+                .where(
+                    MonthlyRollup.user_id == user_id,
+                    MonthlyRollup.year_month.between(*months),
+                )
+                .group_by(MonthlyRollup.year_month, MonthlyRollup.type)
             )
-            .group_by(
-                func.extract("year", Transaction.date),
-                func.extract("month", Transaction.date),
-                Transaction.type,
+            sums.extend((row.year_month, row.type, Decimal(str(row.total))) for row in result.all())
+
+        if edges:
+            result = await self.session.execute(
+                select(
+                    func.extract("year", Transaction.date).label("year"),
+                    func.extract("month", Transaction.date).label("month"),
+                    Transaction.type,
+                    func.sum(Transaction.amount_base).label("total"),
+                )
+                .where(
+                    Transaction.user_id == user_id,
+                    Transaction.type.in_(["income", "expense"]),
+                    _in_ranges(edges),
+                )
+                .group_by(
+                    func.extract("year", Transaction.date),
+                    func.extract("month", Transaction.date),
+                    Transaction.type,
+                )
             )
-            .order_by(
-                func.extract("year", Transaction.date),
-                func.extract("month", Transaction.date),
+            sums.extend(
+                (f"{int(row.year):04d}-{int(row.month):02d}", row.type, Decimal(str(row.total)))
+                for row in result.all()
             )
-        )
-        rows = result.all()
 
         periods: dict[str, dict] = {}
-        for row in rows:
-            year = int(row.year)
-            month = int(row.month)
-            period_key = f"{year:04d}-{month:02d}"
+        for period_key, tx_type, total in sums:
             if period_key not in periods:
                 periods[period_key] = {
                     "period": period_key,
                     "income": Decimal("0"),
                     "expenses": Decimal("0"),
                 }
-            if row.type == "income":
-                periods[period_key]["income"] = Decimal(str(row.total))
-            elif row.type == "expense":
-                periods[period_key]["expenses"] = Decimal(str(row.total))
+            if tx_type == "income":
+                periods[period_key]["income"] += total
+            elif tx_type == "expense":
+                periods[period_key]["expenses"] += total
 
         for p in periods.values():
             p["net"] = p["income"] - p["expenses"]
 
-        return list(periods.values())
+        return [periods[key] for key in sorted(periods)]
 
     async def monthly_trends(
         self,
         user_id: uuid.UUID,
         months: int = 12,
     ) -> list[dict]:
-        from datetime import date as date_type
-        from dateutil.relativedelta import relativedelta  # type: ignore[import-untyped]
-
-        today = date_type.today()
+        today = date.today()
         from_date = today - relativedelta(months=months)
         return await self.income_vs_expenses(user_id, from_date, today)
 
@@ -114,22 +192,18 @@ class ReportsRepository:
         self,
         user_id: uuid.UUID,
     ) -> list[dict]:
-        accounts_result = await self.session.execute(
-            select(Account).where(Account.user_id == user_id, Account.is_active.is_(True))
-        )
-        accounts = list(accounts_result.scalars().all())
-
         from app.repositories.account import AccountRepository
-        account_repo = AccountRepository(self.session)
 
-        balances = []
-        for account in accounts:
-            balance = await account_repo.compute_balance(account.id)
-            balances.append({
+        account_repo = AccountRepository(self.session)
+        return [
+            {
                 "account_id": account.id,
                 "account_name": account.name,
                 "account_type": account.type,
                 "currency": account.currency,
                 "balance": balance,
-            })
-        return balances
+            }
+            for account, balance in await account_repo.get_with_balances(
+                user_id, active_only=True
+            )
+        ]
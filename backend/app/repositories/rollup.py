@@ -0,0 +1,145 @@
+import uuid
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.rollup import UNCATEGORIZED_ID, MonthlyRollup
+from app.models.transaction import Transaction
+from app.repositories.account import LEDGER_TOLERANCE
+from app.repositories.base import BaseRepository
+
+ROLLUP_TYPES = ("income", "expense")
+# Rows per multi-row upsert; keeps bind parameters well under SQLite's limit
+UPSERT_CHUNK = 1000
+
+RollupKey = tuple[uuid.UUID, str, uuid.UUID, str]  # user_id, year_month, category_id, type
+
+
+def year_month(d: date) -> str:
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def transaction_rollup_deltas(
+    transactions: Iterable[Transaction], sign: int = 1
+) -> dict[RollupKey, tuple[Decimal, int]]:
+    """Return {rollup key: (amount_base delta, count delta)} for the given transactions."""
+    deltas: dict[RollupKey, tuple[Decimal, int]] = {}
+    for tx in transactions:
+        if tx.type not in ROLLUP_TYPES:
+            continue
+        key = (tx.user_id, year_month(tx.date), tx.category_id or UNCATEGORIZED_ID, tx.type)
+        amount, count = deltas.get(key, (Decimal("0"), 0))
+        deltas[key] = (amount + Decimal(str(tx.amount_base)) * sign, count + sign)
+    return deltas
+
+
+class MonthlyRollupRepository(BaseRepository[MonthlyRollup]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(MonthlyRollup, session)
+
+    async def apply_transactions(
+        self, transactions: Iterable[Transaction], sign: int = 1
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) the effect of transactions on the rollups."""
+        await self.apply_deltas(transaction_rollup_deltas(transactions, sign))
+
+    async def apply_deltas(self, deltas: dict[RollupKey, tuple[Decimal, int]]) -> None:
+        rows = [
+            {
+                "user_id": user_id,
+                "year_month": ym,
+                "category_id": category_id,
+                "type": tx_type,
+                "amount_base": amount,
+                "tx_count": count,
+            }
+            for (user_id, ym, category_id, tx_type), (amount, count) in deltas.items()
+            if amount or count
+        ]
+        for start in range(0, len(rows), UPSERT_CHUNK):
+            stmt = self.dialect_insert().values(rows[start : start + UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    MonthlyRollup.user_id,
+                    MonthlyRollup.year_month,
+                    MonthlyRollup.category_id,
+                    MonthlyRollup.type,
+                ],
+                set_={
+                    "amount_base": MonthlyRollup.amount_base + stmt.excluded.amount_base,
+                    "tx_count": MonthlyRollup.tx_count + stmt.excluded.tx_count,
+                },
+            )
+            await self.session.execute(stmt)
+
+        # Drop buckets whose last transaction was removed
+        emptied_users = {key[0] for key, (_, count) in deltas.items() if count < 0}
+        if emptied_users:
+            await self.session.execute(
+                delete(MonthlyRollup).where(
+                    MonthlyRollup.user_id.in_(emptied_users), MonthlyRollup.tx_count <= 0
+                )
+            )
+
+    async def get_totals(self) -> dict[RollupKey, tuple[Decimal, int]]:
+        result = await self.session.execute(select(MonthlyRollup))
+        return {
+            (r.user_id, r.year_month, r.category_id, r.type): (
+                Decimal(str(r.amount_base)),
+                r.tx_count,
+            )
+            for r in result.scalars().all()
+        }
+
+    async def totals_from_transactions(self) -> dict[RollupKey, tuple[Decimal, int]]:
+        """Recompute every rollup bucket from the raw transactions table in one query."""
+        year = func.extract("year", Transaction.date)
+        month = func.extract("month", Transaction.date)
+        result = await self.session.execute(
+            select(
+                Transaction.user_id,
+                year.label("year"),
+                month.label("month"),
+                Transaction.category_id,
+                Transaction.type,
+                func.sum(Transaction.amount_base).label("total"),
+                func.count().label("tx_count"),
+            )
+            .where(Transaction.type.in_(ROLLUP_TYPES))
+            .group_by(
+                Transaction.user_id, year, month, Transaction.category_id, Transaction.type
+            )
+        )
+        return {
+            (
+                row.user_id,
+                f"{int(row.year):04d}-{int(row.month):02d}",
+                row.category_id or UNCATEGORIZED_ID,
+                row.type,
+            ): (Decimal(str(row.total)), row.tx_count)
+            for row in result.all()
+        }
+
+    async def rebuild(self) -> int:
+        """Replace every rollup row with totals recomputed from transactions."""
+        totals = await self.totals_from_transactions()
+        await self.session.execute(delete(MonthlyRollup))
+        await self.apply_deltas(totals)
+        return len(totals)
+
+    async def find_drift(
+        self,
+    ) -> list[tuple[RollupKey, tuple[Decimal, int], tuple[Decimal, int]]]:
+        """Return (key, stored, actual) for every bucket that disagrees with transactions."""
+        stored = await self.get_totals()
+        actual = await self.totals_from_transactions()
+        empty = (Decimal("0"), 0)
+        drift = []
+        for key in stored.keys() | actual.keys():
+            s, a = stored.get(key, empty), actual.get(key, empty)
+            if s[1] != a[1] or abs(s[0] - a[0]) > LEDGER_TOLERANCE:
+                drift.append((key, s, a))
+        return drift
@@ -1,12 +1,43 @@
 import uuid
-from datetime import date
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    SQLColumnExpression,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.transaction import Transaction
 from app.repositories.base import BaseRepository
 from app.schemas.transaction import TransactionFilters
+from app.utils.pagination import decode_cursor, encode_cursor
+
+EXPORT_COLUMNS = (
+    "id",
+    "date",
+    "type",
+    "amount",
+    "currency",
+    "account_id",
+    "account_currency",
+    "amount_account",
+    "amount_base",
+    "exchange_rate",
+    "category_id",
+    "budget_id",
+    "transfer_to_account_id",
+    "recurring_rule_id",
+    "notes",
+    "created_at",
+)
 
 
 class TransactionRepository(BaseRepository[Transaction]):
@@ -21,43 +52,151 @@ class TransactionRepository(BaseRepository[Transaction]):
         )
         return result.scalar_one_or_none()
 
-    async def list_paginated(
-        self,
-        user_id: uuid.UUID,
-        filters: TransactionFilters,
-    ) -> tuple[list[Transaction], int]:
-        stmt = select(Transaction).where(Transaction.user_id == user_id)
-
+    def _filter_conditions(
+        self, user_id: uuid.UUID, filters: TransactionFilters
+    ) -> list[ColumnElement[bool]]:
+        conditions = [Transaction.user_id == user_id]
         if filters.account_id:
-            stmt = stmt.where(Transaction.account_id == filters.account_id)
+            conditions.append(Transaction.account_id == filters.account_id)
         if filters.category_id:
-            stmt = stmt.where(Transaction.category_id == filters.category_id)
+            conditions.append(Transaction.category_id == filters.category_id)
         if filters.budget_id:
-            stmt = stmt.where(Transaction.budget_id == filters.budget_id)
+            conditions.append(Transaction.budget_id == filters.budget_id)
         if filters.type:
-            stmt = stmt.where(Transaction.type == filters.type)
+            conditions.append(Transaction.type == filters.type)
         if filters.from_date:
-            stmt = stmt.where(Transaction.date >= filters.from_date)
+            conditions.append(Transaction.date >= filters.from_date)
         if filters.to_date:
-            stmt = stmt.where(Transaction.date <= filters.to_date)
+            conditions.append(Transaction.date <= filters.to_date)
         if filters.currency:
-            stmt = stmt.where(Transaction.currency == filters.currency)
+            conditions.append(Transaction.currency == filters.currency)
+        return conditions
+
+    async def count(self, user_id: uuid.UUID, filters: TransactionFilters) -> int:
+        result = await self.session.execute(
+            select(func.count(Transaction.id)).where(*self._filter_conditions(user_id, filters))
+        )
+        return result.scalar_one()
 
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = (await self.session.execute(count_stmt)).scalar_one()
+    async def list_paginated(
+        self,
+        user_id: uuid.UUID,
+        filters: TransactionFilters,
+    ) -> tuple[list[Transaction], int | None, str | None]:
+        """Return (items, total, next_cursor) ordered newest first.
 
-        offset = (filters.page - 1) * filters.page_size
-        stmt = stmt.order_by(Transaction.date.desc()).offset(offset).limit(filters.page_size)
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all()), total
+        With ``filters.cursor`` the page is located by seeking past the
+        (date, created_at, id) of the cursor row, which walks
+        ``ix_transactions_user_date`` instead of scanning and discarding an
+        OFFSET. Without a cursor the legacy page/page_size offset is used. The
+        total is only counted when ``filters.include_total`` is set.
+        """
+        conditions = self._filter_conditions(user_id, filters)
+        stmt = select(Transaction).where(*conditions)
 
-    async def exists_for_rule_and_date(
-        self, recurring_rule_id: uuid.UUID, date: date
-    ) -> bool:
-        result = await self.session.execute(
-            select(Transaction.id).where(
-                Transaction.recurring_rule_id == recurring_rule_id,
-                Transaction.date == date,
-            ).limit(1)
+        if filters.cursor:
+            stmt = stmt.where(self._after_cursor(filters.cursor))
+        else:
+            stmt = stmt.offset((filters.page - 1) * filters.page_size)
+
+        # Fetch one extra row to learn whether another page follows
+        stmt = stmt.order_by(
+            Transaction.date.desc(), Transaction.created_at.desc(), Transaction.id.desc()
+        ).limit(filters.page_size + 1)
+        items = list((await self.session.execute(stmt)).scalars().all())
+
+        next_cursor = None
+        if len(items) > filters.page_size:
+            items = items[: filters.page_size]
+            last = items[-1]
+            next_cursor = encode_cursor(
+                [last.date.isoformat(), last.created_at.isoformat(), str(last.id)]
+            )
+
+        total = await self.count(user_id, filters) if filters.include_total else None
+        return items, total, next_cursor
+
+    def _after_cursor(self, cursor: str) -> ColumnElement[bool]:
+        """Build the seek predicate for rows strictly after the cursor row.
+
+        The cursor carries the row's (date, created_at, id), so paging resumes at
+        the right place even if the cursor row has since been deleted.
+        """
+        values = decode_cursor(cursor)
+        if len(values) != 3 or not all(isinstance(v, str) for v in values):
+            raise ValueError("Malformed cursor")
+        cursor_date = date.fromisoformat(values[0])
+        cursor_created_at = datetime.fromisoformat(values[1])
+        cursor_id = uuid.UUID(values[2])
+
+        return tuple_(
+            Transaction.date, self._comparable_timestamp(Transaction.created_at), Transaction.id
+        ) < tuple_(
+            literal(cursor_date, Transaction.date.type),
+            self._comparable_timestamp(literal(cursor_created_at, Transaction.created_at.type)),
+            literal(cursor_id, Transaction.id.type),
+        )
+
+    def _comparable_timestamp(self, value: SQLColumnExpression[Any]) -> SQLColumnExpression[Any]:
+        """A timestamp expression that compares by instant on the bound dialect.
+
+        SQLite keeps timestamps as text, and server-generated ones lack the
+        fractional seconds that bound datetimes carry, so both sides are compared
+        as julian days there.
+        """
+        if self.session.get_bind().dialect.name == "sqlite":
+            return func.julianday(value)
+        return value
+
+    async def stream_rows(
+        self,
+        user_id: uuid.UUID,
+        filters: TransactionFilters,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """Stream matching rows as plain Core tuples, ``chunk_size`` rows at a time.
+
+        Uses a server-side cursor (``stream_results`` / ``yield_per``) so memory stays
+        flat for arbitrarily large histories; rows never become ORM objects.
+        """
+        stmt = (
+            select(*(getattr(Transaction, c) for c in EXPORT_COLUMNS))
+            .where(*self._filter_conditions(user_id, filters))
+            .order_by(
+                Transaction.date.desc(), Transaction.created_at.desc(), Transaction.id.desc()
+            )
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def create_many(self, rows: list[dict[str, Any]]) -> list[Transaction]:
+        """Insert rows with a multi-row INSERT ... RETURNING, preserving input order."""
+        if not rows:
+            return []
+        result = await self.session.scalars(
+            insert(Transaction).returning(Transaction, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.all())
+
+    async def create_many_for_rules(self, rows: list[dict[str, Any]]) -> list[Transaction]:
+        """Insert generated recurring rows, skipping (recurring_rule_id, date) pairs that exist.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING RETURNING against the partial unique
+        index, so only the rows actually inserted are returned. Reruns and
+        concurrent runs therefore need no read-before-write check.
+        """
+        if not rows:
+            return []
+        stmt = (
+            self.dialect_insert()
+            .on_conflict_do_nothing(
+                index_elements=[Transaction.recurring_rule_id, Transaction.date],
+                index_where=Transaction.recurring_rule_id.is_not(None),
+            )
+            .returning(Transaction)
         )
-        return result.scalar_one_or_none() is not None
+        result = await self.session.scalars(stmt, rows)
+        return list(result.all())
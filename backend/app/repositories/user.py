@@ -1,4 +1,5 @@
 import uuid
+from collections.abc import Iterable
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,6 +20,15 @@ class UserRepository(BaseRepository[User]):
         result = await self.session.execute(select(User).where(User.email == email))
         return result.scalar_one_or_none()
 
+    async def get_base_currencies(self, ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, str]:
+        ids = list(ids)
+        if not ids:
+            return {}
+        result = await self.session.execute(
+            select(User.id, User.base_currency).where(User.id.in_(ids))
+        )
+        return {row.id: row.base_currency for row in result.all()}
+
     async def count(self) -> int:
         result = await self.session.execute(select(func.count()).select_from(User))
         return result.scalar_one()
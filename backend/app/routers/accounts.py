@@ -30,12 +30,7 @@ async def create_account(
 ) -> AccountResponse:
     service = AccountService(session)
     account = await service.create_account(current_user.id, data)
-    from app.repositories.account import AccountRepository
-    repo = AccountRepository(session)
-    balance = await repo.compute_balance(account.id)
-    resp = AccountResponse.model_validate(account)
-    resp.balance = balance
-    return resp
+    return await service.to_response(account)
 
 
 @router.get("/{id}", response_model=AccountResponse)
@@ -46,12 +41,7 @@ async def get_account(
 ) -> AccountResponse:
     service = AccountService(session)
     account = await service.get_account(id, current_user.id)
-    from app.repositories.account import AccountRepository
-    repo = AccountRepository(session)
-    balance = await repo.compute_balance(account.id)
-    resp = AccountResponse.model_validate(account)
-    resp.balance = balance
-    return resp
+    return await service.to_response(account)
 
 
 @router.patch("/{id}", response_model=AccountResponse)
@@ -63,12 +53,7 @@ async def update_account(
 ) -> AccountResponse:
     service = AccountService(session)
     account = await service.update_account(id, current_user.id, data)
-    from app.repositories.account import AccountRepository
-    repo = AccountRepository(session)
-    balance = await repo.compute_balance(account.id)
-    resp = AccountResponse.model_validate(account)
-    resp.balance = balance
-    return resp
+    return await service.to_response(account)
 
 
 @router.delete("/{id}", status_code=204)
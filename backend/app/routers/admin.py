@@ -10,11 +10,38 @@ from app.models.user import User
 from app.repositories.category import CategoryRepository
 from app.repositories.user import UserRepository
 from app.schemas.category import CategoryCreate, CategoryResponse, CategoryUpdate
+from app.schemas.metrics import (
+    CacheStats,
+    MetricsResponse,
+    PasswordPoolStats,
+    RateCacheStats,
+    TokenCacheStats,
+)
 from app.schemas.user import AdminUserUpdate, UserResponse
+from app.services.budget_access import budget_access_cache
+from app.services.passwords import password_pool
+from app.services.rate_cache import rate_cache
+from app.services.report_cache import report_cache
+from app.services.token_cache import claims_cache
+from app.services.user_cache import user_cache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
+@router.get("/metrics", response_model=MetricsResponse)
+async def get_metrics(
+    _admin: Annotated[User, Depends(get_admin_user)],
+) -> MetricsResponse:
+    return MetricsResponse(
+        report_cache=CacheStats(**report_cache.stats()),
+        rate_cache=RateCacheStats(**rate_cache.stats()),
+        user_cache=CacheStats(**user_cache.stats()),
+        token_cache=TokenCacheStats(**claims_cache.stats()),
+        budget_access_cache=CacheStats(**budget_access_cache.stats()),
+        password_pool=PasswordPoolStats(**password_pool.stats()),
+    )
+
+
 @router.get("/users", response_model=list[UserResponse])
 async def list_users(
     skip: int = 0,
@@ -8,6 +8,7 @@ from app.db.session import get_db
 from app.repositories.user import LocalUserRepository
 from app.schemas.auth import LocalTokenRequest, TokenResponse
 from app.services.auth import issue_local_token
+from app.services.passwords import PasswordPoolFull, verify_password
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 settings = get_settings()
@@ -24,8 +25,6 @@ async def local_token(
             detail={"detail": "Local auth is disabled", "code": "local_auth_disabled"},
         )
 
-    import bcrypt
-
     repo = LocalUserRepository(session)
     local_user = await repo.get_by_email(data.email)
     if not local_user:
@@ -34,9 +33,13 @@ async def local_token(
             detail={"detail": "Invalid credentials", "code": "invalid_credentials"},
         )
 
-    password_valid = bcrypt.checkpw(
-        data.password.encode(), local_user.password_hash.encode()
-    )
+    try:
+        password_valid = await verify_password(data.password, local_user.password_hash)
+    except PasswordPoolFull as exc:
+        raise HTTPException(
+            status_code=503,
+            detail={"detail": "Too many concurrent logins", "code": "login_busy"},
+        ) from exc
     if not password_valid:
         raise HTTPException(
             status_code=401,
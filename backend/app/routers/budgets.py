@@ -9,6 +9,7 @@ from app.dependencies import get_current_user
 from app.models.user import User
 from app.schemas.budget import (
     BudgetCreate,
+    BudgetPeriodHistory,
     BudgetResponse,
     BudgetSummaryResponse,
     BudgetUpdate,
@@ -31,6 +32,15 @@ async def list_budgets(
     return [BudgetResponse.model_validate(b) for b in budgets]
 
 
+@router.get("/summaries", response_model=list[BudgetSummaryResponse])
+async def list_budget_summaries(
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> list[BudgetSummaryResponse]:
+    service = BudgetService(session)
+    return await service.get_summaries(current_user.id)
+
+
 @router.post("", response_model=BudgetResponse, status_code=201)
 async def create_budget(
     data: BudgetCreate,
@@ -85,6 +95,16 @@ async def get_budget_summary(
     return await service.get_summary(id, current_user.id)
 
 
+@router.get("/{id}/history", response_model=list[BudgetPeriodHistory])
+async def get_budget_history(
+    id: uuid.UUID,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> list[BudgetPeriodHistory]:
+    service = BudgetService(session)
+    return await service.get_history(id, current_user.id)
+
+
 @router.get("/{id}/collaborators", response_model=list[CollaboratorResponse])
 async def list_collaborators(
     id: uuid.UUID,
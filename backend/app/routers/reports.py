@@ -56,7 +56,7 @@ async def income_vs_expenses(
 async def trends_report(
     current_user: Annotated[User, Depends(get_current_user)],
     session: Annotated[AsyncSession, Depends(get_db)],
-    months: int = Query(default=12, ge=1, le=24),
+    months: int = Query(default=12, ge=1, le=120),
     currency: str | None = Query(default=None),
 ) -> TrendsReportResponse:
     service = ReportsService(session)
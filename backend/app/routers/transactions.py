@@ -1,20 +1,29 @@
+import io
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.db.session import get_db
 from app.dependencies import get_current_user
 from app.models.user import User
 from app.schemas.common import PaginatedResponse
 from app.schemas.transaction import (
+    StatementImportResponse,
+    TransactionBulkCreate,
+    TransactionBulkResponse,
     TransactionCreate,
     TransactionFilters,
     TransactionResponse,
     TransactionUpdate,
 )
+from app.services.statement_import import StatementImportService, parse_in_threadpool
 from app.services.transaction import TransactionService
+from app.utils.export import EXPORT_FORMATS
+from app.utils.statement_parsers import STATEMENT_FORMATS, detect_format, parse_statement
 from datetime import date
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
@@ -33,6 +42,8 @@ async def list_transactions(
     currency: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    include_total: bool = Query(default=True),
 ) -> PaginatedResponse[TransactionResponse]:
     filters = TransactionFilters(
         account_id=account_id,
@@ -44,6 +55,8 @@ async def list_transactions(
         currency=currency,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        include_total=include_total,
     )
     service = TransactionService(session)
     result = await service.list_transactions(current_user.id, filters)
@@ -53,6 +66,39 @@ async def list_transactions(
         page=result.page,
         page_size=result.page_size,
         pages=result.pages,
+        next_cursor=result.next_cursor,
+    )
+
+
+@router.get("/export")
+async def export_transactions(
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+    account_id: uuid.UUID | None = Query(default=None),
+    category_id: uuid.UUID | None = Query(default=None),
+    budget_id: uuid.UUID | None = Query(default=None),
+    type: str | None = Query(default=None),
+    from_date: date | None = Query(default=None),
+    to_date: date | None = Query(default=None),
+    currency: str | None = Query(default=None),
+) -> StreamingResponse:
+    filters = TransactionFilters(
+        account_id=account_id,
+        category_id=category_id,
+        budget_id=budget_id,
+        type=type,
+        from_date=from_date,
+        to_date=to_date,
+        currency=currency,
+    )
+    service = TransactionService(session)
+    # The generator keeps using the get_db session while the body streams;
+    # FastAPI >= 0.118 only closes yield dependencies after the response is sent.
+    return StreamingResponse(
+        service.export_transactions(current_user.id, filters, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'},
     )
 
 
@@ -67,6 +113,59 @@ async def create_transaction(
     return TransactionResponse.model_validate(tx)
 
 
+@router.post("/bulk", response_model=TransactionBulkResponse, status_code=201)
+async def create_transactions_bulk(
+    data: TransactionBulkCreate,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> TransactionBulkResponse:
+    service = TransactionService(session)
+    created, errors = await service.create_transactions_bulk(
+        current_user.id, data, current_user.base_currency
+    )
+    return TransactionBulkResponse(
+        created=[TransactionResponse.model_validate(t) for t in created],
+        errors=errors,
+    )
+
+
+@router.post("/import", response_model=StatementImportResponse, status_code=201)
+async def import_statement(
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Annotated[AsyncSession, Depends(get_db)],
+    file: UploadFile = File(...),
+    account_id: uuid.UUID = Form(...),
+    format: str | None = Form(default=None, pattern="^(csv|ofx|qif)$"),
+    category_id: uuid.UUID | None = Form(default=None),
+    date_format: str | None = Form(default=None),
+    chunk_size: int | None = Form(default=None, ge=1, le=10000),
+) -> StatementImportResponse:
+    fmt = format or detect_format(file.filename)
+    if fmt is None:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "detail": f"Cannot infer statement format; pass one of: {', '.join(STATEMENT_FORMATS)}",
+                "code": "unsupported_format",
+            },
+        )
+    chunk_size = chunk_size or get_settings().import_chunk_size
+    # Decode the spooled upload lazily so rows are parsed as they are read
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        service = StatementImportService(session)
+        return await service.import_statement(
+            current_user.id,
+            account_id,
+            parse_in_threadpool(parse_statement(fmt, text, date_format), chunk_size),
+            current_user.base_currency,
+            chunk_size,
+            category_id=category_id,
+        )
+    finally:
+        text.detach()
+
+
 @router.get("/{id}", response_model=TransactionResponse)
 async def get_transaction(
     id: uuid.UUID,
@@ -86,7 +86,23 @@ class BudgetSummaryResponse(BaseModel):
     start_date: date
     end_date: date | None
     currency: str
+    # The period the spending covers; period_end is None for open-ended custom budgets.
+    # Both are None, with nothing spent, when today is outside the budget's dates.
+    period_start: date | None
+    period_end: date | None
     categories: list[BudgetSummaryCategory]
     total_limit: Decimal
     total_spent: Decimal
     total_remaining: Decimal
+
+
+class BudgetPeriodCategorySpend(BaseModel):
+    category_id: uuid.UUID | None  # None for uncategorized spending
+    spent_amount: Decimal
+
+
+class BudgetPeriodHistory(BaseModel):
+    period_start: date
+    period_end: date | None
+    total_spent: Decimal
+    categories: list[BudgetPeriodCategorySpend]
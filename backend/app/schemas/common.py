@@ -8,10 +8,11 @@ T = TypeVar("T")
 
 class PaginatedResponse(BaseModel, Generic[T]):
     items: list[T]
-    total: int
+    total: int | None  # None when the exact count was not requested
     page: int
     page_size: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None  # Opaque keyset cursor for the following page
 
 
 class ErrorDetail(BaseModel):
@@ -0,0 +1,54 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    enabled: bool
+    hits: int
+    misses: int
+    hit_rate: float
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+
+
+class RateCacheStats(BaseModel):
+    loaded: bool
+    hits: int
+    misses: int
+    hit_rate: float
+    pivot: str
+    pairs: int
+    currencies: int
+    history_points: int
+    age_seconds: float | None
+    ttl_seconds: float
+    reloads: int
+
+
+class TokenCacheStats(BaseModel):
+    enabled: bool
+    hits: int
+    misses: int
+    hit_rate: float
+    entries: int
+    max_entries: int
+
+
+class PasswordPoolStats(BaseModel):
+    workers: int
+    max_queue: int
+    queued: int
+    running: int
+    peak_queued: int
+    completed: int
+    rejected: int
+    avg_wait_ms: float
+
+
+class MetricsResponse(BaseModel):
+    report_cache: CacheStats
+    rate_cache: RateCacheStats
+    user_cache: CacheStats
+    token_cache: TokenCacheStats
+    budget_access_cache: CacheStats
+    password_pool: PasswordPoolStats
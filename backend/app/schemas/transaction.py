@@ -19,6 +19,11 @@ class TransactionCreate(BaseModel):
     transfer_to_account_id: Optional[uuid.UUID] = None
 
 
+class TransactionBulkCreate(BaseModel):
+    items: list[TransactionCreate]
+    mode: str = "all_or_nothing"  # all_or_nothing, partial
+
+
 class TransactionUpdate(BaseModel):
     category_id: Optional[uuid.UUID] = None
     budget_id: Optional[uuid.UUID] = None
@@ -61,3 +66,28 @@ class TransactionFilters(BaseModel):
     currency: Optional[str] = None
     page: int = 1
     page_size: int = 50
+    cursor: Optional[str] = None  # keyset cursor; takes precedence over page
+    include_total: bool = True
+
+
+class BulkItemError(BaseModel):
+    index: int  # position of the item in the request
+    code: str
+    detail: str
+
+
+class TransactionBulkResponse(BaseModel):
+    created: list[TransactionResponse]
+    errors: list[BulkItemError]
+
+
+class ImportRowError(BaseModel):
+    line: int  # line in the uploaded file where the entry starts
+    detail: str
+
+
+class StatementImportResponse(BaseModel):
+    imported: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    errors: list[ImportRowError] = []  # first MAX_REPORTED_ERRORS problems only
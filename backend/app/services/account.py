@@ -13,15 +13,18 @@ class AccountService:
         self.repo = AccountRepository(session)
 
     async def list_accounts(self, user_id: uuid.UUID) -> list[AccountResponse]:
-        accounts = await self.repo.get_by_user(user_id)
         result = []
-        for account in accounts:
-            balance = await self.repo.compute_balance(account.id)
+        for account, balance in await self.repo.get_with_balances(user_id):
             resp = AccountResponse.model_validate(account)
             resp.balance = balance
             result.append(resp)
         return result
 
+    async def to_response(self, account: Account) -> AccountResponse:
+        resp = AccountResponse.model_validate(account)
+        resp.balance = await self.repo.compute_balance(account.id)
+        return resp
+
     async def get_account(self, id: uuid.UUID, user_id: uuid.UUID) -> Account:
         account = await self.repo.get_by_id_and_user(id, user_id)
         if not account:
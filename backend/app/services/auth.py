@@ -1,5 +1,6 @@
 """Authentication service: OIDC (RS256) + local (HS256)."""
 
+import asyncio
 import logging
 import time
 from typing import Any
@@ -15,58 +16,166 @@ from app.repositories.user import UserRepository
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-# JWKS cache: {issuer_url: {"keys": [...], "fetched_at": timestamp}}
+# JWKS cache: {issuer_url: {"keys": [...], "fetched_at": monotonic timestamp}}
 _jwks_cache: dict[str, dict[str, Any]] = {}
 JWKS_CACHE_TTL = 3600  # 1 hour
+JWKS_REFRESH_AHEAD = 3000  # past this age, refresh in the background while serving cached keys
+JWKS_MIN_REFRESH_INTERVAL = 60  # at most one early (background or forced) refresh per minute
+# Incremented on every JWKS fetch; claims verified under an older key set are re-verified
+_jwks_generation = 0
 
+# jwks_uri from each issuer's discovery document, looked up once
+_jwks_uris: dict[str, str] = {}
+# In-flight refresh per issuer; concurrent callers await the same task
+_jwks_refreshes: dict[str, asyncio.Task[list[dict[str, Any]]]] = {}
+_last_early_refresh: dict[str, float] = {}
 
-async def _fetch_jwks(issuer_url: str) -> list[dict]:
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide client used for issuer requests (pooled connections)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=10)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def _fetch_jwks(issuer_url: str) -> list[dict[str, Any]]:
     """Fetch JWKS from the issuer's well-known endpoint."""
-    oidc_config_url = issuer_url.rstrip("/") + "/.well-known/openid-configuration"
-    async with httpx.AsyncClient() as client:
-        config_resp = await client.get(oidc_config_url, timeout=10)
+    client = get_http_client()
+    jwks_uri = _jwks_uris.get(issuer_url)
+    if jwks_uri is None:
+        oidc_config_url = issuer_url.rstrip("/") + "/.well-known/openid-configuration"
+        config_resp = await client.get(oidc_config_url)
         config_resp.raise_for_status()
-        jwks_uri = config_resp.json()["jwks_uri"]
-        jwks_resp = await client.get(jwks_uri, timeout=10)
+        jwks_uri = _jwks_uris[issuer_url] = config_resp.json()["jwks_uri"]
+    try:
+        jwks_resp = await client.get(jwks_uri)
         jwks_resp.raise_for_status()
-        return jwks_resp.json()["keys"]
+    except httpx.HTTPError:
+        # The issuer may have moved its JWKS; rediscover on the next attempt
+        _jwks_uris.pop(issuer_url, None)
+        raise
+    return jwks_resp.json()["keys"]  # type: ignore[no-any-return]
+
+
+async def _fetch_and_store(issuer_url: str) -> list[dict[str, Any]]:
+    global _jwks_generation
+    keys = await _fetch_jwks(issuer_url)
+    _jwks_cache[issuer_url] = {"keys": keys, "fetched_at": time.monotonic()}
+    _jwks_generation += 1
+    return keys
+
+
+def _start_refresh(issuer_url: str) -> asyncio.Task[list[dict[str, Any]]]:
+    """Return the in-flight refresh for ``issuer_url``, starting one if there is none."""
+    task = _jwks_refreshes.get(issuer_url)
+    if task is None:
+        task = asyncio.create_task(_fetch_and_store(issuer_url))
+        _jwks_refreshes[issuer_url] = task
+
+        def _done(finished: asyncio.Task[list[dict[str, Any]]]) -> None:
+            if _jwks_refreshes.get(issuer_url) is finished:
+                del _jwks_refreshes[issuer_url]
+
+        task.add_done_callback(_done)
+    return task
+
 
+def _log_background_failure(task: asyncio.Task[list[dict[str, Any]]]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background JWKS refresh failed: %s", task.exception())
 
-async def _get_jwks(issuer_url: str, force_refresh: bool = False) -> list[dict]:
-    """Return cached JWKS or refresh if expired/forced."""
+
+async def _get_jwks(issuer_url: str, force_refresh: bool = False) -> list[dict[str, Any]]:
+    """Return cached JWKS or refresh if expired/forced.
+
+    Concurrent refreshes for an issuer share one fetch. Keys close to expiry are
+    still served while a background refresh replaces them, so requests only
+    wait on the issuer on the first fetch, after a failed refresh, or when forced.
+    """
     cached = _jwks_cache.get(issuer_url)
     if cached and not force_refresh:
-        if time.time() - cached["fetched_at"] < JWKS_CACHE_TTL:
-            return cached["keys"]  # type: ignore[return-value]
+        age = time.monotonic() - cached["fetched_at"]
+        if age < JWKS_CACHE_TTL:
+            if (
+                age >= JWKS_REFRESH_AHEAD
+                and issuer_url not in _jwks_refreshes
+                and _may_refresh_early(issuer_url)
+            ):
+                _start_refresh(issuer_url).add_done_callback(_log_background_failure)
+            return cached["keys"]  # type: ignore[no-any-return]
 
-    keys = await _fetch_jwks(issuer_url)
-    _jwks_cache[issuer_url] = {"keys": keys, "fetched_at": time.time()}
-    return keys
+    # Shielded: a cancelled request must not cancel a fetch other requests are awaiting
+    return await asyncio.shield(_start_refresh(issuer_url))
+
+
+def jwks_generation() -> int:
+    """Return the number of JWKS fetches so far, to detect key set refreshes."""
+    return _jwks_generation
+
+
+def _decode_oidc(token: str, keys: list[dict[str, Any]]) -> dict[str, Any]:
+    payload = jwt.decode(
+        token,
+        keys,
+        algorithms=["RS256"],
+        audience=settings.oidc_audience,
+        issuer=settings.oidc_issuer_url,
+    )
+    return payload  # type: ignore[no-any-return]
+
+
+def _has_kid(keys: list[dict[str, Any]], kid: str | None) -> bool:
+    return kid is not None and any(key.get("kid") == kid for key in keys)
+
+
+def _may_refresh_early(issuer_url: str) -> bool:
+    """Allow one refresh before expiry per issuer every JWKS_MIN_REFRESH_INTERVAL seconds."""
+    now = time.monotonic()
+    last = _last_early_refresh.get(issuer_url)
+    if last is not None and now - last < JWKS_MIN_REFRESH_INTERVAL:
+        return False
+    _last_early_refresh[issuer_url] = now
+    return True
 
 
 async def validate_oidc_token(token: str) -> dict[str, Any]:
-    """Validate a RS256 JWT against the OIDC issuer's JWKS."""
-    keys = await _get_jwks(settings.oidc_issuer_url)
+    """Validate a RS256 JWT against the OIDC issuer's JWKS.
+
+    A token signed with a key id missing from the cached JWKS triggers a forced
+    refresh (key rotation). Forced refreshes are rate limited, so a flood of
+    forged tokens cannot hammer the issuer. Tokens whose key is known but that
+    fail validation (bad signature, expired, wrong audience) are rejected
+    without a refresh.
+    """
+    issuer_url = settings.oidc_issuer_url
+    keys = await _get_jwks(issuer_url)
     try:
-        payload = jwt.decode(
-            token,
-            keys,
-            algorithms=["RS256"],
-            audience=settings.oidc_audience,
-            issuer=settings.oidc_issuer_url,
-        )
-        return payload  # type: ignore[no-any-return]
+        return _decode_oidc(token, keys)
     except JWTError:
-        # Retry once with fresh JWKS (key rotation)
-        keys = await _get_jwks(settings.oidc_issuer_url, force_refresh=True)
-        payload = jwt.decode(
-            token,
-            keys,
-            algorithms=["RS256"],
-            audience=settings.oidc_audience,
-            issuer=settings.oidc_issuer_url,
-        )
-        return payload  # type: ignore[no-any-return]
+        kid = jwt.get_unverified_header(token).get("kid")
+        if _has_kid(keys, kid):
+            raise
+        current = _jwks_cache.get(issuer_url, {}).get("keys", [])
+        if _has_kid(current, kid):
+            # Refreshed by another request since this one read the keys
+            keys = current
+        elif issuer_url in _jwks_refreshes:
+            keys = await asyncio.shield(_start_refresh(issuer_url))
+        elif _may_refresh_early(issuer_url):
+            keys = await _get_jwks(issuer_url, force_refresh=True)
+        else:
+            raise
+        return _decode_oidc(token, keys)
 
 
 def validate_local_token(token: str) -> dict[str, Any]:
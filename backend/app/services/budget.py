@@ -1,49 +1,69 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from decimal import Decimal
+from itertools import groupby
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.budget import Budget, BudgetCategory, BudgetCollaborator
-from app.repositories.budget import BudgetRepository
+from app.models.rollup import UNCATEGORIZED_ID
+from app.repositories.budget import (
+    BudgetAlertRepository,
+    BudgetRepository,
+    BudgetSpendRepository,
+)
 from app.repositories.user import UserRepository
 from app.schemas.budget import (
     BudgetCreate,
+    BudgetPeriodCategorySpend,
+    BudgetPeriodHistory,
     BudgetSummaryCategory,
     BudgetSummaryResponse,
     BudgetUpdate,
     CollaboratorInvite,
     CollaboratorUpdate,
 )
+from app.services.budget_access import OWNER, budget_access_cache
+from app.utils.date_utils import budget_period_bounds
+
+# Budget fields that change which period, or which currency, a transaction counts in
+PERIOD_FIELDS = {"period_type", "start_date", "end_date", "currency"}
+
+
+def _current_period(budget: Budget) -> tuple[date, date] | None:
+    """The period containing today; None before the budget starts or after it ends."""
+    return budget_period_bounds(
+        budget.period_type, budget.start_date, budget.end_date, date.today()
+    )
 
 
 class BudgetService:
     def __init__(self, session: AsyncSession) -> None:
         self.repo = BudgetRepository(session)
+        self.spend_repo = BudgetSpendRepository(session)
+        self.alert_repo = BudgetAlertRepository(session)
         self.user_repo = UserRepository(session)
 
     async def list_budgets(self, user_id: uuid.UUID) -> list[Budget]:
         return await self.repo.get_accessible(user_id)
 
-    async def _require_access(self, budget_id: uuid.UUID, user_id: uuid.UUID) -> Budget:
-        budget = await self.repo.get_by_id_with_categories(budget_id)
-        if not budget:
+    async def _require_access(self, budget_id: uuid.UUID, user_id: uuid.UUID) -> str:
+        """Return the user's role on the budget, from the cached access map."""
+        access = await budget_access_cache.get_or_load(user_id, self.repo)
+        role = access.get(budget_id)
+        if role is not None:
+            return role
+        if not await self.repo.exists(budget_id):
             raise HTTPException(
                 status_code=404, detail={"detail": "Budget not found", "code": "not_found"}
             )
-        if budget.owner_id == user_id:
-            return budget
-        collab = await self.repo.get_collaborator(budget_id, user_id)
-        if not collab or collab.accepted_at is None:
-            raise HTTPException(
-                status_code=403, detail={"detail": "Access denied", "code": "budget_access_denied"}
-            )
-        return budget
+        raise HTTPException(
+            status_code=403, detail={"detail": "Access denied", "code": "budget_access_denied"}
+        )
 
-    async def _require_owner(self, budget_id: uuid.UUID, user_id: uuid.UUID) -> Budget:
-        budget = await self._require_access(budget_id, user_id)
-        if budget.owner_id != user_id:
+    async def _require_owner(self, budget_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        if await self._require_access(budget_id, user_id) != OWNER:
             raise HTTPException(
                 status_code=403,
                 detail={
@@ -51,10 +71,19 @@ class BudgetService:
                     "code": "budget_role_insufficient",
                 },
             )
+
+    async def _load(self, budget_id: uuid.UUID) -> Budget:
+        """Load the budget with its categories, for endpoints that return them."""
+        budget = await self.repo.get_by_id_with_categories(budget_id)
+        if not budget:
+            raise HTTPException(
+                status_code=404, detail={"detail": "Budget not found", "code": "not_found"}
+            )
         return budget
 
     async def get_budget(self, budget_id: uuid.UUID, user_id: uuid.UUID) -> Budget:
-        return await self._require_access(budget_id, user_id)
+        await self._require_access(budget_id, user_id)
+        return await self._load(budget_id)
 
     async def create_budget(self, user_id: uuid.UUID, data: BudgetCreate) -> Budget:
         budget = await self.repo.create(
@@ -80,24 +109,89 @@ class BudgetService:
     async def update_budget(
         self, budget_id: uuid.UUID, user_id: uuid.UUID, data: BudgetUpdate
     ) -> Budget:
-        budget = await self._require_owner(budget_id, user_id)
+        await self._require_owner(budget_id, user_id)
+        budget = await self._load(budget_id)
         kwargs = data.model_dump(exclude_none=True)
         if not kwargs:
             return budget
         updated = await self.repo.update(budget, **kwargs)
+        if kwargs.keys() & PERIOD_FIELDS:
+            await self.spend_repo.rebuild([budget_id])
         loaded = await self.repo.get_by_id_with_categories(updated.id)
         return loaded or updated
 
     async def delete_budget(self, budget_id: uuid.UUID, user_id: uuid.UUID) -> None:
-        budget = await self._require_owner(budget_id, user_id)
+        await self._require_owner(budget_id, user_id)
+        budget = await self.repo.get(budget_id)
+        if not budget:
+            raise HTTPException(
+                status_code=404, detail={"detail": "Budget not found", "code": "not_found"}
+            )
+        await self.spend_repo.delete_for_budgets([budget_id])
+        await self.alert_repo.delete_for_budgets([budget_id])
         await self.repo.delete(budget)
 
     async def get_summary(
         self, budget_id: uuid.UUID, user_id: uuid.UUID
     ) -> BudgetSummaryResponse:
-        budget = await self._require_access(budget_id, user_id)
-        spending = await self.repo.get_spending_by_category(budget_id, budget_currency=budget.currency)
+        """Spending against limits in the budget's current period."""
+        await self._require_access(budget_id, user_id)
+        budget = await self._load(budget_id)
+        period = _current_period(budget)
+        spending = (
+            await self.spend_repo.get_spending([(budget.id, period[0])]) if period else {}
+        )
+        return self._summarize(budget, period, spending.get(budget.id, {}))
+
+    async def get_summaries(self, user_id: uuid.UUID) -> list[BudgetSummaryResponse]:
+        """Summaries of every accessible budget, in a fixed number of queries."""
+        budgets = await self.repo.get_accessible(user_id)
+        periods = {b.id: _current_period(b) for b in budgets}
+        spending = await self.spend_repo.get_spending(
+            [(budget_id, period[0]) for budget_id, period in periods.items() if period]
+        )
+        return [self._summarize(b, periods[b.id], spending.get(b.id, {})) for b in budgets]
+
+    async def get_history(
+        self, budget_id: uuid.UUID, user_id: uuid.UUID
+    ) -> list[BudgetPeriodHistory]:
+        """Spending of every period that has any, oldest first, from the period counters."""
+        await self._require_access(budget_id, user_id)
+        budget = await self.repo.get(budget_id)
+        if not budget:
+            raise HTTPException(
+                status_code=404, detail={"detail": "Budget not found", "code": "not_found"}
+            )
+        history: list[BudgetPeriodHistory] = []
+        for period_start, rows in groupby(
+            await self.spend_repo.get_history(budget_id), key=lambda r: r.period_start
+        ):
+            categories = [
+                BudgetPeriodCategorySpend(
+                    category_id=None if r.category_id == UNCATEGORIZED_ID else r.category_id,
+                    spent_amount=Decimal(str(r.amount)),
+                )
+                for r in rows
+            ]
+            # Counters only exist for periods inside the budget's dates
+            period = budget_period_bounds(
+                budget.period_type, budget.start_date, budget.end_date, period_start
+            )
+            end = period[1] if period else period_start
+            history.append(
+                BudgetPeriodHistory(
+                    period_start=period_start,
+                    period_end=None if end == date.max else end,
+                    total_spent=sum((c.spent_amount for c in categories), Decimal("0")),
+                    categories=categories,
+                )
+            )
+        return history
 
+    @staticmethod
+    def _summarize(
+        budget: Budget, period: tuple[date, date] | None, spending: dict[uuid.UUID, Decimal]
+    ) -> BudgetSummaryResponse:
         categories = []
         total_limit = Decimal("0")
         total_spent = Decimal("0")
@@ -125,6 +219,8 @@ class BudgetService:
             start_date=budget.start_date,
             end_date=budget.end_date,
             currency=budget.currency,
+            period_start=period[0] if period else None,
+            period_end=period[1] if period and period[1] != date.max else None,
             categories=categories,
             total_limit=total_limit,
             total_spent=total_spent,
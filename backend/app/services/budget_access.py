@@ -0,0 +1,107 @@
+"""Per-user map of accessible budgets, for permission checks without queries.
+
+Every budget endpoint checks the caller's access first. The map
+{budget_id: role} (``owner``, ``editor`` or ``viewer``) of each user is loaded
+with one query and cached in process. A permission check is then a dict lookup.
+
+ORM writes that change who can reach a budget drop the affected users' maps
+once the writing session commits or rolls back. This follows the report cache
+pattern. Collaborator invites, role changes and removals affect the
+collaborator. Budget creation and deletion affect the owner, and through the
+cascade every collaborator.
+
+Invalidation only reaches the process that made the write. Other workers keep
+serving their cached map until it expires after
+``budget_access_cache_ttl_seconds`` (60 by default). That is the bound on how
+long a revoked collaborator can keep reaching a budget through another process.
+"""
+
+import itertools
+import uuid
+from typing import Any, cast
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.budget import Budget, BudgetCollaborator
+from app.repositories.budget import BudgetRepository
+from app.services.report_cache import CacheBackend, LRUCacheBackend
+
+OWNER = "owner"
+
+_DIRTY_USERS_KEY = "budget_access_dirty_users"
+
+
+class BudgetAccessCache:
+    def __init__(self, backend: CacheBackend, enabled: bool = True) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every invalidation; a load that raced one is not stored
+        self._generation = 0
+
+    async def get_or_load(
+        self, user_id: uuid.UUID, repo: BudgetRepository
+    ) -> dict[uuid.UUID, str]:
+        if self.enabled:
+            cached = self.backend.get(str(user_id))
+            if cached is not None:
+                self.hits += 1
+                return cast(dict[uuid.UUID, str], cached)
+        self.misses += 1
+        generation = self._generation
+        access = await repo.get_access_map(user_id)
+        if self.enabled and generation == self._generation:
+            self.backend.set(str(user_id), access)
+        return access
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self.backend.delete(str(user_id))
+        self._generation += 1
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.backend),
+            "max_entries": self.backend.max_entries,
+            "ttl_seconds": self.backend.ttl_seconds,
+        }
+
+
+def _build_cache() -> BudgetAccessCache:
+    settings = get_settings()
+    return BudgetAccessCache(
+        LRUCacheBackend(
+            settings.budget_access_cache_max_entries, settings.budget_access_cache_ttl_seconds
+        ),
+        enabled=settings.budget_access_cache_enabled,
+    )
+
+
+budget_access_cache = _build_cache()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_access_changes(session: Session, flush_context: Any) -> None:
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, BudgetCollaborator):
+            session.info.setdefault(_DIRTY_USERS_KEY, set()).add(obj.user_id)
+        elif isinstance(obj, Budget) and (obj in session.new or obj in session.deleted):
+            session.info.setdefault(_DIRTY_USERS_KEY, set()).add(obj.owner_id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_access_maps(session: Session) -> None:
+    for user_id in session.info.pop(_DIRTY_USERS_KEY, ()):
+        budget_access_cache.invalidate(user_id)
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.currency import Currency, ExchangeRate
 from app.repositories.currency import CurrencyRepository, ExchangeRateRepository
 from app.schemas.currency import HistoricalRatesResponse, LatestRatesResponse
+from app.services.rate_cache import rate_cache
 from decimal import Decimal
 
 
@@ -24,6 +25,11 @@ class CurrencyService:
             if r.date > rate_date or not rate_map:
                 rate_date = r.date
             rate_map[r.target_currency] = Decimal(str(r.rate))
+        # Currencies without a stored row for this base are triangulated via the pivot
+        snapshot = await rate_cache.snapshot(self.rate_repo)
+        if snapshot is not None:
+            for target, rate in snapshot.rates_from(base).items():
+                rate_map.setdefault(target, rate)
         return LatestRatesResponse(base=base, date=rate_date, rates=rate_map)
 
     async def get_historical_rates(
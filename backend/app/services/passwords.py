@@ -0,0 +1,115 @@
+"""Password hashing and verification off the event loop.
+
+bcrypt is deliberately slow (about 200 ms per call at the default cost), and
+running it inline blocks every other request in the worker. Calls run instead
+in a dedicated thread pool of ``password_hash_workers`` threads. bcrypt releases
+the GIL while hashing, so the event loop keeps serving requests. At most
+``password_hash_max_queue`` calls may wait for a thread. Beyond that, new calls
+fail fast with ``PasswordPoolFull`` instead of queueing without bound during a
+login burst.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+import bcrypt
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+
+class PasswordPoolFull(Exception):
+    """Raised when ``password_hash_max_queue`` calls are already waiting for a thread."""
+
+
+class PasswordPool:
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_seconds = 0.0
+        # Counters are updated from worker threads as well as the event loop
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise PasswordPoolFull
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password")
+        submitted = time.monotonic()
+        # Set once this call's queue slot is given back, by whichever of the
+        # worker (on start) or the awaiting coroutine (on exit) gets there first
+        released = False
+
+        def release_slot() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.queued -= 1
+
+        def job() -> T:
+            with self._lock:
+                release_slot()
+                self.running += 1
+                self._wait_seconds += time.monotonic() - submitted
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            # A call cancelled while still queued never reaches job()
+            with self._lock:
+                release_slot()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "running": self.running,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": self._wait_seconds * 1000 / started if started else 0.0,
+            }
+
+
+password_pool = PasswordPool(
+    get_settings().password_hash_workers, get_settings().password_hash_max_queue
+)
+
+
+async def hash_password(password: str) -> str:
+    """Return a bcrypt hash of ``password`` with a fresh salt."""
+    hashed = await password_pool.run(bcrypt.hashpw, password.encode(), bcrypt.gensalt())
+    return hashed.decode()
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await password_pool.run(bcrypt.checkpw, password.encode(), password_hash.encode())
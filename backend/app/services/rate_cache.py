@@ -0,0 +1,249 @@
+"""Process-wide snapshot of exchange rates for every currency pair.
+
+The snapshot is loaded on startup and reloaded after each rate refresh commits.
+A reload builds a new snapshot and swaps the reference in one assignment, so
+readers see either the old or the new snapshot, never a partial one. Once
+loaded, the snapshot is complete: lookups answer without touching the database.
+
+Pairs with no stored row are answered by triangulating through a pivot
+currency (``rate_pivot_currency``, EUR by default, the ECB reference base):
+``rate(a, b) = rate(pivot, b) / rate(pivot, a)``. So every currency quoted
+against the pivot can be converted to every other one, not just the fetched bases.
+
+Besides the latest rates, the snapshot keeps each pair's history for the last
+``rate_cache_history_days`` as sorted date/rate arrays. The rate in force on
+a date is then found with a bisect. Older dates fall back to an indexed query.
+
+A snapshot older than ``rate_cache_ttl_seconds`` is reloaded in the background
+on its own session, picking up rates written by other processes (e.g.
+``manage.py``). Concurrent lookups share that one reload and keep being served
+the old snapshot until the new one is swapped in. Until the first load, for
+example in tests or scripts that never run the app's startup, lookups fall
+through to the database.
+"""
+
+import asyncio
+import logging
+import time
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import groupby
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.repositories.currency import ExchangeRateRepository
+
+logger = logging.getLogger(__name__)
+
+Pair = tuple[str, str]
+
+# Scale of exchange_rates.rate / transactions.exchange_rate
+_RATE_SCALE = 8
+_RATE_QUANTUM = Decimal(1).scaleb(-_RATE_SCALE)
+
+
+class RateSeries:
+    """One pair's rates as parallel arrays of date ordinals and values, sorted by date.
+
+    Values are stored as integers in units of ``_RATE_QUANTUM``, the rate
+    column's own scale, so every stored rate round-trips exactly.
+    """
+
+    __slots__ = ("ordinals", "values")
+
+    def __init__(self, points: Iterable[tuple[date, Decimal]]) -> None:
+        self.ordinals = array("l")
+        self.values = array("q")
+        for day, rate in points:
+            self.ordinals.append(day.toordinal())
+            self.values.append(int(rate.quantize(_RATE_QUANTUM).scaleb(_RATE_SCALE)))
+
+    def at(self, on: date) -> Decimal:
+        """Rate in force on ``on``; the earliest rate if the series starts later."""
+        index = max(bisect_right(self.ordinals, on.toordinal()) - 1, 0)
+        return Decimal(self.values[index]).scaleb(-_RATE_SCALE)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+
+class RateSnapshot:
+    """Latest rate and recent history of every stored pair, with pivot cross rates."""
+
+    def __init__(
+        self,
+        direct: dict[Pair, Decimal],
+        pivot: str,
+        history: dict[Pair, RateSeries] | None = None,
+        since: date | None = None,
+    ) -> None:
+        self.direct = direct
+        self.pivot = pivot
+        self.history = history or {}
+        # First date whose as-of lookups the history can answer; None: latest only
+        self.since = since
+        quoted = {target for base, target in direct if base == pivot}
+        quoted |= {base for base, target in direct if target == pivot}
+        self._quoted = quoted | {pivot}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any], pivot: str, since: date) -> "RateSnapshot":
+        """Build from (base_currency, target_currency, date, rate) rows sorted by pair and date."""
+        direct: dict[Pair, Decimal] = {}
+        history: dict[Pair, RateSeries] = {}
+        for pair, group in groupby(rows, key=lambda r: (r.base_currency, r.target_currency)):
+            points = [(row.date, Decimal(str(row.rate))) for row in group]
+            direct[pair] = points[-1][1]
+            history[pair] = RateSeries(points)
+        return cls(direct, pivot, history, since)
+
+    def covers(self, on: date | None) -> bool:
+        """Whether a lookup for ``on`` (None: latest) can be answered from memory."""
+        return on is None or (self.since is not None and on >= self.since)
+
+    def get(self, from_currency: str, to_currency: str, on: date | None = None) -> Decimal | None:
+        """Return the stored rate, else the cross rate via the pivot, else None.
+
+        With ``on``, rates are those in force on that date; check ``covers`` first.
+        """
+        rate = self._stored(from_currency, to_currency, on)
+        if rate is not None:
+            return rate
+        src = self._per_pivot(from_currency, on)
+        dst = self._per_pivot(to_currency, on)
+        if src is None or dst is None:
+            return None
+        return (dst / src).quantize(_RATE_QUANTUM)
+
+    def rates_from(self, base: str) -> dict[str, Decimal]:
+        """Return the latest rate from ``base`` to every currency the snapshot can price."""
+        targets = self._quoted | {t for b, t in self.direct if b == base}
+        rates = {target: self.get(base, target) for target in targets if target != base}
+        return {target: rate for target, rate in rates.items() if rate is not None}
+
+    @property
+    def currencies(self) -> int:
+        return len(self._quoted)
+
+    @property
+    def points(self) -> int:
+        return sum(len(series) for series in self.history.values())
+
+    def _stored(self, base: str, target: str, on: date | None) -> Decimal | None:
+        if on is None:
+            return self.direct.get((base, target))
+        series = self.history.get((base, target))
+        return series.at(on) if series is not None else None
+
+    def _per_pivot(self, currency: str, on: date | None) -> Decimal | None:
+        """Units of ``currency`` per one unit of the pivot."""
+        if currency == self.pivot:
+            return Decimal("1")
+        rate = self._stored(self.pivot, currency, on)
+        if rate:
+            return rate
+        inverse = self._stored(currency, self.pivot, on)
+        return 1 / inverse if inverse else None
+
+
+class RateCache:
+    def __init__(
+        self,
+        ttl_seconds: float,
+        pivot: str = "EUR",
+        history_days: int = 730,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.pivot = pivot
+        self.history_days = history_days
+        self.session_factory = session_factory
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self._snapshot: RateSnapshot | None = None
+        self._loaded_at = 0.0
+        self._refresh: asyncio.Task[None] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    async def load(self, repo: ExchangeRateRepository) -> None:
+        """Replace the snapshot with every pair's latest rate and recent history (two queries)."""
+        since = date.today() - timedelta(days=self.history_days)
+        snapshot = RateSnapshot.from_rows(await repo.get_history(since), self.pivot, since)
+        self._snapshot, self._loaded_at = snapshot, time.monotonic()
+        self.reloads += 1
+
+    def clear(self) -> None:
+        """Drop the snapshot so lookups go to the database until the next load."""
+        self._snapshot = None
+
+    async def snapshot(self, repo: ExchangeRateRepository) -> RateSnapshot | None:
+        """Return the current snapshot, starting a background reload if it has expired.
+
+        The expired snapshot is still returned; lookups see the new one once the
+        reload has swapped it in. Returns None while the cache has never been loaded.
+        """
+        if self._snapshot is None:
+            return None
+        if self.is_stale():
+            self.start_refresh()
+        return self._snapshot
+
+    def start_refresh(self) -> asyncio.Task[None]:
+        """Return the in-flight background reload, starting one if there is none."""
+        if self._refresh is None:
+            self._refresh = asyncio.create_task(self._reload())
+
+            def _done(finished: asyncio.Task[None]) -> None:
+                if self._refresh is finished:
+                    self._refresh = None
+                if not finished.cancelled() and finished.exception() is not None:
+                    logger.warning("Background rate snapshot reload failed: %s", finished.exception())
+
+            self._refresh.add_done_callback(_done)
+        return self._refresh
+
+    async def _reload(self) -> None:
+        # The caller's session belongs to its request, so the reload opens its own
+        async with self.session_factory() as session:
+            await self.load(ExchangeRateRepository(session))
+
+    def record(self, hits: int = 0, misses: int = 0) -> None:
+        """Count lookups answered from the snapshot (hits) or not (misses)."""
+        self.hits += hits
+        self.misses += misses
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "loaded": self.loaded,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "pivot": self.pivot,
+            "pairs": len(self._snapshot.direct) if self._snapshot else 0,
+            "currencies": self._snapshot.currencies if self._snapshot else 0,
+            "history_points": self._snapshot.points if self._snapshot else 0,
+            "age_seconds": time.monotonic() - self._loaded_at if self.loaded else None,
+            "ttl_seconds": self.ttl_seconds,
+            "reloads": self.reloads,
+        }
+
+
+rate_cache = RateCache(
+    get_settings().rate_cache_ttl_seconds,
+    pivot=get_settings().rate_pivot_currency,
+    history_days=get_settings().rate_cache_history_days,
+)
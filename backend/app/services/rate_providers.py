@@ -0,0 +1,59 @@
+"""Sources of historical exchange rates for the backfill job."""
+
+import json
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Protocol
+
+import httpx
+
+# {date: {target currency: rate}}
+TimeSeries = dict[date, dict[str, Decimal]]
+
+
+class RateProvider(Protocol):
+    async def time_series(self, base: str, start: date, end: date) -> TimeSeries:
+        """Return the rates from ``base`` for every published date in [start, end]."""
+        ...
+
+
+class FrankfurterProvider:
+    """Time series from the Frankfurter API (ECB reference rates, business days only)."""
+
+    def __init__(self, client: httpx.AsyncClient, base_url: str) -> None:
+        self.client = client
+        self.base_url = base_url.rstrip("/")
+
+    async def time_series(self, base: str, start: date, end: date) -> TimeSeries:
+        resp = await self.client.get(
+            f"{self.base_url}/{start.isoformat()}..{end.isoformat()}", params={"base": base}
+        )
+        resp.raise_for_status()
+        return _parse_series(resp.json().get("rates", {}), start, end)
+
+
+class FileRateProvider:
+    """Time series read from a local JSON file, for offline backfills and tests.
+
+    The file maps base currency to date to rates, in the shape of Frankfurter's
+    time series responses: ``{"EUR": {"2024-01-02": {"USD": 1.0956, ...}}}``.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._data: dict[str, dict[str, dict[str, float]]] | None = None
+
+    async def time_series(self, base: str, start: date, end: date) -> TimeSeries:
+        if self._data is None:
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+        return _parse_series(self._data.get(base, {}), start, end)
+
+
+def _parse_series(raw: dict[str, dict[str, float]], start: date, end: date) -> TimeSeries:
+    series: TimeSeries = {}
+    for day, rates in raw.items():
+        parsed = date.fromisoformat(day)
+        if start <= parsed <= end:
+            series[parsed] = {target: Decimal(str(rate)) for target, rate in rates.items()}
+    return series
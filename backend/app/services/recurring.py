@@ -51,6 +51,13 @@ class RecurringService:
         kwargs = data.model_dump(exclude_none=True)
         if not kwargs:
             return rule
+        if rule.status == "paused" and kwargs.get("status") == "active":
+            # Occurrences that fell due while paused are skipped, not backfilled
+            resume_from = rule.next_occurrence
+            today = date.today()
+            while resume_from < today:
+                resume_from = next_occurrence(resume_from, rule.frequency)
+            kwargs["next_occurrence"] = resume_from
         return await self.repo.update(rule, **kwargs)
 
     async def delete_rule(self, id: uuid.UUID, user_id: uuid.UUID) -> None:
@@ -0,0 +1,189 @@
+"""Versioned cache for report results.
+
+Entries are keyed by (user_id, endpoint, parameters, user data version, global
+version). Writes never delete entries: they bump a version instead, so every
+key built afterwards misses and stale entries age out of the LRU. Versions are
+bumped only once the writing session commits, so a report computed before the
+commit can never be stored under the new version.
+
+ORM writes to accounts, categories and transactions bump the owning user's
+version automatically (system categories bump the global one). Core-level
+writes mark the session explicitly: bulk transaction inserts through
+``TransactionEffects`` and exchange rate refreshes through ``invalidate_all``. Versions live in the
+process, matching the single-process deployment. A shared backend for several
+workers would also need shared versions.
+"""
+
+import itertools
+import json
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol, TypeVar, cast
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.account import Account
+from app.models.category import Category
+from app.models.transaction import Transaction
+
+T = TypeVar("T")
+
+_DIRTY_USERS_KEY = "report_cache_dirty_users"
+_DIRTY_GLOBAL_KEY = "report_cache_dirty_global"
+
+
+class CacheBackend(Protocol):
+    """Storage for cached report results. ``get`` returns None on a miss."""
+
+    max_entries: int
+    ttl_seconds: float
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class LRUCacheBackend:
+    """In-process LRU with a size bound and a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReportCache:
+    def __init__(self, backend: CacheBackend, enabled: bool = True) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._user_versions: dict[uuid.UUID, int] = {}
+        self._global_version = 0
+
+    def set_backend(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    def key(self, user_id: uuid.UUID, endpoint: str, params: dict[str, Any]) -> str:
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        version = self._user_versions.get(user_id, 0)
+        return f"{user_id}:{endpoint}:{encoded}:{version}:{self._global_version}"
+
+    async def get_or_compute(
+        self,
+        user_id: uuid.UUID,
+        endpoint: str,
+        params: dict[str, Any],
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        if not self.enabled:
+            return await compute()
+        key = self.key(user_id, endpoint, params)
+        cached = self.backend.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cast(T, cached)
+        self.misses += 1
+        value = await compute()
+        self.backend.set(key, value)
+        return value
+
+    def bump_user(self, user_id: uuid.UUID) -> None:
+        self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+
+    def bump_global(self) -> None:
+        self._global_version += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.backend),
+            "max_entries": self.backend.max_entries,
+            "ttl_seconds": self.backend.ttl_seconds,
+        }
+
+
+def _build_cache() -> ReportCache:
+    settings = get_settings()
+    return ReportCache(
+        LRUCacheBackend(settings.report_cache_max_entries, settings.report_cache_ttl_seconds),
+        enabled=settings.report_cache_enabled,
+    )
+
+
+report_cache = _build_cache()
+
+
+def invalidate_user(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """Bump ``user_id``'s report version once ``session`` commits."""
+    session.info.setdefault(_DIRTY_USERS_KEY, set()).add(user_id)
+
+
+def invalidate_all(session: AsyncSession) -> None:
+    """Bump the global report version once ``session`` commits (e.g. rate writes)."""
+    session.info[_DIRTY_GLOBAL_KEY] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_report_inputs(session: Session, flush_context: Any) -> None:
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Account, Category, Transaction)):
+            if obj.user_id is not None:
+                session.info.setdefault(_DIRTY_USERS_KEY, set()).add(obj.user_id)
+            else:
+                session.info[_DIRTY_GLOBAL_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_versions_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_DIRTY_USERS_KEY, ()):
+        report_cache.bump_user(user_id)
+    if session.info.pop(_DIRTY_GLOBAL_KEY, False):
+        report_cache.bump_global()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_USERS_KEY, None)
+    session.info.pop(_DIRTY_GLOBAL_KEY, None)
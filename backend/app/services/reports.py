@@ -16,16 +16,57 @@ from app.schemas.reports import (
     SpendingReportResponse,
     TrendsReportResponse,
 )
-from app.utils.currency import convert
+from app.services.report_cache import report_cache
+from app.utils.currency import convert, get_rate_or_1
 
 
 class ReportsService:
     def __init__(self, session: AsyncSession) -> None:
         self.repo = ReportsRepository(session)
         self.rate_repo = ExchangeRateRepository(session)
+        self.cache = report_cache
 
     async def spending_report(
         self, user_id: uuid.UUID, from_date: date, to_date: date, currency: str
+    ) -> SpendingReportResponse:
+        return await self.cache.get_or_compute(
+            user_id,
+            "spending",
+            {"from_date": from_date, "to_date": to_date, "currency": currency},
+            lambda: self._spending_report(user_id, from_date, to_date, currency),
+        )
+
+    async def income_vs_expenses(
+        self, user_id: uuid.UUID, from_date: date, to_date: date, currency: str
+    ) -> IncomeVsExpenseResponse:
+        return await self.cache.get_or_compute(
+            user_id,
+            "income-vs-expenses",
+            {"from_date": from_date, "to_date": to_date, "currency": currency},
+            lambda: self._income_vs_expenses(user_id, from_date, to_date, currency),
+        )
+
+    async def trends_report(
+        self, user_id: uuid.UUID, months: int, currency: str
+    ) -> TrendsReportResponse:
+        # The window is relative to today, so the date is part of the key
+        return await self.cache.get_or_compute(
+            user_id,
+            "trends",
+            {"months": months, "currency": currency, "today": date.today()},
+            lambda: self._trends_report(user_id, months, currency),
+        )
+
+    async def net_worth(self, user_id: uuid.UUID, currency: str) -> NetWorthResponse:
+        return await self.cache.get_or_compute(
+            user_id,
+            "net-worth",
+            {"currency": currency, "today": date.today()},
+            lambda: self._net_worth(user_id, currency),
+        )
+
+    async def _spending_report(
+        self, user_id: uuid.UUID, from_date: date, to_date: date, currency: str
     ) -> SpendingReportResponse:
         rows = await self.repo.spending_by_category(user_id, from_date, to_date)
         total = sum(r["amount"] for r in rows)
@@ -48,7 +89,7 @@ class ReportsService:
             categories=categories,
         )
 
-    async def income_vs_expenses(
+    async def _income_vs_expenses(
         self, user_id: uuid.UUID, from_date: date, to_date: date, currency: str
     ) -> IncomeVsExpenseResponse:
         rows = await self.repo.income_vs_expenses(user_id, from_date, to_date)
@@ -73,7 +114,7 @@ class ReportsService:
             total_net=total_income - total_expenses,
         )
 
-    async def trends_report(
+    async def _trends_report(
         self, user_id: uuid.UUID, months: int, currency: str
     ) -> TrendsReportResponse:
         rows = await self.repo.monthly_trends(user_id, months)
@@ -88,7 +129,7 @@ class ReportsService:
         ]
         return TrendsReportResponse(months=months, currency=currency, trends=trends)
 
-    async def net_worth(self, user_id: uuid.UUID, currency: str) -> NetWorthResponse:
+    async def _net_worth(self, user_id: uuid.UUID, currency: str) -> NetWorthResponse:
         from datetime import date as date_type
 
         balances_raw = await self.repo.account_balances(user_id)
@@ -97,9 +138,8 @@ class ReportsService:
         total_liabilities = Decimal("0")
 
         for row in balances_raw:
-            rate = await self.rate_repo.get_latest(row["currency"], currency)
-            rate_val = Decimal(str(rate.rate)) if rate else Decimal("1")
-            balance_base = row["balance"] * rate_val
+            rate = await get_rate_or_1(self.rate_repo, row["currency"], currency)
+            balance_base = row["balance"] * rate
 
             accounts.append(
                 AccountBalance(
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterator
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+from typing import Any
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.account import AccountRepository
+from app.repositories.currency import CurrencyRepository, ExchangeRateRepository
+from app.repositories.transaction import TransactionRepository
+from app.schemas.transaction import (
+    ImportRowError,
+    StatementImportResponse,
+    TransactionCreate,
+)
+from app.services.transaction import build_transaction_row
+from app.services.transaction_effects import TransactionEffects
+from app.utils.currency import get_rate_or_1
+from app.utils.statement_parsers import ParseResult, RowError
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_ERRORS = 100
+
+ProgressCallback = Callable[[StatementImportResponse], None]
+
+
+async def parse_in_threadpool(
+    rows: Iterator[ParseResult], batch_size: int
+) -> AsyncIterator[ParseResult]:
+    """Run a statement parser off the event loop, ``batch_size`` rows per thread hop."""
+    while batch := await run_in_threadpool(lambda: list(islice(rows, batch_size))):
+        for row in batch:
+            yield row
+
+
+class StatementImportService:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.repo = TransactionRepository(session)
+        self.rate_repo = ExchangeRateRepository(session)
+        self.account_repo = AccountRepository(session)
+        self.currency_repo = CurrencyRepository(session)
+        self.effects = TransactionEffects(session)
+        self._rates: dict[tuple[str, str, date], Decimal] = {}
+
+    async def import_statement(
+        self,
+        user_id: uuid.UUID,
+        account_id: uuid.UUID,
+        rows: AsyncIterable[ParseResult],
+        base_currency: str,
+        chunk_size: int,
+        category_id: uuid.UUID | None = None,
+        on_progress: ProgressCallback | None = None,
+    ) -> StatementImportResponse:
+        """Import parsed statement rows into one account, chunk by chunk.
+
+        ``rows`` is consumed lazily, so only one chunk of rows is held in memory.
+        Each chunk is written with a single multi-row INSERT, applied to balances
+        and rollups and committed before the next one is read; a failure therefore
+        keeps every chunk committed before it. Rows are converted at the rate in
+        force on their own date. Positive amounts become income, negative
+        amounts expenses. Unreadable rows and rows in a currency missing from
+        the currencies table are skipped and reported by line.
+        """
+        account = await self.account_repo.get_by_id_and_user(account_id, user_id)
+        if not account:
+            raise HTTPException(
+                status_code=404,
+                detail={"detail": "Account not found", "code": "not_found"},
+            )
+
+        known_currencies = await self.currency_repo.get_codes()
+        summary = StatementImportResponse()
+        batch: list[dict[str, Any]] = []
+        async for parsed in rows:
+            if isinstance(parsed, RowError):
+                self._skip(summary, parsed.line, parsed.detail)
+                continue
+            currency = parsed.currency or account.currency
+            if currency not in known_currencies:
+                self._skip(summary, parsed.line, f"Unknown currency: {currency}")
+                continue
+            if parsed.amount == 0:
+                self._skip(summary, parsed.line, "Zero amount")
+                continue
+
+            item = TransactionCreate(
+                account_id=account.id,
+                category_id=category_id,
+                type="income" if parsed.amount > 0 else "expense",
+                amount=abs(parsed.amount),
+                currency=currency,
+                date=parsed.date,
+                notes=parsed.description,
+            )
+            batch.append(
+                build_transaction_row(
+                    user_id,
+                    item,
+                    account.currency,
+                    await self._rate(currency, account.currency, parsed.date),
+                    await self._rate(currency, base_currency, parsed.date),
+                )
+            )
+            if len(batch) >= chunk_size:
+                await self._flush(batch, summary, on_progress)
+                batch = []
+
+        if batch:
+            await self._flush(batch, summary, on_progress)
+        return summary
+
+    async def _rate(self, from_currency: str, to_currency: str, on: date) -> Decimal:
+        """Resolve each currency pair and date once per import rather than once per row."""
+        key = (from_currency, to_currency, on)
+        if key not in self._rates:
+            self._rates[key] = await get_rate_or_1(
+                self.rate_repo, from_currency, to_currency, on
+            )
+        return self._rates[key]
+
+    async def _flush(
+        self,
+        batch: list[dict[str, Any]],
+        summary: StatementImportResponse,
+        on_progress: ProgressCallback | None,
+    ) -> None:
+        created = await self.repo.create_many(batch)
+        await self.effects.apply(created)
+        await self.session.commit()
+        summary.imported += len(created)
+        summary.chunks += 1
+        logger.info(
+            "Statement import chunk %d committed: %d imported, %d skipped so far",
+            summary.chunks,
+            summary.imported,
+            summary.skipped,
+        )
+        if on_progress:
+            on_progress(summary)
+
+    @staticmethod
+    def _skip(summary: StatementImportResponse, line: int, detail: str) -> None:
+        summary.skipped += 1
+        if len(summary.errors) < MAX_REPORTED_ERRORS:
+            summary.errors.append(ImportRowError(line=line, detail=detail))
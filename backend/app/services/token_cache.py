@@ -0,0 +1,83 @@
+"""Cache of verified JWT claims, keyed by a SHA-256 digest of the bearer token.
+
+Verifying a token means an RS256 signature check against the JWKS (or HS256 for
+local tokens) on every request, although clients send the same token until it
+expires. Once a token verifies, its claims are kept until the token's ``exp``,
+so repeat requests skip decoding entirely. Tokens without ``exp`` are not cached.
+
+OIDC entries record the JWKS generation they were verified under. After the key
+set is refreshed they are ignored and the token is verified again, so a key
+removed from the JWKS stops being accepted from the cache. Only digests are
+stored, never the tokens themselves.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.config import get_settings
+
+
+class ClaimsCache:
+    """LRU of verified claims with a size bound; each entry expires at its token's ``exp``."""
+
+    def __init__(self, max_entries: int, enabled: bool = True) -> None:
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        # digest -> (exp, JWKS generation or None for local tokens, claims)
+        self._entries: OrderedDict[bytes, tuple[float, int | None, dict[str, Any]]] = OrderedDict()
+
+    def get(self, token: str, generation: int) -> dict[str, Any] | None:
+        """Return the claims for ``token`` if cached, unexpired and verified under ``generation``."""
+        if not self.enabled:
+            return None
+        key = _digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, verified_under, claims = entry
+        if expires_at <= time.time() or verified_under not in (None, generation):
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: dict[str, Any], generation: int | None) -> None:
+        """Cache verified ``claims``; ``generation`` is None for tokens not checked against JWKS."""
+        expires_at = claims.get("exp")
+        if not self.enabled or not isinstance(expires_at, (int, float)):
+            return
+        key = _digest(token)
+        self._entries[key] = (float(expires_at), generation, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+claims_cache = ClaimsCache(
+    get_settings().token_cache_max_entries, enabled=get_settings().token_cache_enabled
+)
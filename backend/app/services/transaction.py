@@ -1,34 +1,96 @@
 from __future__ import annotations
 
 import uuid
+from collections.abc import AsyncIterator
 from decimal import Decimal
+from typing import Any
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.account import Account
 from app.models.transaction import Transaction
 from app.repositories.account import AccountRepository
 from app.repositories.currency import ExchangeRateRepository
-from app.repositories.transaction import TransactionRepository
-from app.schemas.transaction import TransactionCreate, TransactionFilters, TransactionUpdate
+from app.repositories.transaction import EXPORT_COLUMNS, TransactionRepository
+from app.schemas.transaction import (
+    BulkItemError,
+    TransactionBulkCreate,
+    TransactionCreate,
+    TransactionFilters,
+    TransactionUpdate,
+)
 from app.schemas.common import PaginatedResponse
+from app.services.transaction_effects import TransactionEffects
 from app.utils.currency import get_rate_or_1
+from app.utils.export import iter_csv, iter_ndjson
 from app.utils.pagination import build_paginated_response
 
+BULK_MODES = ("all_or_nothing", "partial")
+MAX_BULK_ITEMS = 5000
+# Updatable fields that change a transaction's contribution to balances or rollups
+REAGGREGATED_FIELDS = {"amount", "date", "category_id", "budget_id"}
+
+
+def build_transaction_row(
+    user_id: uuid.UUID,
+    data: TransactionCreate,
+    account_currency: str,
+    account_rate: Decimal,
+    base_rate: Decimal,
+) -> dict[str, Any]:
+    """Column values for inserting ``data``, converted at the given account and base rates."""
+    amount = Decimal(str(data.amount))
+    return {
+        "user_id": user_id,
+        "account_id": data.account_id,
+        "category_id": data.category_id,
+        "budget_id": data.budget_id,
+        "type": data.type,
+        "amount": data.amount,
+        "currency": data.currency,
+        "account_currency": account_currency,
+        "amount_account": amount * account_rate,
+        "account_exchange_rate": account_rate,
+        "amount_base": amount * base_rate,
+        "exchange_rate": base_rate,
+        "date": data.date,
+        "notes": data.notes,
+        "transfer_to_account_id": data.transfer_to_account_id,
+    }
+
 
 class TransactionService:
     def __init__(self, session: AsyncSession) -> None:
         self.repo = TransactionRepository(session)
         self.rate_repo = ExchangeRateRepository(session)
         self.account_repo = AccountRepository(session)
+        self.effects = TransactionEffects(session)
 
     async def list_transactions(
         self,
         user_id: uuid.UUID,
         filters: TransactionFilters,
     ) -> PaginatedResponse[Transaction]:
-        items, total = await self.repo.list_paginated(user_id, filters)
-        return build_paginated_response(items, total, filters.page, filters.page_size)
+        try:
+            items, total, next_cursor = await self.repo.list_paginated(user_id, filters)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=400,
+                detail={"detail": "Invalid pagination cursor", "code": "invalid_cursor"},
+            ) from exc
+        return build_paginated_response(
+            items, total, filters.page, filters.page_size, next_cursor
+        )
+
+    def export_transactions(
+        self, user_id: uuid.UUID, filters: TransactionFilters, fmt: str
+    ) -> AsyncIterator[str]:
+        """Return an async iterator of text chunks for a full filtered export."""
+        partitions = self.repo.stream_rows(user_id, filters)
+        if fmt == "ndjson":
+            return iter_ndjson(EXPORT_COLUMNS, partitions)
+        return iter_csv(EXPORT_COLUMNS, partitions)
 
     async def get_transaction(self, id: uuid.UUID, user_id: uuid.UUID) -> Transaction:
         tx = await self.repo.get_by_id_and_user(id, user_id)
@@ -55,31 +117,113 @@ class TransactionService:
         account = await self.account_repo.get(data.account_id)
         account_currency = account.currency if account else data.currency
 
-        # Snapshot rate to account currency at write time
-        account_rate = await get_rate_or_1(self.rate_repo, data.currency, account_currency)
-        amount_account = Decimal(str(data.amount)) * account_rate
-
-        # Snapshot rate to user's base currency at write time
-        base_rate = await get_rate_or_1(self.rate_repo, data.currency, base_currency)
-        amount_base = Decimal(str(data.amount)) * base_rate
-
-        return await self.repo.create(
-            user_id=user_id,
-            account_id=data.account_id,
-            category_id=data.category_id,
-            budget_id=data.budget_id,
-            type=data.type,
-            amount=data.amount,
-            currency=data.currency,
-            account_currency=account_currency,
-            amount_account=amount_account,
-            account_exchange_rate=account_rate,
-            amount_base=amount_base,
-            exchange_rate=base_rate,
-            date=data.date,
-            notes=data.notes,
-            transfer_to_account_id=data.transfer_to_account_id,
+        # Snapshot the rates in force on the transaction date at write time
+        account_rate = await get_rate_or_1(
+            self.rate_repo, data.currency, account_currency, data.date
+        )
+        base_rate = await get_rate_or_1(self.rate_repo, data.currency, base_currency, data.date)
+
+        tx = await self.repo.create(
+            **build_transaction_row(user_id, data, account_currency, account_rate, base_rate)
         )
+        await self.effects.apply([tx])
+        return tx
+
+    async def create_transactions_bulk(
+        self, user_id: uuid.UUID, data: TransactionBulkCreate, base_currency: str
+    ) -> tuple[list[Transaction], list[BulkItemError]]:
+        """Validate and insert many transactions with a fixed number of queries.
+
+        Accounts are validated in one query, every distinct currency pair and
+        date is resolved once, and all valid rows go out as a multi-row INSERT ... RETURNING.
+        In ``all_or_nothing`` mode any item error aborts the whole batch with a 400;
+        in ``partial`` mode valid items are inserted and errors are reported per index.
+        """
+        if data.mode not in BULK_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "detail": f"mode must be one of: {', '.join(BULK_MODES)}",
+                    "code": "invalid_bulk_mode",
+                },
+            )
+        if len(data.items) > MAX_BULK_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "detail": f"At most {MAX_BULK_ITEMS} transactions per request",
+                    "code": "bulk_too_large",
+                },
+            )
+
+        account_ids = {item.account_id for item in data.items} | {
+            item.transfer_to_account_id for item in data.items if item.transfer_to_account_id
+        }
+        accounts = {
+            a.id: a for a in await self.account_repo.get_many_by_user(account_ids, user_id)
+        }
+
+        errors: list[BulkItemError] = []
+        valid: list[tuple[int, TransactionCreate]] = []
+        for index, item in enumerate(data.items):
+            error = self._validate_bulk_item(item, accounts)
+            if error:
+                errors.append(BulkItemError(index=index, code=error[0], detail=error[1]))
+            else:
+                valid.append((index, item))
+
+        if errors and data.mode == "all_or_nothing":
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "detail": f"{len(errors)} of {len(data.items)} transactions are invalid",
+                    "code": "bulk_validation_failed",
+                    "errors": [e.model_dump() for e in errors],
+                },
+            )
+        if not valid:
+            return [], errors
+
+        keys = set()
+        for _, item in valid:
+            keys.add((item.currency, accounts[item.account_id].currency, item.date))
+            keys.add((item.currency, base_currency, item.date))
+        rates = {
+            (src, dst, day): await get_rate_or_1(self.rate_repo, src, dst, day)
+            for src, dst, day in keys
+        }
+
+        rows = []
+        for _, item in valid:
+            account_currency = accounts[item.account_id].currency
+            rows.append(
+                build_transaction_row(
+                    user_id,
+                    item,
+                    account_currency,
+                    rates[(item.currency, account_currency, item.date)],
+                    rates[(item.currency, base_currency, item.date)],
+                )
+            )
+        created = await self.repo.create_many(rows)
+        await self.effects.apply(created)
+        return created, errors
+
+    @staticmethod
+    def _validate_bulk_item(
+        item: TransactionCreate, accounts: dict[uuid.UUID, Account]
+    ) -> tuple[str, str] | None:
+        if item.account_id not in accounts:
+            return "account_not_found", "Account not found"
+        if item.type == "transfer":
+            if not item.transfer_to_account_id:
+                return (
+                    "transfer_account_required",
+                    "transfer_to_account_id is required for transfers",
+                )
+            if item.transfer_to_account_id not in accounts:
+                return "transfer_account_not_found", "Transfer destination account not found"
+        return None
 
     async def update_transaction(
         self, id: uuid.UUID, user_id: uuid.UUID, data: TransactionUpdate
@@ -95,8 +239,15 @@ class TransactionService:
         if "amount" in kwargs and tx.exchange_rate is not None:
             new_amount = Decimal(str(kwargs["amount"]))
             kwargs["amount_base"] = new_amount * Decimal(str(tx.exchange_rate))
-        return await self.repo.update(tx, **kwargs)
+        if not kwargs.keys() & REAGGREGATED_FIELDS:
+            return await self.repo.update(tx, **kwargs)
+        # Swap the old effect on balances, rollups and budget counters for the new one
+        await self.effects.apply([tx], sign=-1)
+        tx = await self.repo.update(tx, **kwargs)
+        await self.effects.apply([tx])
+        return tx
 
     async def delete_transaction(self, id: uuid.UUID, user_id: uuid.UUID) -> None:
         tx = await self.get_transaction(id, user_id)
+        await self.effects.apply([tx], sign=-1)
         await self.repo.delete(tx)
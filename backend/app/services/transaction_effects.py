@@ -0,0 +1,47 @@
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.transaction import Transaction
+from app.repositories.account import AccountBalanceRepository
+from app.repositories.budget import BudgetAlertRepository, BudgetSpendRepository
+from app.repositories.rollup import MonthlyRollupRepository
+from app.services.report_cache import invalidate_user
+
+
+class TransactionEffects:
+    """Keeps state derived from transactions in step with transaction writes.
+
+    Every code path that inserts, updates or deletes transactions calls
+    ``apply`` in the same session, so the account balance ledger, the
+    monthly report rollups and the budget period counters commit atomically
+    with the rows themselves, and cached reports of the affected users are
+    invalidated once they do.
+
+    Budget thresholds are checked against the counters the upsert returns, so
+    an expense that takes a category to ``budget_alert_thresholds`` percent of
+    its limit writes a ``budget_alerts`` outbox row without re-aggregating.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.balance_repo = AccountBalanceRepository(session)
+        self.rollup_repo = MonthlyRollupRepository(session)
+        self.budget_spend_repo = BudgetSpendRepository(session)
+        self.budget_alert_repo = BudgetAlertRepository(session)
+
+    async def apply(self, transactions: Iterable[Transaction], sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) the effect of transactions."""
+        transactions = list(transactions)
+        if not transactions:
+            return
+        await self.balance_repo.apply_transactions(transactions, sign)
+        await self.rollup_repo.apply_transactions(transactions, sign)
+        rises = await self.budget_spend_repo.apply_transactions(transactions, sign)
+        if rises:
+            await self.budget_alert_repo.record_crossings(
+                rises, get_settings().budget_alert_thresholds
+            )
+        for user_id in {tx.user_id for tx in transactions}:
+            invalidate_user(self.session, user_id)
@@ -0,0 +1,108 @@
+"""Cache of authenticated users' rows, keyed by token ``sub``.
+
+``get_current_user`` runs on every authenticated request, and user rows almost
+never change. Entries hold plain column snapshots, never ORM instances, because
+a request session cannot share objects with other sessions. A hit rebuilds the
+``User`` and merges it into the request's session without loading it, so routes
+get an ordinary persistent instance and no query runs.
+
+Any ORM write to a user (``UserService.update``, the admin PATCH/DELETE routes,
+sign-up) drops that user's entry once the writing session commits or rolls
+back. Invalidation follows the same pattern as the report cache. Entries
+otherwise live for ``user_cache_ttl_seconds``, which bounds staleness for writes
+made by other processes.
+"""
+
+import itertools
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import get_settings
+from app.models.user import User
+from app.repositories.user import UserRepository
+from app.services.report_cache import CacheBackend, LRUCacheBackend
+
+_DIRTY_SUBS_KEY = "user_cache_dirty_subs"
+
+
+class UserCache:
+    def __init__(self, backend: CacheBackend, enabled: bool = True) -> None:
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every invalidation; a load that raced one is not stored
+        self._generation = 0
+
+    def get(self, session: AsyncSession, sub: str) -> User | None:
+        """Return the cached user for ``sub`` attached to ``session``, or None on a miss."""
+        snapshot = self.backend.get(sub) if self.enabled else None
+        if snapshot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return session.sync_session.merge(user, load=False)
+
+    async def load(self, session: AsyncSession, sub: str) -> User | None:
+        """Query the user for ``sub`` and cache it. Misses are not cached."""
+        generation = self._generation
+        user = await UserRepository(session).get_by_sub(sub)
+        if user is not None and generation == self._generation:
+            self.put(user)
+        return user
+
+    def put(self, user: User) -> None:
+        if self.enabled:
+            columns = inspect(User).column_attrs
+            self.backend.set(user.sub, {attr.key: getattr(user, attr.key) for attr in columns})
+
+    def invalidate(self, sub: str) -> None:
+        self.backend.delete(sub)
+        self._generation += 1
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.backend),
+            "max_entries": self.backend.max_entries,
+            "ttl_seconds": self.backend.ttl_seconds,
+        }
+
+
+def _build_cache() -> UserCache:
+    settings = get_settings()
+    return UserCache(
+        LRUCacheBackend(settings.user_cache_max_entries, settings.user_cache_ttl_seconds),
+        enabled=settings.user_cache_enabled,
+    )
+
+
+user_cache = _build_cache()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_user_writes(session: Session, flush_context: Any) -> None:
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, User):
+            session.info.setdefault(_DIRTY_SUBS_KEY, set()).add(obj.sub)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_written_users(session: Session) -> None:
+    # On rollback too: an entry cached from the rolled-back state must not survive
+    for sub in session.info.pop(_DIRTY_SUBS_KEY, ()):
+        user_cache.invalidate(sub)
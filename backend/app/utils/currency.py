@@ -1,20 +1,66 @@
+from collections.abc import Iterable
+from datetime import date
 from decimal import Decimal
 
 from app.repositories.currency import ExchangeRateRepository
+from app.services.rate_cache import rate_cache
 
 
 async def get_rate_or_1(
-    repo: ExchangeRateRepository, from_currency: str, to_currency: str
+    repo: ExchangeRateRepository,
+    from_currency: str,
+    to_currency: str,
+    on: date | None = None,
 ) -> Decimal:
-    """Return the latest exchange rate, or 1.0 if same currency or not found."""
+    """Return the exchange rate in force on ``on`` (default: the latest rate).
+
+    Falls back to 1.0 if same currency or not found. Served from the in-process
+    rate snapshot once it is loaded, which also prices pairs without a stored
+    row through the pivot currency. The database is only queried before the
+    first load and for dates older than the snapshot's history.
+    """
     if from_currency == to_currency:
         return Decimal("1")
-    rate = await repo.get_latest(from_currency, to_currency)
+    on = _as_of(on)
+    snapshot = await rate_cache.snapshot(repo)
+    if snapshot is not None and snapshot.covers(on):
+        cached = snapshot.get(from_currency, to_currency, on)
+        rate_cache.record(hits=int(cached is not None), misses=int(cached is None))
+        return cached if cached is not None else Decimal("1")
+    rate_cache.record(misses=1)
+    if on is None:
+        rate = await repo.get_latest(from_currency, to_currency)
+    else:
+        rate = await repo.get_as_of(from_currency, to_currency, on)
     if rate:
         return Decimal(str(rate.rate))
+    if snapshot is not None:
+        # Too old for the history and no stored row: use today's cross rate
+        return snapshot.get(from_currency, to_currency) or Decimal("1")
     return Decimal("1")
 
 
+async def get_rates_or_1(
+    repo: ExchangeRateRepository,
+    pairs: Iterable[tuple[str, str]],
+    on: date | None = None,
+) -> dict[tuple[str, str], Decimal]:
+    """Resolve many (from, to) pairs at once with the same fallbacks as get_rate_or_1."""
+    pairs = set(pairs)
+    wanted = [p for p in pairs if p[0] != p[1]]
+    on = _as_of(on)
+    snapshot = await rate_cache.snapshot(repo)
+    if snapshot is not None and snapshot.covers(on):
+        found = {p: rate for p in wanted if (rate := snapshot.get(*p, on)) is not None}
+        rate_cache.record(hits=len(found), misses=len(wanted) - len(found))
+    elif on is None:
+        rate_cache.record(misses=len(wanted))
+        found = await repo.get_latest_many(wanted)
+    else:
+        found = {p: await get_rate_or_1(repo, *p, on) for p in wanted}
+    return {pair: found.get(pair, Decimal("1")) for pair in pairs}
+
+
 async def convert(
     amount: Decimal,
     from_currency: str,
@@ -24,3 +70,8 @@ async def convert(
     """Convert amount from one currency to another using latest rate."""
     rate = await get_rate_or_1(repo, from_currency, to_currency)
     return amount * rate
+
+
+def _as_of(on: date | None) -> date | None:
+    """Dates from today on use the latest rate, which is the one in force now."""
+    return on if on is not None and on < date.today() else None
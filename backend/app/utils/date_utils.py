@@ -49,3 +49,21 @@ def period_bounds(period_type: str, reference: date) -> tuple[date, date]:
     else:
         # custom — return just the reference day
         return reference, reference
+
+
+def budget_period_bounds(
+    period_type: str, start_date: date, end_date: date | None, reference: date
+) -> tuple[date, date] | None:
+    """Return the budget period containing reference date, or None outside the budget.
+
+    Like period_bounds, clipped to the budget's start and end dates, so the first
+    and last periods may be partial. A custom budget has a single period running
+    from its start date to its end date (open-ended when it has none).
+    """
+    last = end_date or date.max
+    if not start_date <= reference <= last:
+        return None
+    if period_type == "custom":
+        return start_date, last
+    start, end = period_bounds(period_type, reference)
+    return max(start, start_date), min(end, last)
@@ -0,0 +1,49 @@
+"""Serialize Core result rows to CSV / NDJSON text chunks for streaming responses."""
+
+import csv
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain(value: Any) -> Any:
+    """Convert a column value to a JSON/CSV friendly scalar (Decimals stay exact)."""
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+async def iter_csv(
+    columns: Sequence[str], partitions: AsyncIterator[Sequence[Sequence[Any]]]
+) -> AsyncIterator[str]:
+    """Yield a header line, then one CSV chunk per partition of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    async for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([[_plain(v) for v in row] for row in rows])
+        yield buffer.getvalue()
+
+
+async def iter_ndjson(
+    columns: Sequence[str], partitions: AsyncIterator[Sequence[Sequence[Any]]]
+) -> AsyncIterator[str]:
+    """Yield one newline-delimited JSON chunk per partition of rows."""
+    async for rows in partitions:
+        yield "".join(
+            json.dumps({c: _plain(v) for c, v in zip(columns, row)}) + "\n" for row in rows
+        )
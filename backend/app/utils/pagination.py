@@ -1,5 +1,7 @@
+import base64
+import json
 import math
-from typing import TypeVar
+from typing import Any, TypeVar
 
 from app.schemas.common import PaginatedResponse
 
@@ -8,15 +10,38 @@ T = TypeVar("T")
 
 def build_paginated_response(
     items: list[T],
-    total: int,
+    total: int | None,
     page: int,
     page_size: int,
+    next_cursor: str | None = None,
 ) -> PaginatedResponse[T]:
-    pages = math.ceil(total / page_size) if page_size > 0 else 0
+    if total is None:
+        pages = None
+    else:
+        pages = math.ceil(total / page_size) if page_size > 0 else 0
     return PaginatedResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
         pages=pages,
+        next_cursor=next_cursor,
     )
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor string."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor")
+    return values
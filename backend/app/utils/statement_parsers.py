@@ -0,0 +1,265 @@
+"""Incremental parsers for bank statement files (CSV, OFX, QIF).
+
+Every parser consumes an iterable of text lines and yields one ``ParsedRow`` per
+statement entry (or a ``RowError`` for entries it cannot read) as soon as the entry
+is complete, so files of any size are processed without being loaded into memory.
+Amounts are signed: positive for money in, negative for money out.
+"""
+
+import csv
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+STATEMENT_FORMATS = ("csv", "ofx", "qif")
+
+
+@dataclass(slots=True)
+class ParsedRow:
+    line: int
+    date: date
+    amount: Decimal
+    currency: str | None = None
+    description: str | None = None
+
+
+@dataclass(slots=True)
+class RowError:
+    line: int
+    detail: str
+
+
+ParseResult = ParsedRow | RowError
+
+
+def parse_statement(
+    fmt: str, lines: Iterable[str], date_format: str | None = None
+) -> Iterator[ParseResult]:
+    if fmt == "csv":
+        return parse_csv(lines, date_format)
+    if fmt == "ofx":
+        return parse_ofx(lines)
+    if fmt == "qif":
+        return parse_qif(lines, date_format)
+    raise ValueError(f"Unsupported statement format: {fmt}")
+
+
+def detect_format(filename: str | None) -> str | None:
+    """Guess the statement format from a file extension."""
+    if not filename or "." not in filename:
+        return None
+    ext = filename.rsplit(".", 1)[1].lower()
+    if ext in ("csv", "txt"):
+        return "csv"
+    if ext in ("ofx", "qfx"):
+        return "ofx"
+    if ext == "qif":
+        return "qif"
+    return None
+
+
+_DECIMAL_PART = re.compile(r"[.,](\d{1,2})$")
+_GROUPED_INTEGER = re.compile(r"[1-9]\d{0,2}(?:[.,]\d{3})+")
+
+
+def _parse_amount(raw: str) -> Decimal:
+    """Parse an amount written with either ``.`` or ``,`` as the decimal separator.
+
+    A ``.`` or ``,`` followed by one or two trailing digits is the decimal
+    separator; any other ``.``/``,`` must group the integer part in threes with
+    a single, different character. Anything else (``1,234,56``) is ambiguous and
+    rejected rather than guessed.
+    """
+    cleaned = raw.strip().replace(" ", "")
+    if cleaned.startswith("(") and cleaned.endswith(")"):
+        cleaned = "-" + cleaned[1:-1]
+    sign = cleaned[:1] if cleaned[:1] in "+-" else ""
+    cleaned = cleaned[len(sign):]
+
+    integer, fraction = cleaned, ""
+    decimal_part = _DECIMAL_PART.search(cleaned)
+    if decimal_part:
+        integer, fraction = cleaned[: decimal_part.start()], decimal_part.group(1)
+    grouping = {c for c in integer if c in ".,"}
+    if grouping:
+        if (
+            len(grouping) > 1
+            or (decimal_part and cleaned[decimal_part.start()] in grouping)
+            or not _GROUPED_INTEGER.fullmatch(integer)
+        ):
+            raise ValueError(f"Ambiguous amount: {raw.strip()!r}")
+        integer = integer.replace(grouping.pop(), "")
+    return Decimal(f"{sign}{integer or '0'}.{fraction}" if fraction else f"{sign}{integer}")
+
+
+def _parse_date(raw: str, date_format: str | None) -> date:
+    raw = raw.strip()
+    if date_format:
+        return datetime.strptime(raw, date_format).date()
+    return date.fromisoformat(raw[:10])
+
+
+# ---------------------------------------------------------------------------
+# CSV
+# ---------------------------------------------------------------------------
+
+_CSV_COLUMNS = {
+    "date": ("date", "transaction date", "posted date", "booking date"),
+    "amount": ("amount", "value"),
+    "debit": ("debit", "withdrawal", "money out"),
+    "credit": ("credit", "deposit", "money in"),
+    "currency": ("currency",),
+    "description": ("description", "payee", "memo", "notes", "narrative", "details"),
+}
+
+
+def parse_csv(lines: Iterable[str], date_format: str | None = None) -> Iterator[ParseResult]:
+    """Parse a headed CSV export.
+
+    Recognises a date column, either a signed ``amount`` column or separate
+    ``debit``/``credit`` columns, and optional ``currency`` and description columns
+    (matched case-insensitively against common bank header names).
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    normalized = [h.strip().lower() for h in header]
+    index: dict[str, int] = {}
+    for key, names in _CSV_COLUMNS.items():
+        for name in names:
+            if name in normalized:
+                index[key] = normalized.index(name)
+                break
+
+    if "date" not in index or not ("amount" in index or "debit" in index or "credit" in index):
+        yield RowError(line=1, detail="CSV header needs a date column and an amount or debit/credit column")
+        return
+
+    def cell(row: list[str], key: str) -> str:
+        pos = index.get(key)
+        return row[pos].strip() if pos is not None and pos < len(row) else ""
+
+    for row in reader:
+        line = reader.line_num
+        if not any(c.strip() for c in row):
+            continue
+        try:
+            tx_date = _parse_date(cell(row, "date"), date_format)
+            if "amount" in index:
+                amount = _parse_amount(cell(row, "amount"))
+            else:
+                credit = cell(row, "credit")
+                debit = cell(row, "debit")
+                amount = (_parse_amount(credit) if credit else Decimal("0")) - (
+                    abs(_parse_amount(debit)) if debit else Decimal("0")
+                )
+        except (ValueError, InvalidOperation) as exc:
+            yield RowError(line=line, detail=f"Unreadable row: {exc}")
+            continue
+        yield ParsedRow(
+            line=line,
+            date=tx_date,
+            amount=amount,
+            currency=cell(row, "currency").upper() or None,
+            description=cell(row, "description") or None,
+        )
+
+
+# ---------------------------------------------------------------------------
+# OFX / QFX (SGML or XML flavour)
+# ---------------------------------------------------------------------------
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+
+def parse_ofx(lines: Iterable[str]) -> Iterator[ParseResult]:
+    """Parse ``<STMTTRN>`` blocks from an OFX file, one tag at a time."""
+    currency: str | None = None
+    current: dict[str, str] | None = None
+    start_line = 0
+
+    for line_no, line in enumerate(lines, start=1):
+        for closing, tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+            value = value.strip()
+            if tag == "CURDEF" and not closing:
+                currency = value.upper() or None
+            elif tag == "STMTTRN":
+                if not closing:
+                    current, start_line = {}, line_no
+                elif current is not None:
+                    yield _ofx_row(current, start_line, currency)
+                    current = None
+            elif current is not None and not closing and value:
+                current[tag] = value
+
+
+def _ofx_row(fields: dict[str, str], line: int, currency: str | None) -> ParseResult:
+    try:
+        # DTPOSTED is YYYYMMDD[HHMMSS[.XXX]][[TZ]]; only the date part matters
+        posted = datetime.strptime(fields["DTPOSTED"][:8], "%Y%m%d").date()
+        amount = _parse_amount(fields["TRNAMT"])
+    except (KeyError, ValueError, InvalidOperation) as exc:
+        return RowError(line=line, detail=f"Unreadable STMTTRN: {exc}")
+    description = " - ".join(v for v in (fields.get("NAME"), fields.get("MEMO")) if v)
+    return ParsedRow(
+        line=line,
+        date=posted,
+        amount=amount,
+        currency=fields.get("CURRENCY", currency),
+        description=description or None,
+    )
+
+
+# ---------------------------------------------------------------------------
+# QIF
+# ---------------------------------------------------------------------------
+
+
+def _parse_qif_date(raw: str, date_format: str | None) -> date:
+    raw = raw.strip()
+    if date_format:
+        return datetime.strptime(raw, date_format).date()
+    # Quicken writes M/D/YY, M/D'YY (2000s) or M/D/YYYY
+    normalized = raw.replace("'", "/").replace("-", "/").replace(" ", "")
+    month, day, year = (int(p) for p in normalized.split("/"))
+    if year < 100:
+        year += 2000 if "'" in raw or year < 70 else 1900
+    return date(year, month, day)
+
+
+def parse_qif(lines: Iterable[str], date_format: str | None = None) -> Iterator[ParseResult]:
+    """Parse QIF records (``D`` date, ``T``/``U`` amount, ``P`` payee, ``M`` memo, ``^`` end)."""
+    fields: dict[str, str] = {}
+    start_line = 0
+
+    for line_no, raw in enumerate(lines, start=1):
+        line = raw.rstrip("\r\n")
+        if not line or line.startswith("!"):
+            continue
+        code, value = line[0], line[1:].strip()
+        if code == "^":
+            if fields:
+                yield _qif_row(fields, start_line, date_format)
+            fields = {}
+            continue
+        if not fields:
+            start_line = line_no
+        if code in "DTUPM" and code not in fields:
+            fields[code] = value
+
+    if fields:
+        yield _qif_row(fields, start_line, date_format)
+
+
+def _qif_row(fields: dict[str, str], line: int, date_format: str | None) -> ParseResult:
+    try:
+        tx_date = _parse_qif_date(fields["D"], date_format)
+        amount = _parse_amount(fields.get("T") or fields["U"])
+    except (KeyError, ValueError, InvalidOperation) as exc:
+        return RowError(line=line, detail=f"Unreadable QIF record: {exc}")
+    description = " - ".join(v for v in (fields.get("P"), fields.get("M")) if v)
+    return ParsedRow(line=line, date=tx_date, amount=amount, description=description or None)
@@ -0,0 +1,234 @@
+"""Benchmark budget listing: outer join + DISTINCT vs. a UNION of budget ids.
+
+Seeds a scratch database with ``--budgets`` budgets (default 10000) and
+``--collaborators`` collaborator rows (default 50000). Then, for a sample of
+users, it times and explains two variants:
+
+- ``before``: the previous ``get_accessible`` query, without the
+  ``(user_id, accepted_at)`` collaborator index;
+- ``after``: the current query, with the index.
+
+Run from ``backend/``::
+
+    python -m benchmarks.budget_access
+    python -m benchmarks.budget_access --postgres-url postgresql+asyncpg://user:pw@localhost/scratch
+
+SQLite always runs, in a temporary file. Postgres runs when a URL is given. The
+tables are created in a throwaway ``bench_budget_access`` schema, which is
+dropped afterwards. Tables come from the ORM metadata, so UUID columns are
+CHAR(32) rather than the native UUID of the migrations. Both variants run
+against the same schema, so the comparison still holds. The
+``selectinload`` of categories is left out because it is identical for both.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, date, datetime
+from typing import Any
+
+from sqlalchemy import Select, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.models import Base
+from app.models.budget import Budget, BudgetCollaborator
+from app.models.currency import Currency
+from app.models.user import User
+from app.repositories.budget import accessible_budget_ids
+
+SCHEMA = "bench_budget_access"
+INDEX = "ix_budget_collaborators_user_accepted"
+CHUNK = 5000
+
+
+def before_query(user_id: uuid.UUID) -> Select[Any]:
+    """``get_accessible`` before the rewrite."""
+    return (
+        select(Budget)
+        .outerjoin(BudgetCollaborator, BudgetCollaborator.budget_id == Budget.id)
+        .where(
+            or_(
+                Budget.owner_id == user_id,
+                (BudgetCollaborator.user_id == user_id)
+                & BudgetCollaborator.accepted_at.is_not(None),
+            )
+        )
+        .distinct()
+    )
+
+
+def after_query(user_id: uuid.UUID) -> Select[Any]:
+    return select(Budget).where(Budget.id.in_(accessible_budget_ids(user_id)))
+
+
+def build_rows(
+    users: int, budgets: int, collaborators: int, rng: random.Random
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    user_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(users)]
+    user_rows = [
+        {
+            "id": uid,
+            "sub": f"bench|{i}",
+            "email": f"bench{i}@example.com",
+            "display_name": f"Bench {i}",
+            "base_currency": "USD",
+            "auth_provider": "oidc",
+        }
+        for i, uid in enumerate(user_ids)
+    ]
+    budget_rows = [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128)),
+            "owner_id": rng.choice(user_ids),
+            "name": f"Budget {i}",
+            "period_type": "monthly",
+            "start_date": date(2024, 1, 1),
+            "currency": "USD",
+        }
+        for i in range(budgets)
+    ]
+    now = datetime.now(UTC)
+    pairs: set[tuple[uuid.UUID, uuid.UUID]] = set()
+    collab_rows = []
+    while len(collab_rows) < collaborators:
+        budget = rng.choice(budget_rows)
+        user_id = rng.choice(user_ids)
+        if user_id == budget["owner_id"] or (budget["id"], user_id) in pairs:
+            continue
+        pairs.add((budget["id"], user_id))
+        collab_rows.append(
+            {
+                "id": uuid.UUID(int=rng.getrandbits(128)),
+                "budget_id": budget["id"],
+                "user_id": user_id,
+                "role": rng.choice(["viewer", "editor"]),
+                # One invitation in ten is still pending
+                "accepted_at": now if rng.random() < 0.9 else None,
+            }
+        )
+    return user_rows, budget_rows, collab_rows
+
+
+async def seed(engine: AsyncEngine, rows: tuple[list[dict[str, Any]], ...]) -> None:
+    user_rows, budget_rows, collab_rows = rows
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Currency), [{"code": "USD", "name": "US Dollar", "symbol": "$"}])
+        for model, model_rows in ((User, user_rows), (Budget, budget_rows), (BudgetCollaborator, collab_rows)):
+            for start in range(0, len(model_rows), CHUNK):
+                await conn.execute(insert(model), model_rows[start : start + CHUNK])
+
+
+async def explain(engine: AsyncEngine, stmt: Select[Any]) -> str:
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")).all()
+            return "\n".join(row[-1] for row in rows)
+        rows = (await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")).all()
+        return "\n".join(row[0] for row in rows)
+
+
+async def time_queries(
+    engine: AsyncEngine, build: Callable[[uuid.UUID], Select[Any]], user_ids: list[uuid.UUID]
+) -> tuple[list[float], dict[uuid.UUID, set[uuid.UUID]]]:
+    timings = []
+    results = {}
+    async with engine.connect() as conn:
+        for user_id in user_ids:
+            stmt = build(user_id)
+            started = time.perf_counter()
+            rows = (await conn.execute(stmt)).all()
+            timings.append((time.perf_counter() - started) * 1000)
+            results[user_id] = {row.id for row in rows}
+    return timings, results
+
+
+def summarize(timings: list[float]) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"median {statistics.median(ordered):.3f} ms, p95 {p95:.3f} ms, "
+        f"mean {statistics.fmean(ordered):.3f} ms"
+    )
+
+
+async def run(engine: AsyncEngine, rows: tuple[list[dict[str, Any]], ...], samples: int, rng: random.Random) -> None:
+    started = time.perf_counter()
+    await seed(engine, rows)
+    print(f"seeded in {time.perf_counter() - started:.1f}s")
+
+    user_rows, _, collab_rows = rows
+    sample = rng.sample([u["id"] for u in user_rows], min(samples, len(user_rows)))
+    shared = Counter(c["user_id"] for c in collab_rows if c["accepted_at"] is not None)
+    busiest = shared.most_common(1)[0][0]
+
+    variants = (
+        ("before", before_query, f"DROP INDEX {INDEX}"),
+        ("after", after_query, f"CREATE INDEX {INDEX} ON budget_collaborators (user_id, accepted_at)"),
+    )
+    results = {}
+    for name, build, ddl in variants:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql(ddl)
+            await conn.exec_driver_sql("ANALYZE")
+        print(f"\n--- {name}: plan for the user with the most shared budgets ---")
+        print(await explain(engine, build(busiest)))
+        await time_queries(engine, build, sample[:10])  # warm the cache
+        timings, results[name] = await time_queries(engine, build, sample)
+        print(f"{name}: {len(sample)} users, {summarize(timings)}")
+
+    if results["before"] != results["after"]:
+        raise SystemExit("ERROR: the two queries returned different budgets")
+    print("\nBoth queries returned the same budgets for every sampled user")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budgets", type=int, default=10_000)
+    parser.add_argument("--collaborators", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--samples", type=int, default=500, help="Users timed per variant")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--postgres-url", help="Scratch database, e.g. postgresql+asyncpg://...")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = build_rows(args.users, args.budgets, args.collaborators, rng)
+    print(f"{args.budgets} budgets, {args.collaborators} collaborators, {args.users} users")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("\n===== SQLite =====")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        try:
+            await run(engine, rows, args.samples, random.Random(args.seed))
+        finally:
+            await engine.dispose()
+
+    if args.postgres_url:
+        print("\n===== Postgres =====")
+        admin = create_async_engine(args.postgres_url)
+        async with admin.begin() as conn:
+            await conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            await conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+        engine = create_async_engine(
+            args.postgres_url, connect_args={"server_settings": {"search_path": SCHEMA}}
+        )
+        try:
+            await run(engine, rows, args.samples, random.Random(args.seed))
+        finally:
+            await engine.dispose()
+            async with admin.begin() as conn:
+                await conn.exec_driver_sql(f"DROP SCHEMA {SCHEMA} CASCADE")
+            await admin.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,18 +8,17 @@ import sys
 
 
 async def create_local_user(email: str, display_name: str, password: str) -> None:
-    import bcrypt
-
     from app.config import get_settings
     from app.db.session import AsyncSessionLocal
     from app.repositories.user import LocalUserRepository, UserRepository
+    from app.services.passwords import hash_password
 
     settings = get_settings()
     if not settings.local_auth_enabled:
         print("ERROR: LOCAL_AUTH_ENABLED is not set to true", file=sys.stderr)
         sys.exit(1)
 
-    password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    password_hash = await hash_password(password)
 
     async with AsyncSessionLocal() as session:
         user_repo = UserRepository(session)
@@ -64,18 +63,17 @@ async def create_local_user(email: str, display_name: str, password: str) -> Non
 
 
 async def reset_local_password(email: str, new_password: str) -> None:
-    import bcrypt
-
     from app.config import get_settings
     from app.db.session import AsyncSessionLocal
     from app.repositories.user import LocalUserRepository
+    from app.services.passwords import hash_password
 
     settings = get_settings()
     if not settings.local_auth_enabled:
         print("ERROR: LOCAL_AUTH_ENABLED is not set to true", file=sys.stderr)
         sys.exit(1)
 
-    password_hash = bcrypt.hashpw(new_password.encode(), bcrypt.gensalt()).decode()
+    password_hash = await hash_password(new_password)
 
     async with AsyncSessionLocal() as session:
         repo = LocalUserRepository(session)
@@ -89,6 +87,199 @@ async def reset_local_password(email: str, new_password: str) -> None:
         print(f"Password reset for: {email}")
 
 
+async def rebuild_balances(check_only: bool) -> None:
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.account import AccountBalanceRepository
+
+    async with AsyncSessionLocal() as session:
+        repo = AccountBalanceRepository(session)
+
+        if not check_only:
+            count = await repo.rebuild()
+            await session.commit()
+            print(f"Account balance ledger rebuilt: {count} accounts")
+
+        drift = await repo.find_drift()
+        if drift:
+            for account_id, stored, actual in drift:
+                print(
+                    f"DRIFT: account {account_id} ledger={stored} actual={actual}",
+                    file=sys.stderr,
+                )
+            print(f"ERROR: {len(drift)} accounts out of sync", file=sys.stderr)
+            sys.exit(1)
+        print("Account balance ledger is consistent with transactions")
+
+
+async def rebuild_rollups(check_only: bool) -> None:
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.rollup import MonthlyRollupRepository
+
+    async with AsyncSessionLocal() as session:
+        repo = MonthlyRollupRepository(session)
+
+        if not check_only:
+            count = await repo.rebuild()
+            await session.commit()
+            print(f"Monthly rollups rebuilt: {count} buckets")
+
+        drift = await repo.find_drift()
+        if drift:
+            for (user_id, year_month, category_id, tx_type), stored, actual in drift:
+                print(
+                    f"DRIFT: user {user_id} {year_month} category {category_id} {tx_type} "
+                    f"stored={stored[0]}/{stored[1]} actual={actual[0]}/{actual[1]}",
+                    file=sys.stderr,
+                )
+            print(f"ERROR: {len(drift)} rollup buckets out of sync", file=sys.stderr)
+            sys.exit(1)
+        print("Monthly rollups are consistent with transactions")
+
+
+async def rebuild_budget_spend(check_only: bool) -> None:
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.budget import BudgetSpendRepository
+
+    async with AsyncSessionLocal() as session:
+        repo = BudgetSpendRepository(session)
+
+        if not check_only:
+            count = await repo.rebuild()
+            await session.commit()
+            print(f"Budget period spend rebuilt: {count} counters")
+
+        drift = await repo.find_drift()
+        if drift:
+            for (budget_id, category_id, period_start), stored, actual in drift:
+                print(
+                    f"DRIFT: budget {budget_id} {period_start} category {category_id} "
+                    f"stored={stored[0]}/{stored[1]} actual={actual[0]}/{actual[1]}",
+                    file=sys.stderr,
+                )
+            print(f"ERROR: {len(drift)} budget spend counters out of sync", file=sys.stderr)
+            sys.exit(1)
+        print("Budget period spend is consistent with transactions")
+
+
+async def backfill_recurring(from_date: str | None, to_date: str | None) -> None:
+    from datetime import date
+
+    from app.config import get_settings
+    from app.db.session import AsyncSessionLocal
+    from app.jobs.recurring_transactions import backfill_range, generate_due
+    from app.repositories.currency import ExchangeRateRepository
+    from app.services.rate_cache import rate_cache
+
+    end = date.fromisoformat(to_date) if to_date else date.today()
+    chunk_size = get_settings().recurring_chunk_size
+
+    async with AsyncSessionLocal() as session:
+        await rate_cache.load(ExchangeRateRepository(session))
+        if from_date:
+            start = date.fromisoformat(from_date)
+            if start > end:
+                print("ERROR: --from must not be after --to", file=sys.stderr)
+                sys.exit(1)
+            created = await backfill_range(session, start, end, chunk_size)
+            print(f"Backfilled {created} recurring transactions between {start} and {end}")
+        else:
+            created = await generate_due(session, end, chunk_size)
+            print(f"Generated {created} due recurring transactions up to {end}")
+
+
+async def backfill_rates(
+    from_date: str,
+    to_date: str | None,
+    bases: list[str] | None,
+    source: str | None,
+    chunk_days: int | None,
+) -> None:
+    from datetime import date
+
+    import httpx
+
+    from app.config import get_settings
+    from app.db.session import AsyncSessionLocal
+    from app.jobs.rate_backfill import backfill_rates as run_backfill
+    from app.jobs.rate_backfill import rate_provider
+
+    settings = get_settings()
+    start = date.fromisoformat(from_date)
+    end = date.fromisoformat(to_date) if to_date else date.today()
+    if start > end:
+        print("ERROR: --from must not be after --to", file=sys.stderr)
+        sys.exit(1)
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        async with AsyncSessionLocal() as session:
+            inserted = await run_backfill(
+                session,
+                rate_provider(client, source),
+                bases or settings.exchange_rate_bases,
+                start,
+                end,
+                chunk_days or settings.rate_backfill_chunk_days,
+            )
+    print(f"Backfilled {inserted} exchange rates between {start} and {end}")
+
+
+async def import_statement(
+    email: str,
+    account_id: str,
+    path: str,
+    fmt: str | None,
+    date_format: str | None,
+    chunk_size: int | None,
+) -> None:
+    import uuid
+
+    from fastapi import HTTPException
+
+    from app.config import get_settings
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.currency import ExchangeRateRepository
+    from app.repositories.user import UserRepository
+    from app.services.rate_cache import rate_cache
+    from app.services.statement_import import StatementImportService, parse_in_threadpool
+    from app.utils.statement_parsers import detect_format, parse_statement
+
+    fmt = fmt or detect_format(path)
+    if fmt is None:
+        print("ERROR: Cannot infer statement format, pass --format", file=sys.stderr)
+        sys.exit(1)
+
+    def report(progress) -> None:
+        print(f"  chunk {progress.chunks}: {progress.imported} imported, {progress.skipped} skipped")
+
+    chunk_size = chunk_size or get_settings().import_chunk_size
+    async with AsyncSessionLocal() as session:
+        user = await UserRepository(session).get_by_email(email)
+        if not user:
+            print(f"ERROR: No user with email '{email}'", file=sys.stderr)
+            sys.exit(1)
+
+        # Backdated rows are converted at historical rates; resolve them in memory
+        await rate_cache.load(ExchangeRateRepository(session))
+        service = StatementImportService(session)
+        with open(path, encoding="utf-8-sig", errors="replace", newline="") as fh:
+            try:
+                result = await service.import_statement(
+                    user.id,
+                    uuid.UUID(account_id),
+                    parse_in_threadpool(parse_statement(fmt, fh, date_format), chunk_size),
+                    user.base_currency,
+                    chunk_size,
+                    on_progress=report,
+                )
+            except HTTPException as exc:
+                print(f"ERROR: {exc.detail['detail']}", file=sys.stderr)
+                sys.exit(1)
+
+    for error in result.errors:
+        print(f"SKIPPED line {error.line}: {error.detail}", file=sys.stderr)
+    print(f"Imported {result.imported} transactions ({result.skipped} skipped)")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Budget Tracker management CLI")
     subparsers = parser.add_subparsers(dest="command")
@@ -108,6 +299,71 @@ def main() -> None:
         "--password", help="New password (will prompt if not provided)"
     )
 
+    # rebuild-balances
+    balances_parser = subparsers.add_parser(
+        "rebuild-balances", help="Rebuild the account balance ledger from transactions"
+    )
+    balances_parser.add_argument(
+        "--check", action="store_true", help="Only verify the ledger, do not rewrite it"
+    )
+
+    # rebuild-rollups
+    rollups_parser = subparsers.add_parser(
+        "rebuild-rollups", help="Rebuild the monthly report rollups from transactions"
+    )
+    rollups_parser.add_argument(
+        "--check", action="store_true", help="Only verify the rollups, do not rewrite them"
+    )
+
+    # rebuild-budget-spend
+    budget_spend_parser = subparsers.add_parser(
+        "rebuild-budget-spend", help="Rebuild the per-period budget spend counters from transactions"
+    )
+    budget_spend_parser.add_argument(
+        "--check", action="store_true", help="Only verify the counters, do not rewrite them"
+    )
+
+    # backfill-recurring
+    backfill_parser = subparsers.add_parser(
+        "backfill-recurring",
+        help="Generate recurring transactions for missed or historical occurrences",
+    )
+    backfill_parser.add_argument(
+        "--from",
+        dest="from_date",
+        help="Start date (YYYY-MM-DD); expands rules from their start_date. "
+        "Omit to generate everything due since each rule's next_occurrence",
+    )
+    backfill_parser.add_argument(
+        "--to", dest="to_date", help="End date (YYYY-MM-DD, default: today)"
+    )
+
+    # backfill-rates
+    rates_parser = subparsers.add_parser(
+        "backfill-rates",
+        help="Fetch historical exchange rates; resumable, skips dates already stored",
+    )
+    rates_parser.add_argument("--from", dest="from_date", required=True, help="Start date (YYYY-MM-DD)")
+    rates_parser.add_argument("--to", dest="to_date", help="End date (YYYY-MM-DD, default: today)")
+    rates_parser.add_argument(
+        "--base", action="append", dest="bases", help="Base currency (repeatable, default: all configured)"
+    )
+    rates_parser.add_argument("--source", help="JSON file to read rates from instead of the API")
+    rates_parser.add_argument("--chunk-days", type=int, help="Days fetched and committed per request")
+
+    # import-statement
+    import_parser = subparsers.add_parser(
+        "import-statement", help="Import a CSV/OFX/QIF bank statement into an account"
+    )
+    import_parser.add_argument("--email", required=True, help="Owner's email")
+    import_parser.add_argument("--account-id", required=True, help="Target account id")
+    import_parser.add_argument("--file", required=True, dest="path", help="Statement file")
+    import_parser.add_argument(
+        "--format", choices=["csv", "ofx", "qif"], help="Statement format (default: from extension)"
+    )
+    import_parser.add_argument("--date-format", help="strptime format for dates, e.g. %%d/%%m/%%Y")
+    import_parser.add_argument("--chunk-size", type=int, help="Rows inserted per commit")
+
     args = parser.parse_args()
 
     if args.command == "create-local-user":
@@ -118,6 +374,37 @@ def main() -> None:
         password = args.password or getpass.getpass("New password: ")
         asyncio.run(reset_local_password(args.email, password))
 
+    elif args.command == "rebuild-balances":
+        asyncio.run(rebuild_balances(args.check))
+
+    elif args.command == "rebuild-rollups":
+        asyncio.run(rebuild_rollups(args.check))
+
+    elif args.command == "rebuild-budget-spend":
+        asyncio.run(rebuild_budget_spend(args.check))
+
+    elif args.command == "backfill-recurring":
+        asyncio.run(backfill_recurring(args.from_date, args.to_date))
+
+    elif args.command == "backfill-rates":
+        asyncio.run(
+            backfill_rates(
+                args.from_date, args.to_date, args.bases, args.source, args.chunk_days
+            )
+        )
+
+    elif args.command == "import-statement":
+        asyncio.run(
+            import_statement(
+                args.email,
+                args.account_id,
+                args.path,
+                args.format,
+                args.date_format,
+                args.chunk_size,
+            )
+        )
+
     else:
         parser.print_help()
         sys.exit(1)
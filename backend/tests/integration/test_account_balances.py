@@ -0,0 +1,126 @@
+"""Integration tests for the materialized account balance ledger."""
+
+from datetime import date
+
+import pytest
+
+from app.repositories.account import AccountBalanceRepository
+
+
+async def _create_account(client, auth_headers, name, initial_balance="0"):
+    resp = await client.post(
+        "/api/v1/accounts",
+        json={"name": name, "type": "checking", "currency": "USD", "initial_balance": initial_balance},
+        headers=auth_headers,
+    )
+    return resp.json()["id"]
+
+
+async def _create_tx(client, auth_headers, **payload):
+    payload.setdefault("currency", "USD")
+    payload.setdefault("date", str(date.today()))
+    resp = await client.post("/api/v1/transactions", json=payload, headers=auth_headers)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+async def _balance(client, auth_headers, acc_id):
+    resp = await client.get(f"/api/v1/accounts/{acc_id}", headers=auth_headers)
+    return float(resp.json()["balance"])
+
+
+@pytest.mark.asyncio
+async def test_ledger_tracks_create_update_delete(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Ledger Acc", "100.00")
+
+    await _create_tx(client, auth_headers, account_id=acc_id, type="income", amount="50.00")
+    expense_id = await _create_tx(client, auth_headers, account_id=acc_id, type="expense", amount="30.00")
+    assert await _balance(client, auth_headers, acc_id) == pytest.approx(120.0)
+
+    await client.patch(
+        f"/api/v1/transactions/{expense_id}", json={"amount": "10.00"}, headers=auth_headers
+    )
+    assert await _balance(client, auth_headers, acc_id) == pytest.approx(140.0)
+
+    await client.delete(f"/api/v1/transactions/{expense_id}", headers=auth_headers)
+    assert await _balance(client, auth_headers, acc_id) == pytest.approx(150.0)
+
+
+@pytest.mark.asyncio
+async def test_ledger_tracks_transfers(client, auth_headers):
+    src = await _create_account(client, auth_headers, "Ledger Src", "500.00")
+    dest = await _create_account(client, auth_headers, "Ledger Dest")
+
+    await _create_tx(
+        client, auth_headers, account_id=src, type="transfer", amount="200.00",
+        transfer_to_account_id=dest,
+    )
+
+    assert await _balance(client, auth_headers, src) == pytest.approx(300.0)
+    assert await _balance(client, auth_headers, dest) == pytest.approx(200.0)
+
+
+@pytest.mark.asyncio
+async def test_ledger_rebuild_matches_raw_transactions(client, auth_headers, db_session):
+    acc_id = await _create_account(client, auth_headers, "Rebuild Acc")
+    await _create_tx(client, auth_headers, account_id=acc_id, type="income", amount="42.00")
+
+    repo = AccountBalanceRepository(db_session)
+    assert await repo.find_drift() == []
+
+    await repo.rebuild()
+    assert await repo.find_drift() == []
+    totals = await repo.get_totals()
+    assert float(next(v for k, v in totals.items() if str(k) == acc_id)) == pytest.approx(42.0)
+
+
+@pytest.mark.asyncio
+async def test_list_accounts_query_count_is_constant(client, auth_headers, test_engine):
+    """Listing accounts must not issue per-account queries (no N+1)."""
+    from sqlalchemy import event
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def _queries_for_list():
+        statements.clear()
+        event.listen(test_engine.sync_engine, "before_cursor_execute", _count)
+        try:
+            resp = await client.get("/api/v1/accounts", headers=auth_headers)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", _count)
+        assert resp.status_code == 200
+        return len(resp.json()), len(statements)
+
+    acc_id = await _create_account(client, auth_headers, "Count Acc 0")
+    await _create_tx(client, auth_headers, account_id=acc_id, type="income", amount="1.00")
+    accounts_before, queries_before = await _queries_for_list()
+
+    for i in range(1, 6):
+        acc_id = await _create_account(client, auth_headers, f"Count Acc {i}")
+        await _create_tx(client, auth_headers, account_id=acc_id, type="expense", amount="1.00")
+    accounts_after, queries_after = await _queries_for_list()
+
+    assert accounts_after == accounts_before + 5
+    assert queries_after == queries_before
+
+
+@pytest.mark.asyncio
+async def test_transaction_totals_matches_ledger(client, auth_headers, db_session):
+    from app.repositories.account import AccountRepository
+    from tests.conftest import MOCK_USER_ID
+
+    src = await _create_account(client, auth_headers, "Totals Src")
+    dest = await _create_account(client, auth_headers, "Totals Dest")
+    await _create_tx(client, auth_headers, account_id=src, type="income", amount="80.00")
+    await _create_tx(
+        client, auth_headers, account_id=src, type="transfer", amount="30.00",
+        transfer_to_account_id=dest,
+    )
+
+    totals = await AccountRepository(db_session).transaction_totals(MOCK_USER_ID)
+    by_id = {str(k): float(v) for k, v in totals.items()}
+    assert by_id[src] == pytest.approx(50.0)
+    assert by_id[dest] == pytest.approx(30.0)
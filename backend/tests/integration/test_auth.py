@@ -1,6 +1,15 @@
 """Integration tests for auth endpoints."""
 
+import asyncio
+import threading
+
+import bcrypt
 import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.user import LocalUser, User
+from app.repositories.user import LocalUserRepository, UserRepository
 
 
 @pytest.mark.asyncio
@@ -21,3 +30,63 @@ async def test_get_me(client, auth_headers):
     data = response.json()
     assert data["email"] == "test@example.com"
     assert "id" in data
+
+
+@pytest_asyncio.fixture
+async def local_login(test_engine, monkeypatch):
+    """A local user with a cheap (cost 4) bcrypt hash."""
+    monkeypatch.setattr("app.routers.auth.settings.local_auth_enabled", True)
+    factory = async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)
+    email = "burst@example.com"
+    password_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=4)).decode()
+    async with factory() as session:
+        user = await UserRepository(session).create(
+            sub=f"local:{email}",
+            email=email,
+            display_name="Burst",
+            base_currency="USD",
+            auth_provider="local",
+        )
+        local_user = await LocalUserRepository(session).create(
+            user_id=user.id, email=email, password_hash=password_hash
+        )
+        await session.commit()
+    yield {"email": email, "password": "password123"}, password_hash
+    async with factory() as session:
+        await session.delete(await session.get(LocalUser, local_user.id))
+        await session.delete(await session.get(User, user.id))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_local_token_issued_for_valid_password(client, local_login):
+    payload, _ = local_login
+    response = await client.post("/api/v1/auth/local/token", json=payload)
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+
+    payload = {**payload, "password": "wrong"}
+    response = await client.post("/api/v1/auth/local/token", json=payload)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_login_burst_checks_passwords_off_the_event_loop(client, local_login, monkeypatch):
+    payload, _ = local_login
+    checkpw = bcrypt.checkpw
+    threads = []
+
+    def recording_checkpw(password: bytes, hashed: bytes) -> bool:
+        threads.append(threading.current_thread())
+        return checkpw(password, hashed)
+
+    monkeypatch.setattr(bcrypt, "checkpw", recording_checkpw)
+    responses = await asyncio.gather(
+        *(client.post("/api/v1/auth/local/token", json=payload) for _ in range(6))
+    )
+
+    assert [r.status_code for r in responses] == [200] * 6
+    assert len(threads) == 6
+    # Every check ran on a password pool thread, never on the loop's own thread
+    loop_thread = threading.current_thread()
+    assert all(t is not loop_thread and t.name.startswith("password") for t in threads)
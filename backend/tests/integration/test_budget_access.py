@@ -0,0 +1,162 @@
+"""Integration tests for the cached budget access map."""
+
+import uuid
+from datetime import UTC, date, datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.budget import Budget, BudgetCollaborator
+from app.models.user import User
+from app.repositories.budget import BudgetRepository
+from app.repositories.user import UserRepository
+from app.services.budget_access import budget_access_cache
+
+COLLAB_EMAIL = "access-collab@example.com"
+
+
+@pytest_asyncio.fixture
+async def factory(test_engine):
+    return async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def collaborator(factory):
+    async with factory() as session:
+        user = await UserRepository(session).create(
+            sub="access-collab",
+            email=COLLAB_EMAIL,
+            display_name="Collaborator",
+            base_currency="USD",
+            auth_provider="oidc",
+        )
+        await session.commit()
+    yield user
+    async with factory() as session:
+        await session.delete(await session.get(User, user.id))
+        await session.commit()
+
+
+async def _create_budget(client, auth_headers, name):
+    resp = await client.post(
+        "/api/v1/budgets",
+        json={"name": name, "period_type": "monthly", "start_date": "2024-01-01", "currency": "USD"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 201
+    return uuid.UUID(resp.json()["id"])
+
+
+async def _access(factory, user_id):
+    async with factory() as session:
+        return await budget_access_cache.get_or_load(user_id, BudgetRepository(session))
+
+
+@pytest.mark.asyncio
+async def test_repeat_checks_do_not_query_budgets(client, auth_headers, test_engine):
+    budget_id = await _create_budget(client, auth_headers, "Access Query Budget")
+    await client.get(f"/api/v1/budgets/{budget_id}/collaborators", headers=auth_headers)
+
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        resp = await client.get(f"/api/v1/budgets/{budget_id}/collaborators", headers=auth_headers)
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", _record)
+
+    assert resp.status_code == 200
+    assert not [s for s in statements if "FROM budgets" in s]
+
+
+@pytest.mark.asyncio
+async def test_collaborator_changes_invalidate_access_map(
+    client, auth_headers, factory, collaborator
+):
+    budget_id = await _create_budget(client, auth_headers, "Access Shared Budget")
+    assert budget_id not in await _access(factory, collaborator.id)
+
+    base = f"/api/v1/budgets/{budget_id}/collaborators"
+    resp = await client.post(base, json={"email": COLLAB_EMAIL, "role": "viewer"}, headers=auth_headers)
+    assert resp.status_code == 201
+    assert (await _access(factory, collaborator.id))[budget_id] == "viewer"
+
+    resp = await client.patch(f"{base}/{collaborator.id}", json={"role": "editor"}, headers=auth_headers)
+    assert resp.status_code == 200
+    assert (await _access(factory, collaborator.id))[budget_id] == "editor"
+
+    resp = await client.delete(f"{base}/{collaborator.id}", headers=auth_headers)
+    assert resp.status_code == 204
+    assert budget_id not in await _access(factory, collaborator.id)
+
+
+@pytest.mark.asyncio
+async def test_deleted_budget_is_dropped_from_maps(client, auth_headers, factory, collaborator, mock_user):
+    budget_id = await _create_budget(client, auth_headers, "Access Deleted Budget")
+    await client.post(
+        f"/api/v1/budgets/{budget_id}/collaborators",
+        json={"email": COLLAB_EMAIL, "role": "viewer"},
+        headers=auth_headers,
+    )
+    assert budget_id in await _access(factory, collaborator.id)
+    assert (await _access(factory, mock_user.id))[budget_id] == "owner"
+
+    resp = await client.delete(f"/api/v1/budgets/{budget_id}", headers=auth_headers)
+    assert resp.status_code == 204
+    assert budget_id not in await _access(factory, collaborator.id)
+    assert budget_id not in await _access(factory, mock_user.id)
+
+    resp = await client.get(f"/api/v1/budgets/{budget_id}", headers=auth_headers)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_listing_includes_accepted_shares_once(
+    client, auth_headers, factory, collaborator, mock_user
+):
+    owned_id = await _create_budget(client, auth_headers, "Access Listed Owned")
+    async with factory() as session:
+        shared, pending = (
+            Budget(
+                owner_id=collaborator.id,
+                name=name,
+                period_type="monthly",
+                start_date=date(2024, 1, 1),
+                currency="USD",
+            )
+            for name in ("Access Listed Shared", "Access Listed Pending")
+        )
+        session.add_all([shared, pending])
+        await session.flush()
+        accepted_at = datetime.now(UTC)
+        session.add_all(
+            [
+                BudgetCollaborator(
+                    budget_id=shared.id, user_id=mock_user.id, role="viewer", accepted_at=accepted_at
+                ),
+                BudgetCollaborator(budget_id=pending.id, user_id=mock_user.id, role="viewer"),
+            ]
+        )
+        await session.commit()
+
+    resp = await client.get("/api/v1/budgets", headers=auth_headers)
+    ids = [uuid.UUID(b["id"]) for b in resp.json()]
+    assert ids.count(owned_id) == 1
+    assert ids.count(shared.id) == 1
+    assert pending.id not in ids
+    access = await _access(factory, mock_user.id)
+    assert access[shared.id] == "viewer"
+    assert pending.id not in access
+
+    async with factory() as session:
+        for budget in (shared, pending):
+            await session.execute(
+                delete(BudgetCollaborator).where(BudgetCollaborator.budget_id == budget.id)
+            )
+            await session.delete(await session.get(Budget, budget.id))
+        await session.commit()
@@ -0,0 +1,147 @@
+"""Integration tests for budget threshold alerts on transaction writes."""
+
+import uuid
+from datetime import date
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.jobs.budget_alerts import deliver_pending
+from app.models.budget import BudgetAlert
+
+TODAY = date.today().isoformat()
+
+
+@pytest_asyncio.fixture
+async def factory(test_engine):
+    return async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _setup(client, auth_headers, name, limit="100.00"):
+    account = await client.post(
+        "/api/v1/accounts",
+        json={"name": f"{name} Acc", "type": "checking", "currency": "USD"},
+        headers=auth_headers,
+    )
+    category = await client.post(
+        "/api/v1/categories",
+        json={"name": f"{name} Cat", "transaction_type": "expense"},
+        headers=auth_headers,
+    )
+    cat_id = category.json()["id"]
+    budget = await client.post(
+        "/api/v1/budgets",
+        json={
+            "name": name,
+            "period_type": "monthly",
+            "start_date": "2020-01-01",
+            "currency": "USD",
+            "budget_categories": [{"category_id": cat_id, "limit_amount": limit}],
+        },
+        headers=auth_headers,
+    )
+    return account.json()["id"], cat_id, budget.json()["id"]
+
+
+async def _spend(client, auth_headers, acc_id, cat_id, budget_id, amount, day=TODAY):
+    resp = await client.post(
+        "/api/v1/transactions",
+        json={
+            "account_id": acc_id,
+            "category_id": cat_id,
+            "budget_id": budget_id,
+            "type": "expense",
+            "amount": amount,
+            "currency": "USD",
+            "date": day,
+        },
+        headers=auth_headers,
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+async def _alerts(factory, budget_id):
+    async with factory() as session:
+        result = await session.execute(
+            select(BudgetAlert)
+            .where(BudgetAlert.budget_id == uuid.UUID(budget_id))
+            .order_by(BudgetAlert.threshold)
+        )
+        return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_crossing_thresholds_writes_one_alert_each(client, auth_headers, factory):
+    acc_id, cat_id, budget_id = await _setup(client, auth_headers, "Alert Cross")
+
+    await _spend(client, auth_headers, acc_id, cat_id, budget_id, "70.00")
+    assert await _alerts(factory, budget_id) == []
+
+    tx_id = await _spend(client, auth_headers, acc_id, cat_id, budget_id, "15.00")
+    alerts = await _alerts(factory, budget_id)
+    assert [(a.threshold, float(a.spent_amount)) for a in alerts] == [(80, 85.0)]
+
+    # Dropping below and crossing again in the same period does not repeat the alert
+    await client.delete(f"/api/v1/transactions/{tx_id}", headers=auth_headers)
+    await _spend(client, auth_headers, acc_id, cat_id, budget_id, "40.00")
+    alerts = await _alerts(factory, budget_id)
+    assert [(a.threshold, float(a.spent_amount)) for a in alerts] == [(80, 85.0), (100, 110.0)]
+    assert float(alerts[1].limit_amount) == 100.0
+    assert alerts[1].period_start == date.today().replace(day=1)
+
+
+@pytest.mark.asyncio
+async def test_update_into_budget_checks_thresholds(client, auth_headers, factory):
+    acc_id, cat_id, budget_id = await _setup(client, auth_headers, "Alert Update")
+    tx_id = await _spend(client, auth_headers, acc_id, cat_id, None, "120.00")
+    assert await _alerts(factory, budget_id) == []
+
+    resp = await client.patch(
+        f"/api/v1/transactions/{tx_id}", json={"budget_id": budget_id}, headers=auth_headers
+    )
+    assert resp.status_code == 200
+    assert [a.threshold for a in await _alerts(factory, budget_id)] == [80, 100]
+
+
+@pytest.mark.asyncio
+async def test_check_cost_does_not_grow_with_history(client, auth_headers, test_engine):
+    acc_id, cat_id, budget_id = await _setup(client, auth_headers, "Alert Cost", limit="100000")
+
+    async def statements_for_write():
+        statements = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", _record)
+        try:
+            await _spend(client, auth_headers, acc_id, cat_id, budget_id, "1.00")
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", _record)
+        return statements
+
+    first = await statements_for_write()
+    for _ in range(20):
+        await _spend(client, auth_headers, acc_id, cat_id, budget_id, "1.00")
+    later = await statements_for_write()
+
+    assert len(later) == len(first)
+    assert not [s for s in later if "FROM transactions" in s and "sum(" in s.lower()]
+
+
+@pytest.mark.asyncio
+async def test_delivery_marks_alerts_sent_once(client, auth_headers, factory):
+    acc_id, cat_id, budget_id = await _setup(client, auth_headers, "Alert Deliver")
+    await _spend(client, auth_headers, acc_id, cat_id, budget_id, "100.00")
+
+    async with factory() as session:
+        assert await deliver_pending(session, batch_size=1) >= 2
+    alerts = await _alerts(factory, budget_id)
+    assert [a.threshold for a in alerts] == [80, 100]
+    assert all(a.delivered_at is not None for a in alerts)
+
+    async with factory() as session:
+        assert await deliver_pending(session, batch_size=10) == 0
@@ -0,0 +1,187 @@
+"""Integration tests for the per-period budget spend counters."""
+
+import uuid
+from datetime import date, timedelta
+
+import pytest
+
+from app.repositories.budget import BudgetSpendRepository
+
+
+async def _setup(client, auth_headers, name):
+    account = await client.post(
+        "/api/v1/accounts",
+        json={"name": f"{name} Acc", "type": "checking", "currency": "USD"},
+        headers=auth_headers,
+    )
+    category = await client.post(
+        "/api/v1/categories",
+        json={"name": f"{name} Cat", "transaction_type": "expense"},
+        headers=auth_headers,
+    )
+    return account.json()["id"], uuid.UUID(category.json()["id"])
+
+
+async def _create_budget(client, auth_headers, name, cat_id, **fields):
+    payload = {
+        "name": name,
+        "period_type": "monthly",
+        "start_date": "2020-01-01",
+        "currency": "USD",
+        "budget_categories": [{"category_id": str(cat_id), "limit_amount": "100.00"}],
+        **fields,
+    }
+    resp = await client.post("/api/v1/budgets", json=payload, headers=auth_headers)
+    assert resp.status_code == 201
+    return uuid.UUID(resp.json()["id"])
+
+
+async def _create_tx(client, auth_headers, **payload):
+    payload = {k: str(v) if isinstance(v, uuid.UUID) else v for k, v in payload.items()}
+    payload.setdefault("currency", "USD")
+    payload.setdefault("type", "expense")
+    resp = await client.post("/api/v1/transactions", json=payload, headers=auth_headers)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_transaction_writes(client, auth_headers, db_session):
+    acc_id, cat_id = await _setup(client, auth_headers, "Spend Writes")
+    first = await _create_budget(client, auth_headers, "Spend Writes A", cat_id)
+    second = await _create_budget(client, auth_headers, "Spend Writes B", cat_id)
+    tx_id = await _create_tx(
+        client, auth_headers, account_id=acc_id, category_id=cat_id, budget_id=first,
+        amount="20.00", date="2021-03-10",
+    )
+    # Income never counts against a budget
+    await _create_tx(
+        client, auth_headers, account_id=acc_id, budget_id=first, type="income",
+        amount="99.00", date="2021-03-11",
+    )
+
+    repo = BudgetSpendRepository(db_session)
+    assert await repo.find_drift() == []
+    assert list(await repo.get_totals([first])) == [(first, cat_id, date(2021, 3, 1))]
+
+    # Moving the expense to another month and budget re-buckets it
+    resp = await client.patch(
+        f"/api/v1/transactions/{tx_id}",
+        json={"date": "2021-04-02", "budget_id": str(second), "amount": "25.00"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    assert await repo.find_drift() == []
+    assert await repo.get_totals([first]) == {}
+    assert await repo.get_totals([second]) == {(second, cat_id, date(2021, 4, 1)): (25, 1)}
+
+    await client.delete(f"/api/v1/transactions/{tx_id}", headers=auth_headers)
+    assert await repo.find_drift() == []
+    assert await repo.get_totals([first, second]) == {}
+
+
+@pytest.mark.asyncio
+async def test_summary_covers_current_period_and_history_all(client, auth_headers):
+    acc_id, cat_id = await _setup(client, auth_headers, "Spend Periods")
+    budget_id = await _create_budget(client, auth_headers, "Spend Periods", cat_id)
+    today = date.today()
+    last_month = today.replace(day=1) - timedelta(days=1)
+    await _create_tx(
+        client, auth_headers, account_id=acc_id, category_id=cat_id, budget_id=budget_id,
+        amount="40.00", date=last_month.isoformat(),
+    )
+    await _create_tx(
+        client, auth_headers, account_id=acc_id, category_id=cat_id, budget_id=budget_id,
+        amount="15.00", date=today.isoformat(),
+    )
+    await _create_tx(
+        client, auth_headers, account_id=acc_id, budget_id=budget_id,
+        amount="5.00", date=today.isoformat(),
+    )
+
+    summary = (await client.get(f"/api/v1/budgets/{budget_id}/summary", headers=auth_headers)).json()
+    assert summary["period_start"] == today.replace(day=1).isoformat()
+    assert float(summary["total_spent"]) == 15.0  # last month and uncategorized excluded
+    assert float(summary["total_remaining"]) == 85.0
+
+    resp = await client.get(f"/api/v1/budgets/{budget_id}/history", headers=auth_headers)
+    assert resp.status_code == 200
+    history = resp.json()
+    assert [p["period_start"] for p in history] == [
+        last_month.replace(day=1).isoformat(),
+        today.replace(day=1).isoformat(),
+    ]
+    assert history[0]["period_end"] == last_month.isoformat()
+    assert float(history[0]["total_spent"]) == 40.0
+    assert float(history[1]["total_spent"]) == 20.0
+    assert {c["category_id"] for c in history[1]["categories"]} == {str(cat_id), None}
+
+
+@pytest.mark.asyncio
+async def test_period_change_rebuilds_counters(client, auth_headers, db_session):
+    acc_id, cat_id = await _setup(client, auth_headers, "Spend Rebuild")
+    budget_id = await _create_budget(client, auth_headers, "Spend Rebuild", cat_id)
+    for day in ("2022-02-07", "2022-02-20", "2022-03-01"):
+        await _create_tx(
+            client, auth_headers, account_id=acc_id, category_id=cat_id, budget_id=budget_id,
+            amount="10.00", date=day,
+        )
+
+    resp = await client.patch(
+        f"/api/v1/budgets/{budget_id}",
+        json={"period_type": "custom", "start_date": "2022-02-10", "end_date": "2022-02-28"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    history = (await client.get(f"/api/v1/budgets/{budget_id}/history", headers=auth_headers)).json()
+    assert len(history) == 1
+    assert history[0]["period_start"] == "2022-02-10"
+    assert history[0]["period_end"] == "2022-02-28"
+    assert float(history[0]["total_spent"]) == 10.0
+
+    repo = BudgetSpendRepository(db_session)
+    assert await repo.find_drift() == []
+    await client.delete(f"/api/v1/budgets/{budget_id}", headers=auth_headers)
+    assert await repo.get_totals([budget_id]) == {}
+
+
+
+@pytest.mark.asyncio
+async def test_periods_are_clipped_to_budget_dates(client, auth_headers, db_session):
+    acc_id, cat_id = await _setup(client, auth_headers, "Spend Clipped")
+    budget_id = await _create_budget(
+        client, auth_headers, "Spend Clipped", cat_id,
+        start_date="2023-05-15", end_date="2023-06-20",
+    )
+    for day, amount in (("2023-05-01", "7.00"), ("2023-05-20", "20.00"), ("2023-06-25", "9.00")):
+        await _create_tx(
+            client, auth_headers, account_id=acc_id, category_id=cat_id, budget_id=budget_id,
+            amount=amount, date=day,
+        )
+
+    history = (await client.get(f"/api/v1/budgets/{budget_id}/history", headers=auth_headers)).json()
+    # Only the expense inside [start_date, end_date] counts, in a period from the start date
+    assert [(p["period_start"], p["period_end"]) for p in history] == [("2023-05-15", "2023-05-31")]
+    assert float(history[0]["total_spent"]) == 20.0
+    assert await BudgetSpendRepository(db_session).find_drift() == []
+
+
+@pytest.mark.asyncio
+async def test_ended_budget_has_no_current_period(client, auth_headers):
+    acc_id, cat_id = await _setup(client, auth_headers, "Spend Ended")
+    yesterday = date.today() - timedelta(days=1)
+    budget_id = await _create_budget(
+        client, auth_headers, "Spend Ended", cat_id,
+        start_date=(yesterday - timedelta(days=40)).isoformat(), end_date=yesterday.isoformat(),
+    )
+    await _create_tx(
+        client, auth_headers, account_id=acc_id, category_id=cat_id, budget_id=budget_id,
+        amount="30.00", date=yesterday.isoformat(),
+    )
+
+    summary = (await client.get(f"/api/v1/budgets/{budget_id}/summary", headers=auth_headers)).json()
+    assert (summary["period_start"], summary["period_end"]) == (None, None)
+    assert float(summary["total_spent"]) == 0.0
+    summaries = (await client.get("/api/v1/budgets/summaries", headers=auth_headers)).json()
+    ended = next(s for s in summaries if s["budget_id"] == str(budget_id))
+    assert ended["period_start"] is None
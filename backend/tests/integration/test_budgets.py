@@ -1,8 +1,10 @@
 """Integration tests for budgets endpoints."""
 
 import uuid
+from datetime import date
 
 import pytest
+from sqlalchemy import event
 
 
 @pytest.mark.asyncio
@@ -166,3 +168,75 @@ async def test_create_budget_with_categories(client, auth_headers):
     data = response.json()
     assert len(data["budget_categories"]) == 1
     assert data["budget_categories"][0]["category_id"] == cat_id
+
+
+async def _create_spent_budget(client, auth_headers, name, account_id, cat_id, spent):
+    resp = await client.post(
+        "/api/v1/budgets",
+        json={
+            "name": name,
+            "period_type": "monthly",
+            "start_date": "2024-01-01",
+            "currency": "USD",
+            "budget_categories": [{"category_id": cat_id, "limit_amount": "100.00"}],
+        },
+        headers=auth_headers,
+    )
+    budget_id = resp.json()["id"]
+    resp = await client.post(
+        "/api/v1/transactions",
+        json={
+            "account_id": account_id,
+            "category_id": cat_id,
+            "budget_id": budget_id,
+            "type": "expense",
+            "amount": spent,
+            "currency": "USD",
+            "date": date.today().isoformat(),  # summaries cover the current period
+        },
+        headers=auth_headers,
+    )
+    assert resp.status_code == 201
+    return budget_id
+
+
+@pytest.mark.asyncio
+async def test_budget_summaries_batch(client, auth_headers, test_engine):
+    account = await client.post(
+        "/api/v1/accounts",
+        json={"name": "Summaries Acc", "type": "checking", "currency": "USD"},
+        headers=auth_headers,
+    )
+    account_id = account.json()["id"]
+    cat = await client.post(
+        "/api/v1/categories",
+        json={"name": "Summaries Cat", "transaction_type": "expense"},
+        headers=auth_headers,
+    )
+    cat_id = cat.json()["id"]
+
+    async def summaries():
+        statements = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", _record)
+        try:
+            resp = await client.get("/api/v1/budgets/summaries", headers=auth_headers)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", _record)
+        assert resp.status_code == 200
+        return {s["budget_id"]: s for s in resp.json()}, len(statements)
+
+    first_id = await _create_spent_budget(client, auth_headers, "Batch 1", account_id, cat_id, "30.00")
+    _, queries_before = await summaries()
+    for i in range(3):
+        await _create_spent_budget(client, auth_headers, f"Batch {i + 2}", account_id, cat_id, "10.00")
+    by_id, queries_after = await summaries()
+
+    assert queries_after == queries_before
+    single = await client.get(f"/api/v1/budgets/{first_id}/summary", headers=auth_headers)
+    assert by_id[first_id] == single.json()
+    assert float(by_id[first_id]["total_spent"]) == 30.0
+    assert float(by_id[first_id]["total_remaining"]) == 70.0
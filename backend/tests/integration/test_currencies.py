@@ -44,3 +44,84 @@ async def test_get_historical_rates(client, auth_headers):
     data = response.json()
     assert "base" in data
     assert "rates" in data
+
+
+@pytest.mark.asyncio
+async def test_get_latest_many_picks_most_recent_rate_per_pair(db_session):
+    from datetime import date
+    from decimal import Decimal
+
+    from app.models.currency import ExchangeRate
+    from app.repositories.currency import ExchangeRateRepository
+
+    for base, target, rate, day in [
+        ("AAA", "BBB", "1.5", date(2020, 1, 1)),
+        ("AAA", "BBB", "1.6", date(2020, 1, 2)),
+        ("AAA", "CCC", "2.0", date(2020, 1, 1)),
+        ("CCC", "BBB", "9.9", date(2020, 1, 3)),
+    ]:
+        db_session.add(
+            ExchangeRate(base_currency=base, target_currency=target, rate=Decimal(rate), date=day)
+        )
+    await db_session.flush()
+
+    rates = await ExchangeRateRepository(db_session).get_latest_many(
+        [("AAA", "BBB"), ("AAA", "CCC"), ("AAA", "DDD")]
+    )
+    assert rates == {("AAA", "BBB"): Decimal("1.6"), ("AAA", "CCC"): Decimal("2.0")}
+
+
+@pytest.mark.asyncio
+async def test_get_as_of_returns_rate_in_force(db_session):
+    from datetime import date
+    from decimal import Decimal
+
+    from app.models.currency import ExchangeRate
+    from app.repositories.currency import ExchangeRateRepository
+
+    for rate, day in [("1.5", date(2020, 1, 3)), ("1.6", date(2020, 1, 6))]:
+        db_session.add(
+            ExchangeRate(base_currency="QQA", target_currency="QQB", rate=Decimal(rate), date=day)
+        )
+    await db_session.flush()
+    repo = ExchangeRateRepository(db_session)
+
+    assert (await repo.get_as_of("QQA", "QQB", date(2020, 1, 5))).rate == Decimal("1.5")
+    assert (await repo.get_as_of("QQA", "QQB", date(2020, 1, 6))).rate == Decimal("1.6")
+    # Before the first stored rate: the earliest one
+    assert (await repo.get_as_of("QQA", "QQB", date(2019, 6, 1))).rate == Decimal("1.5")
+    assert await repo.get_as_of("QQA", "QQC", date(2020, 1, 5)) is None
+
+
+@pytest.mark.asyncio
+async def test_get_history_includes_rate_in_force_at_start(db_session):
+    from datetime import date
+    from decimal import Decimal
+
+    from app.models.currency import ExchangeRate
+    from app.repositories.currency import ExchangeRateRepository
+
+    for base, target, rate, day in [
+        ("QRA", "QRB", "1.1", date(2020, 1, 1)),
+        ("QRA", "QRB", "1.2", date(2020, 2, 1)),
+        ("QRA", "QRB", "1.3", date(2020, 3, 15)),
+        ("QRA", "QRB", "1.4", date(2020, 4, 1)),
+        ("QRB", "QRA", "0.7", date(2020, 2, 20)),
+    ]:
+        db_session.add(
+            ExchangeRate(base_currency=base, target_currency=target, rate=Decimal(rate), date=day)
+        )
+    await db_session.flush()
+
+    rows = await ExchangeRateRepository(db_session).get_history(date(2020, 3, 1))
+    ours = [
+        (r.base_currency, r.target_currency, r.date, Decimal(str(r.rate)))
+        for r in rows
+        if r.base_currency.startswith("QR")
+    ]
+    assert ours == [
+        ("QRA", "QRB", date(2020, 2, 1), Decimal("1.2")),
+        ("QRA", "QRB", date(2020, 3, 15), Decimal("1.3")),
+        ("QRA", "QRB", date(2020, 4, 1), Decimal("1.4")),
+        ("QRB", "QRA", date(2020, 2, 20), Decimal("0.7")),
+    ]
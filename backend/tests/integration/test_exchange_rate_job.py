@@ -0,0 +1,74 @@
+"""Integration tests for the exchange rate refresh job."""
+
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import event, select
+
+from app.jobs.exchange_rates import fetch_latest_rates, store_rates
+from app.models.currency import ExchangeRate
+
+
+def _transport(in_flight: list[int], peak: list[int], failing: set[str]) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        base = request.url.params["base"]
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            in_flight[0] -= 1
+        if base in failing:
+            return httpx.Response(503)
+        return httpx.Response(
+            200, json={"base": base, "date": "2010-05-04", "rates": {"XQA": 1.5, "XQB": 2.5}}
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_fetch_runs_bases_concurrently_within_limit():
+    in_flight, peak = [0], [0]
+    bases = ["XBA", "XBB", "XBC", "XBD", "XBE", "XBF"]
+
+    async with httpx.AsyncClient(transport=_transport(in_flight, peak, {"XBC"})) as client:
+        results = await fetch_latest_rates(client, bases, concurrency=3)
+
+    assert peak[0] == 3
+    # The failing base is skipped, the others keep their order
+    assert [base for base, _, _ in results] == ["XBA", "XBB", "XBD", "XBE", "XBF"]
+    assert results[0][1] == date(2010, 5, 4)
+
+
+@pytest.mark.asyncio
+async def test_store_rates_upserts_one_statement_per_base(db_session, test_engine):
+    results = [
+        ("XSA", date(2010, 5, 4), {"XSB": 1.1, "XSC": 2.2, "XSD": 3.3}),
+        ("XSB", date(2010, 5, 4), {"XSA": 0.9}),
+    ]
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        assert await store_rates(db_session, results) == 4
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", _count)
+    assert len(statements) == 2
+
+    # Re-running with a corrected rate updates in place
+    await store_rates(db_session, [("XSA", date(2010, 5, 4), {"XSB": 1.2})])
+    rows = (
+        await db_session.execute(
+            select(ExchangeRate).where(
+                ExchangeRate.base_currency == "XSA", ExchangeRate.target_currency == "XSB"
+            )
+        )
+    ).scalars().all()
+    assert [Decimal(str(r.rate)) for r in rows] == [Decimal("1.2")]
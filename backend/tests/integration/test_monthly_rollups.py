@@ -0,0 +1,125 @@
+"""Integration tests for the monthly report rollups."""
+
+import pytest
+
+from app.repositories.rollup import MonthlyRollupRepository
+
+
+async def _create_account(client, auth_headers, name):
+    resp = await client.post(
+        "/api/v1/accounts",
+        json={"name": name, "type": "checking", "currency": "USD"},
+        headers=auth_headers,
+    )
+    return resp.json()["id"]
+
+
+async def _create_category(client, auth_headers, name):
+    resp = await client.post(
+        "/api/v1/categories",
+        json={"name": name, "icon": "tag", "color": "#000000", "transaction_type": "expense"},
+        headers=auth_headers,
+    )
+    return resp.json()["id"]
+
+
+async def _create_tx(client, auth_headers, **payload):
+    payload.setdefault("currency", "USD")
+    resp = await client.post("/api/v1/transactions", json=payload, headers=auth_headers)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_rollups_follow_transaction_writes(client, auth_headers, db_session):
+    acc_id = await _create_account(client, auth_headers, "Rollup Acc")
+    cat_id = await _create_category(client, auth_headers, "Rollup Cat")
+    tx_id = await _create_tx(
+        client, auth_headers, account_id=acc_id, type="expense", amount="20.00",
+        date="2011-05-10", category_id=cat_id,
+    )
+    await _create_tx(
+        client, auth_headers, account_id=acc_id, type="income", amount="99.00", date="2011-05-11"
+    )
+
+    repo = MonthlyRollupRepository(db_session)
+    assert await repo.find_drift() == []
+
+    # Moving the transaction to another month and category re-buckets it
+    await client.patch(
+        f"/api/v1/transactions/{tx_id}",
+        json={"date": "2011-06-01", "amount": "25.00"},
+        headers=auth_headers,
+    )
+    assert await repo.find_drift() == []
+    totals = await repo.get_totals()
+    assert not any(k[1] == "2011-05" and k[3] == "expense" for k in totals)
+
+    await client.delete(f"/api/v1/transactions/{tx_id}", headers=auth_headers)
+    assert await repo.find_drift() == []
+    assert not any(k[1] == "2011-06" for k in await repo.get_totals())
+
+
+@pytest.mark.asyncio
+async def test_reports_combine_rollups_with_partial_months(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Rollup Report Acc")
+    cat_id = await _create_category(client, auth_headers, "Rollup Report Cat")
+    for day, amount, category in [
+        ("2012-01-15", "1.00", cat_id),  # before the range
+        ("2012-01-25", "2.00", cat_id),  # partial first month
+        ("2012-02-01", "4.00", cat_id),  # whole month
+        ("2012-02-29", "8.00", None),  # whole month, uncategorized
+        ("2012-03-10", "16.00", cat_id),  # partial last month
+        ("2012-03-11", "32.00", cat_id),  # after the range
+    ]:
+        await _create_tx(
+            client, auth_headers, account_id=acc_id, type="expense", amount=amount,
+            date=day, category_id=category,
+        )
+    await _create_tx(
+        client, auth_headers, account_id=acc_id, type="income", amount="100.00", date="2012-02-10"
+    )
+    params = {"from_date": "2012-01-20", "to_date": "2012-03-10"}
+
+    spending = await client.get("/api/v1/reports/spending", params=params, headers=auth_headers)
+    data = spending.json()
+    assert float(data["total"]) == pytest.approx(30.0)
+    by_name = {c["category_name"]: float(c["amount"]) for c in data["categories"]}
+    assert by_name == {"Rollup Report Cat": pytest.approx(22.0), "Uncategorized": pytest.approx(8.0)}
+    assert data["categories"][0]["category_id"] == cat_id
+
+    ive = await client.get("/api/v1/reports/income-vs-expenses", params=params, headers=auth_headers)
+    periods = {p["period"]: p for p in ive.json()["periods"]}
+    assert list(periods) == ["2012-01", "2012-02", "2012-03"]
+    assert float(periods["2012-01"]["expenses"]) == pytest.approx(2.0)
+    assert float(periods["2012-02"]["expenses"]) == pytest.approx(12.0)
+    assert float(periods["2012-02"]["net"]) == pytest.approx(88.0)
+    assert float(periods["2012-03"]["expenses"]) == pytest.approx(16.0)
+
+
+@pytest.mark.asyncio
+async def test_rollup_rebuild_restores_buckets(client, auth_headers, db_session):
+    from sqlalchemy import delete
+
+    from app.models.rollup import MonthlyRollup
+
+    acc_id = await _create_account(client, auth_headers, "Rollup Rebuild Acc")
+    await _create_tx(
+        client, auth_headers, account_id=acc_id, type="expense", amount="7.00", date="2013-07-07"
+    )
+
+    repo = MonthlyRollupRepository(db_session)
+    await db_session.execute(delete(MonthlyRollup).where(MonthlyRollup.year_month == "2013-07"))
+    assert len(await repo.find_drift()) == 1
+
+    await repo.rebuild()
+    assert await repo.find_drift() == []
+
+
+@pytest.mark.asyncio
+async def test_trends_accepts_long_ranges(client, auth_headers):
+    response = await client.get(
+        "/api/v1/reports/trends", params={"months": 120}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert response.json()["months"] == 120
@@ -0,0 +1,140 @@
+"""Integration tests for the historical exchange rate backfill."""
+
+import json
+from datetime import date
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.jobs.rate_backfill import _is_complete, backfill_rates, date_chunks
+from app.models.currency import ExchangeRate
+from app.services.rate_providers import FileRateProvider, FrankfurterProvider
+
+
+class CountingProvider:
+    def __init__(self, inner, fail_on: set[date] | None = None) -> None:
+        self.inner = inner
+        self.calls: list[tuple[str, date, date]] = []
+        self.fail_on = fail_on or set()
+
+    async def time_series(self, base, start, end):
+        self.calls.append((base, start, end))
+        if start in self.fail_on:
+            raise httpx.ConnectError("provider down")
+        return await self.inner.time_series(base, start, end)
+
+
+def _weekdays(start: date, end: date) -> list[date]:
+    return [
+        date.fromordinal(o)
+        for o in range(start.toordinal(), end.toordinal() + 1)
+        if date.fromordinal(o).weekday() < 5
+    ]
+
+
+def _fixture(tmp_path, base, days, targets):
+    data = {base: {d.isoformat(): {t: 1 + i / 100 for t in targets} for i, d in enumerate(days)}}
+    path = tmp_path / "rates.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+def _session(test_engine) -> AsyncSession:
+    return async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)()
+
+
+async def _stored(test_engine, base):
+    async with _session(test_engine) as session:
+        result = await session.execute(
+            select(ExchangeRate).where(ExchangeRate.base_currency == base)
+        )
+        return {(r.target_currency, r.date): Decimal(str(r.rate)) for r in result.scalars()}
+
+
+def test_date_chunks_cover_range_without_overlap():
+    chunks = list(date_chunks(date(2020, 1, 1), date(2020, 1, 10), 4))
+    assert chunks == [
+        (date(2020, 1, 1), date(2020, 1, 4)),
+        (date(2020, 1, 5), date(2020, 1, 8)),
+        (date(2020, 1, 9), date(2020, 1, 10)),
+    ]
+
+
+def test_chunk_with_a_holiday_counts_as_complete():
+    days = set(_weekdays(date(2020, 1, 1), date(2020, 1, 31)))
+    assert _is_complete(days - {date(2020, 1, 1)}, date(2020, 1, 1), date(2020, 1, 31))
+    assert not _is_complete(set(), date(2020, 1, 1), date(2020, 1, 31))
+
+
+@pytest.mark.asyncio
+async def test_backfill_inserts_chunks_and_skips_completed_ones(tmp_path, test_engine):
+    start, end = date(2009, 1, 1), date(2009, 2, 28)
+    provider = CountingProvider(
+        FileRateProvider(_fixture(tmp_path, "XRA", _weekdays(start, end), ["XRB", "XRC"]))
+    )
+
+    async with _session(test_engine) as session:
+        # A rate already stored must not be overwritten
+        session.add(
+            ExchangeRate(
+                base_currency="XRA", target_currency="XRB", rate=Decimal("9"), date=date(2009, 1, 2)
+            )
+        )
+        await session.commit()
+
+        inserted = await backfill_rates(session, provider, ["XRA"], start, end, chunk_days=30)
+        assert inserted == len(_weekdays(start, end)) * 2 - 1
+        assert len(provider.calls) == 2
+
+        provider.calls.clear()
+        assert await backfill_rates(session, provider, ["XRA"], start, end, chunk_days=30) == 0
+        assert provider.calls == []
+
+    stored = await _stored(test_engine, "XRA")
+    assert stored[("XRB", date(2009, 1, 2))] == Decimal("9")
+    assert stored[("XRC", date(2009, 1, 2))] == Decimal("1.01")
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_after_interruption(tmp_path, test_engine):
+    start, end = date(2008, 1, 1), date(2008, 3, 30)
+    path = _fixture(tmp_path, "XRD", _weekdays(start, end), ["XRE"])
+
+    async with _session(test_engine) as session:
+        failing = CountingProvider(FileRateProvider(path), fail_on={date(2008, 1, 31)})
+        first = await backfill_rates(session, failing, ["XRD"], start, end, chunk_days=30)
+
+        resumed = CountingProvider(FileRateProvider(path))
+        second = await backfill_rates(session, resumed, ["XRD"], start, end, chunk_days=30)
+
+    # Only the chunk that failed is fetched again
+    assert resumed.calls == [("XRD", date(2008, 1, 31), date(2008, 2, 29))]
+    assert first + second == len(_weekdays(start, end))
+    assert len(await _stored(test_engine, "XRD")) == len(_weekdays(start, end))
+
+
+@pytest.mark.asyncio
+async def test_frankfurter_provider_requests_time_series():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "base": "EUR",
+                "rates": {"2024-01-02": {"USD": 1.0956}, "2024-01-03": {"USD": 1.0919}},
+            },
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        series = await FrankfurterProvider(client, "https://rates.test/").time_series(
+            "EUR", date(2024, 1, 1), date(2024, 1, 3)
+        )
+
+    assert requests[0].url.path == "/2024-01-01..2024-01-03"
+    assert requests[0].url.params["base"] == "EUR"
+    assert series[date(2024, 1, 2)] == {"USD": Decimal("1.0956")}
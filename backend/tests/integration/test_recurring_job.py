@@ -0,0 +1,229 @@
+"""Integration tests for the set-based recurring transaction job."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.jobs.recurring_transactions import backfill_range, expand_occurrences, generate_due
+from app.models.recurring import RecurringRule
+from app.models.transaction import Transaction
+
+# The test database is shared, so each test runs on dates no other rule is due by
+RUN_DATE = date(2016, 3, 10)
+
+
+async def _create_account(client, auth_headers, name):
+    resp = await client.post(
+        "/api/v1/accounts",
+        json={"name": name, "type": "checking", "currency": "USD"},
+        headers=auth_headers,
+    )
+    return resp.json()["id"]
+
+
+async def _create_rule(client, auth_headers, account_id, **overrides):
+    payload = {
+        "account_id": account_id,
+        "name": "Job Rule",
+        "type": "expense",
+        "amount": "10.00",
+        "currency": "USD",
+        "frequency": "monthly",
+        "start_date": str(RUN_DATE),
+    }
+    payload.update(overrides)
+    resp = await client.post("/api/v1/recurring", json=payload, headers=auth_headers)
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _session(test_engine) -> AsyncSession:
+    return async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)()
+
+
+async def _rules_and_transactions(test_engine, rule_ids):
+    async with _session(test_engine) as session:
+        rules = {
+            str(r.id): r
+            for r in (await session.execute(select(RecurringRule))).scalars()
+            if str(r.id) in rule_ids
+        }
+        txs = [
+            t
+            for t in (await session.execute(select(Transaction))).scalars()
+            if str(t.recurring_rule_id) in rule_ids
+        ]
+    return rules, txs
+
+
+@pytest.mark.asyncio
+async def test_job_generates_in_chunks_and_advances_rules(client, auth_headers, test_engine):
+    acc_id = await _create_account(client, auth_headers, "Job Acc")
+    rule_ids = {
+        await _create_rule(client, auth_headers, acc_id, name=f"Job Rule {i}", amount=f"{i}.00")
+        for i in range(1, 6)
+    }
+    ending = await _create_rule(
+        client, auth_headers, acc_id, name="Ending Rule", frequency="weekly",
+        end_date="2016-03-12",
+    )
+    rule_ids.add(ending)
+
+    async with _session(test_engine) as session:
+        created = await generate_due(session, RUN_DATE, chunk_size=2)
+    assert created == 6
+
+    rules, txs = await _rules_and_transactions(test_engine, rule_ids)
+    assert len(txs) == 6
+    assert all(t.date == RUN_DATE and t.account_currency == "USD" for t in txs)
+    assert rules[ending].status == "cancelled"
+    assert {r.next_occurrence for k, r in rules.items() if k != ending} == {date(2016, 4, 10)}
+
+    balance = await client.get(f"/api/v1/accounts/{acc_id}", headers=auth_headers)
+    assert float(balance.json()["balance"]) == pytest.approx(-(1 + 2 + 3 + 4 + 5 + 10))
+
+
+@pytest.mark.asyncio
+async def test_job_skips_already_generated_pairs(client, auth_headers, test_engine):
+    from sqlalchemy import update
+
+    run_date = date(2015, 5, 20)
+    acc_id = await _create_account(client, auth_headers, "Job Idempotent Acc")
+    rule_id = await _create_rule(client, auth_headers, acc_id, start_date=str(run_date))
+
+    async with _session(test_engine) as session:
+        assert await generate_due(session, run_date, chunk_size=10) == 1
+        # Re-arm the rule as if the first run had crashed before advancing it
+        await session.execute(
+            update(RecurringRule)
+            .where(RecurringRule.next_occurrence == date(2015, 6, 20))
+            .values(next_occurrence=run_date)
+        )
+        await session.commit()
+        assert await generate_due(session, run_date, chunk_size=10) == 0
+
+    rules, txs = await _rules_and_transactions(test_engine, {rule_id})
+    assert len(txs) == 1
+    assert rules[rule_id].next_occurrence == date(2015, 6, 20)
+
+
+@pytest.mark.asyncio
+async def test_unique_index_rejects_duplicate_generated_transactions(
+    client, auth_headers, test_engine
+):
+    from sqlalchemy.exc import IntegrityError
+
+    from app.repositories.transaction import TransactionRepository
+
+    run_date = date(2014, 8, 5)
+    acc_id = await _create_account(client, auth_headers, "Job Unique Acc")
+    rule_id = await _create_rule(client, auth_headers, acc_id, start_date=str(run_date))
+
+    async with _session(test_engine) as session:
+        assert await generate_due(session, run_date, chunk_size=10) == 1
+        _, (tx,) = await _rules_and_transactions(test_engine, {rule_id})
+        duplicate = {
+            c.key: getattr(tx, c.key)
+            for c in Transaction.__table__.columns
+            if c.key not in ("id", "created_at", "updated_at")
+        }
+
+        repo = TransactionRepository(session)
+        assert await repo.create_many_for_rules([duplicate]) == []
+        with pytest.raises(IntegrityError):
+            await repo.create_many([duplicate])
+        await session.rollback()
+
+        # Manual transactions (no rule) are unaffected by the partial index
+        manual = {**duplicate, "recurring_rule_id": None}
+        assert len(await repo.create_many([manual, dict(manual)])) == 2
+        await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_job_query_count_does_not_grow_with_rules(client, auth_headers, test_engine):
+    acc_id = await _create_account(client, auth_headers, "Job Count Acc")
+
+    async def _run(run_date, rules):
+        for i in range(rules):
+            await _create_rule(
+                client, auth_headers, acc_id, start_date=str(run_date), name=f"C{i}",
+                frequency="yearly",
+            )
+        statements = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        async with _session(test_engine) as session:
+            event.listen(test_engine.sync_engine, "before_cursor_execute", _count)
+            try:
+                assert await generate_due(session, run_date, chunk_size=100) == rules
+            finally:
+                event.remove(test_engine.sync_engine, "before_cursor_execute", _count)
+        return len(statements)
+
+    assert await _run(date(2014, 1, 5), 2) == await _run(date(2014, 2, 5), 20)
+
+
+@pytest.mark.asyncio
+async def test_job_backfills_missed_occurrences(client, auth_headers, test_engine):
+    acc_id = await _create_account(client, auth_headers, "Job Missed Acc")
+    rule_id = await _create_rule(
+        client, auth_headers, acc_id, frequency="daily", start_date="2013-06-01"
+    )
+
+    # The scheduler was down from the 1st to the 5th
+    async with _session(test_engine) as session:
+        assert await generate_due(session, date(2013, 6, 5), chunk_size=10) == 5
+        assert await generate_due(session, date(2013, 6, 5), chunk_size=10) == 0
+
+    rules, txs = await _rules_and_transactions(test_engine, {rule_id})
+    assert sorted(t.date for t in txs) == [date(2013, 6, d) for d in range(1, 6)]
+    assert rules[rule_id].next_occurrence == date(2013, 6, 6)
+
+
+@pytest.mark.asyncio
+async def test_backfill_range_fills_gaps_idempotently(client, auth_headers, test_engine):
+    acc_id = await _create_account(client, auth_headers, "Job Range Acc")
+    rule_id = await _create_rule(client, auth_headers, acc_id, start_date="2012-01-01")
+
+    async with _session(test_engine) as session:
+        assert await generate_due(session, date(2012, 1, 1), chunk_size=10) == 1
+        created = await backfill_range(session, date(2011, 12, 1), date(2012, 3, 15), chunk_size=10)
+        assert created == 2
+        again = await backfill_range(session, date(2011, 12, 1), date(2012, 3, 15), chunk_size=10)
+        assert again == 0
+
+    rules, txs = await _rules_and_transactions(test_engine, {rule_id})
+    assert sorted(t.date for t in txs) == [date(2012, 1, 1), date(2012, 2, 1), date(2012, 3, 1)]
+    assert rules[rule_id].next_occurrence == date(2012, 4, 1)
+
+
+@pytest.mark.asyncio
+async def test_backfill_range_leaves_rules_behind_the_range(client, auth_headers, test_engine):
+    acc_id = await _create_account(client, auth_headers, "Job Behind Acc")
+    rule_id = await _create_rule(
+        client, auth_headers, acc_id, start_date="2011-01-01", end_date="2011-06-30"
+    )
+
+    async with _session(test_engine) as session:
+        assert await backfill_range(session, date(2011, 3, 1), date(2011, 4, 15), chunk_size=10) == 2
+        rules, _ = await _rules_and_transactions(test_engine, {rule_id})
+        # January and February are still owed, so the rule must not jump past them
+        assert rules[rule_id].next_occurrence == date(2011, 1, 1)
+        assert await generate_due(session, date(2011, 4, 15), chunk_size=10) == 2
+
+    rules, txs = await _rules_and_transactions(test_engine, {rule_id})
+    assert sorted(t.date for t in txs) == [date(2011, m, 1) for m in range(1, 5)]
+    assert rules[rule_id].next_occurrence == date(2011, 5, 1)
+
+
+def test_expand_occurrences_respects_end_date():
+    occurrences, following = expand_occurrences(
+        date(2024, 1, 1), "weekly", until=date(2024, 2, 1), end_date=date(2024, 1, 20)
+    )
+    assert occurrences == [date(2024, 1, 1), date(2024, 1, 8), date(2024, 1, 15)]
+    assert following == date(2024, 1, 22)
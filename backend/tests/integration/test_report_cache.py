@@ -0,0 +1,94 @@
+"""Integration tests for report caching and write-driven invalidation."""
+
+import pytest
+
+from app.dependencies import get_admin_user
+from app.main import app
+from app.services.report_cache import report_cache
+
+SPENDING = {"from_date": "2014-01-01", "to_date": "2014-12-31"}
+
+
+async def _create_account(client, auth_headers, name):
+    resp = await client.post(
+        "/api/v1/accounts",
+        json={"name": name, "type": "checking", "currency": "USD"},
+        headers=auth_headers,
+    )
+    return resp.json()["id"]
+
+
+async def _spending_total(client, auth_headers):
+    resp = await client.get("/api/v1/reports/spending", params=SPENDING, headers=auth_headers)
+    assert resp.status_code == 200
+    return float(resp.json()["total"])
+
+
+@pytest.mark.asyncio
+async def test_repeated_report_is_served_from_cache(client, auth_headers):
+    await _spending_total(client, auth_headers)
+    hits = report_cache.hits
+
+    await _spending_total(client, auth_headers)
+
+    assert report_cache.hits == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_transaction_write_invalidates_cached_reports(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Cache Acc")
+    before = await _spending_total(client, auth_headers)
+
+    resp = await client.post(
+        "/api/v1/transactions",
+        json={
+            "account_id": acc_id, "type": "expense", "amount": "12.50",
+            "currency": "USD", "date": "2014-06-15",
+        },
+        headers=auth_headers,
+    )
+    tx_id = resp.json()["id"]
+    assert await _spending_total(client, auth_headers) == pytest.approx(before + 12.5)
+
+    await client.post(
+        "/api/v1/transactions/bulk",
+        json={"items": [{
+            "account_id": acc_id, "type": "expense", "amount": "1.00",
+            "currency": "USD", "date": "2014-06-16",
+        }]},
+        headers=auth_headers,
+    )
+    assert await _spending_total(client, auth_headers) == pytest.approx(before + 13.5)
+
+    await client.delete(f"/api/v1/transactions/{tx_id}", headers=auth_headers)
+    assert await _spending_total(client, auth_headers) == pytest.approx(before + 1.0)
+
+
+@pytest.mark.asyncio
+async def test_account_write_invalidates_net_worth(client, auth_headers):
+    await client.get("/api/v1/reports/net-worth", headers=auth_headers)
+    await _create_account(client, auth_headers, "Cache Net Worth Acc")
+
+    resp = await client.get("/api/v1/reports/net-worth", headers=auth_headers)
+    names = [a["account_name"] for a in resp.json()["accounts"]]
+    assert "Cache Net Worth Acc" in names
+
+
+@pytest.mark.asyncio
+async def test_admin_metrics_expose_cache_counters(client, auth_headers, mock_user):
+    mock_user.is_admin = True
+    app.dependency_overrides[get_admin_user] = lambda: mock_user
+    try:
+        resp = await client.get("/api/v1/admin/metrics", headers=auth_headers)
+    finally:
+        app.dependency_overrides.pop(get_admin_user)
+    assert resp.status_code == 200
+    stats = resp.json()["report_cache"]
+    assert stats["hits"] == report_cache.hits
+    assert stats["misses"] == report_cache.misses
+    assert stats["max_entries"] > 0
+    assert "hit_rate" in resp.json()["rate_cache"]
+    assert "hit_rate" in resp.json()["user_cache"]
+    assert "hit_rate" in resp.json()["token_cache"]
+    assert "queued" in resp.json()["password_pool"]
+    assert "hit_rate" in resp.json()["budget_access_cache"]
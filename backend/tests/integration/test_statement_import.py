@@ -0,0 +1,176 @@
+"""Integration tests for POST /transactions/import."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.seed import seed_currencies
+from app.utils.statement_parsers import ParsedRow
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _currencies(test_engine):
+    """Imports check row currencies against the currencies table."""
+    async with async_sessionmaker(bind=test_engine, class_=AsyncSession)() as session:
+        await seed_currencies(session)
+
+
+async def _create_account(client, auth_headers, name, currency="USD"):
+    resp = await client.post(
+        "/api/v1/accounts",
+        json={"name": name, "type": "checking", "currency": currency},
+        headers=auth_headers,
+    )
+    return resp.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_import_csv_in_chunks(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Import CSV Acc")
+    body = "date,description,amount\n" + "".join(
+        f"2024-03-{(i % 28) + 1:02d},Row {i},{'-' if i % 2 else ''}{i}.00\n" for i in range(1, 26)
+    )
+    body += "garbage,row,x\n"
+
+    response = await client.post(
+        "/api/v1/transactions/import",
+        data={"account_id": acc_id, "chunk_size": "10"},
+        files={"file": ("statement.csv", body.encode(), "text/csv")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["imported"] == 25
+    assert data["chunks"] == 3
+    assert data["skipped"] == 1
+    assert data["errors"][0]["line"] == 27
+
+    listed = await client.get(
+        f"/api/v1/transactions?account_id={acc_id}&page_size=100", headers=auth_headers
+    )
+    items = listed.json()["items"]
+    assert len(items) == 25
+    assert {tx["type"] for tx in items} == {"income", "expense"}
+    assert all(Decimal(tx["amount"]) > 0 for tx in items)
+
+    expected = sum(i if i % 2 == 0 else -i for i in range(1, 26))
+    acc = await client.get(f"/api/v1/accounts/{acc_id}", headers=auth_headers)
+    assert float(acc.json()["balance"]) == pytest.approx(expected)
+
+
+@pytest.mark.asyncio
+async def test_import_qif_format_from_extension(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Import QIF Acc")
+    body = "!Type:Bank\nD01/15/2024\nT-25.00\nPElectric Co\n^\n"
+
+    response = await client.post(
+        "/api/v1/transactions/import",
+        data={"account_id": acc_id},
+        files={"file": ("export.qif", body.encode(), "application/octet-stream")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    assert response.json()["imported"] == 1
+
+    listed = await client.get(f"/api/v1/transactions?account_id={acc_id}", headers=auth_headers)
+    tx = listed.json()["items"][0]
+    assert tx["type"] == "expense"
+    assert tx["notes"] == "Electric Co"
+    assert tx["date"] == "2024-01-15"
+
+
+@pytest.mark.asyncio
+async def test_import_reports_unknown_currencies(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Import Currency Acc")
+    body = "date,amount,currency\n2024-01-01,\"12,50\",EUR\n2024-01-02,-3.00,XYZ\n2024-01-03,1,\n"
+
+    response = await client.post(
+        "/api/v1/transactions/import",
+        data={"account_id": acc_id},
+        files={"file": ("statement.csv", body.encode(), "text/csv")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["imported"] == 2
+    assert data["errors"] == [{"line": 3, "detail": "Unknown currency: XYZ"}]
+
+    listed = await client.get(f"/api/v1/transactions?account_id={acc_id}", headers=auth_headers)
+    assert sorted(Decimal(tx["amount"]) for tx in listed.json()["items"]) == [Decimal("1"), Decimal("12.50")]
+
+
+@pytest.mark.asyncio
+async def test_import_unknown_format(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Import Bad Acc")
+    response = await client.post(
+        "/api/v1/transactions/import",
+        data={"account_id": acc_id},
+        files={"file": ("statement.pdf", b"%PDF", "application/pdf")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["code"] == "unsupported_format"
+
+
+@pytest.mark.asyncio
+async def test_import_unknown_account(client, auth_headers):
+    import uuid
+
+    response = await client.post(
+        "/api/v1/transactions/import",
+        data={"account_id": str(uuid.uuid4())},
+        files={"file": ("s.csv", b"date,amount\n2024-01-01,1\n", "text/csv")},
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_resolves_each_rate_pair_and_date_once(test_engine, mock_user, monkeypatch):
+    from app.models.account import Account
+    from app.services import statement_import
+    from app.services.statement_import import StatementImportService
+
+    # The import commits per chunk, so it needs a session it owns
+    session = async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)()
+    account = Account(
+        user_id=mock_user.id, name="Rates Acc", type="checking", currency="USD", initial_balance=0
+    )
+    session.add(account)
+    await session.flush()
+
+    calls = []
+
+    async def fake_rate(repo, src, dst, on):
+        calls.append((src, dst, on))
+        return Decimal("2") if src != dst else Decimal("1")
+
+    monkeypatch.setattr(statement_import, "get_rate_or_1", fake_rate)
+
+    async def rows():
+        for i in range(1, 101):
+            yield ParsedRow(
+                line=i,
+                date=date(2024, 1, 1 + i % 3 // 2),
+                amount=Decimal("-1"),
+                currency="EUR" if i % 2 else None,
+            )
+
+    progress = []
+    async with session:
+        result = await StatementImportService(session).import_statement(
+            mock_user.id, account.id, rows(), "USD", chunk_size=30,
+            on_progress=lambda p: progress.append(p.imported),
+        )
+    assert result.imported == 100
+    assert progress == [30, 60, 90, 100]
+    # account and base currency are both USD: two pairs on two dates, each looked up once
+    assert sorted(calls) == [
+        ("EUR", "USD", date(2024, 1, 1)),
+        ("EUR", "USD", date(2024, 1, 2)),
+        ("USD", "USD", date(2024, 1, 1)),
+        ("USD", "USD", date(2024, 1, 2)),
+    ]
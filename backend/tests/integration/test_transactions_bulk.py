@@ -0,0 +1,108 @@
+"""Integration tests for POST /transactions/bulk."""
+
+import uuid
+from datetime import date
+
+import pytest
+
+
+async def _create_account(client, auth_headers, name):
+    resp = await client.post(
+        "/api/v1/accounts",
+        json={"name": name, "type": "checking", "currency": "USD"},
+        headers=auth_headers,
+    )
+    return resp.json()["id"]
+
+
+def _item(account_id, amount="10.00", **overrides):
+    item = {
+        "account_id": account_id,
+        "type": "expense",
+        "amount": amount,
+        "currency": "USD",
+        "date": str(date.today()),
+    }
+    item.update(overrides)
+    return item
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_all_items(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Bulk Acc")
+    items = [_item(acc_id, f"{i}.00") for i in range(1, 51)]
+
+    response = await client.post(
+        "/api/v1/transactions/bulk", json={"items": items}, headers=auth_headers
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["errors"] == []
+    assert [float(tx["amount"]) for tx in data["created"]] == [float(i) for i in range(1, 51)]
+    assert all(tx["account_currency"] == "USD" for tx in data["created"])
+
+    acc = await client.get(f"/api/v1/accounts/{acc_id}", headers=auth_headers)
+    assert float(acc.json()["balance"]) == pytest.approx(-sum(range(1, 51)))
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_all_or_nothing_rejects_batch(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Bulk Atomic Acc")
+    items = [
+        _item(acc_id),
+        _item(str(uuid.uuid4())),
+        _item(acc_id, type="transfer"),
+    ]
+
+    response = await client.post(
+        "/api/v1/transactions/bulk", json={"items": items}, headers=auth_headers
+    )
+    assert response.status_code == 400
+    body = response.json()
+    assert body["code"] == "bulk_validation_failed"
+    assert [(e["index"], e["code"]) for e in body["errors"]] == [
+        (1, "account_not_found"),
+        (2, "transfer_account_required"),
+    ]
+
+    listing = await client.get(
+        "/api/v1/transactions", params={"account_id": acc_id}, headers=auth_headers
+    )
+    assert listing.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_partial_mode(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Bulk Partial Acc")
+    dest_id = await _create_account(client, auth_headers, "Bulk Partial Dest")
+    items = [
+        _item(acc_id, "5.00"),
+        _item(acc_id, type="transfer", transfer_to_account_id=str(uuid.uuid4())),
+        _item(acc_id, "7.00", type="transfer", transfer_to_account_id=dest_id),
+    ]
+
+    response = await client.post(
+        "/api/v1/transactions/bulk",
+        json={"items": items, "mode": "partial"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert len(data["created"]) == 2
+    assert data["errors"] == [
+        {"index": 1, "code": "transfer_account_not_found", "detail": "Transfer destination account not found"}
+    ]
+
+    dest = await client.get(f"/api/v1/accounts/{dest_id}", headers=auth_headers)
+    assert float(dest.json()["balance"]) == pytest.approx(7.0)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_invalid_mode(client, auth_headers):
+    response = await client.post(
+        "/api/v1/transactions/bulk",
+        json={"items": [], "mode": "sometimes"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    assert response.json()["code"] == "invalid_bulk_mode"
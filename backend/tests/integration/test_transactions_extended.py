@@ -36,6 +36,40 @@ async def test_create_income_transaction(client, auth_headers):
     assert float(data["exchange_rate"]) == pytest.approx(1.0)
 
 
+@pytest.mark.asyncio
+async def test_backdated_transaction_uses_rate_in_force_on_its_date(
+    client, auth_headers, test_engine
+):
+    from decimal import Decimal
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from app.models.currency import ExchangeRate
+
+    async with async_sessionmaker(bind=test_engine, class_=AsyncSession)() as session:
+        for rate, day in [("2.0", date(2011, 3, 1)), ("3.0", date(2011, 6, 1))]:
+            session.add(
+                ExchangeRate(
+                    base_currency="QZA", target_currency="USD", rate=Decimal(rate), date=day
+                )
+            )
+        await session.commit()
+
+    acc_id = await _create_account(client, auth_headers, "Backdated Acc")
+    payload = {
+        "account_id": acc_id,
+        "type": "expense",
+        "amount": "10.00",
+        "currency": "QZA",
+        "date": "2011-04-10",
+    }
+    response = await client.post("/api/v1/transactions", json=payload, headers=auth_headers)
+    assert response.status_code == 201
+    data = response.json()
+    assert float(data["exchange_rate"]) == pytest.approx(2.0)
+    assert float(data["amount_base"]) == pytest.approx(20.0)
+
+
 @pytest.mark.asyncio
 async def test_create_transfer_transaction(client, auth_headers):
     acc1 = await _create_account(client, auth_headers, "From Acc")
@@ -172,3 +206,133 @@ async def test_filter_transactions_by_date(client, auth_headers):
         headers=auth_headers,
     )
     assert response2.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_cursor_pagination(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Cursor Acc")
+    dates = ["2024-05-03", "2024-05-02", "2024-05-02", "2024-05-02", "2024-05-01"]
+    for d in dates:
+        await client.post(
+            "/api/v1/transactions",
+            json={"account_id": acc_id, "type": "expense", "amount": "1.00", "currency": "USD", "date": d},
+            headers=auth_headers,
+        )
+
+    offset_resp = await client.get(
+        "/api/v1/transactions",
+        params={"account_id": acc_id, "page_size": 10},
+        headers=auth_headers,
+    )
+    expected = [tx["id"] for tx in offset_resp.json()["items"]]
+    assert offset_resp.json()["next_cursor"] is None
+
+    seen: list[str] = []
+    params = {"account_id": acc_id, "page_size": 2, "include_total": "false"}
+    while True:
+        resp = await client.get("/api/v1/transactions", params=params, headers=auth_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total"] is None
+        assert data["pages"] is None
+        seen.extend(tx["id"] for tx in data["items"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert seen == expected
+    assert [tx["date"] for tx in offset_resp.json()["items"]] == sorted(dates, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_cursor_survives_deleted_boundary_row(client, auth_headers):
+    acc_id = await _create_account(client, auth_headers, "Cursor Delete Acc")
+    payload = {
+        "account_id": acc_id, "type": "expense", "amount": "1.00", "currency": "USD",
+        "date": "2024-06-02",
+    }
+    for _ in range(4):
+        await client.post("/api/v1/transactions", json=payload, headers=auth_headers)
+    params = {"account_id": acc_id, "page_size": 10}
+    listing = await client.get("/api/v1/transactions", params=params, headers=auth_headers)
+    expected = [tx["id"] for tx in listing.json()["items"]]
+
+    params = {"account_id": acc_id, "page_size": 2, "include_total": "false"}
+    first = (await client.get("/api/v1/transactions", params=params, headers=auth_headers)).json()
+    assert [tx["id"] for tx in first["items"]] == expected[:2]
+
+    # The row the cursor points at disappears between page requests
+    resp = await client.delete(f"/api/v1/transactions/{expected[1]}", headers=auth_headers)
+    assert resp.status_code == 204
+    params["cursor"] = first["next_cursor"]
+    second = (await client.get("/api/v1/transactions", params=params, headers=auth_headers)).json()
+    assert [tx["id"] for tx in second["items"]] == expected[2:]
+
+
+@pytest.mark.asyncio
+async def test_list_transactions_invalid_cursor_returns_400(client, auth_headers):
+    response = await client.get(
+        "/api/v1/transactions", params={"cursor": "garbage"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert response.json()["code"] == "invalid_cursor"
+
+
+@pytest.mark.asyncio
+async def test_export_transactions_csv(client, auth_headers):
+    import csv
+    import io
+
+    acc_id = await _create_account(client, auth_headers, "Export CSV Acc")
+    for amount in ("12.50", "7.25"):
+        await client.post(
+            "/api/v1/transactions",
+            json={"account_id": acc_id, "type": "expense", "amount": amount, "currency": "USD", "date": "2024-06-01", "notes": "a, \"quoted\" note"},
+            headers=auth_headers,
+        )
+
+    response = await client.get(
+        "/api/v1/transactions/export",
+        params={"format": "csv", "account_id": acc_id},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="transactions.csv"' in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2
+    assert {float(r["amount"]) for r in rows} == {12.5, 7.25}
+    assert all(r["account_id"] == acc_id for r in rows)
+    assert rows[0]["notes"] == 'a, "quoted" note'
+
+
+@pytest.mark.asyncio
+async def test_export_transactions_ndjson(client, auth_headers):
+    import json
+
+    acc_id = await _create_account(client, auth_headers, "Export NDJSON Acc")
+    await client.post(
+        "/api/v1/transactions",
+        json={"account_id": acc_id, "type": "income", "amount": "99.00", "currency": "USD", "date": "2024-06-02"},
+        headers=auth_headers,
+    )
+
+    response = await client.get(
+        "/api/v1/transactions/export",
+        params={"format": "ndjson", "account_id": acc_id, "type": "income"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 1
+    assert lines[0]["date"] == "2024-06-02"
+    assert float(lines[0]["amount"]) == pytest.approx(99.0)
+
+
+@pytest.mark.asyncio
+async def test_export_transactions_rejects_unknown_format(client, auth_headers):
+    response = await client.get(
+        "/api/v1/transactions/export", params={"format": "xml"}, headers=auth_headers
+    )
+    assert response.status_code == 422
@@ -0,0 +1,131 @@
+"""Integration tests for the authenticated user cache in get_current_user."""
+
+import pytest
+import pytest_asyncio
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.dependencies import get_current_user
+from app.repositories.user import UserRepository
+from app.schemas.user import UserUpdate
+from app.services.auth import issue_local_token
+from app.services.user import UserService
+from app.services.user_cache import user_cache
+
+SUB = "local:cache-user@example.com"
+
+
+@pytest_asyncio.fixture
+async def session_factory(test_engine, monkeypatch):
+    monkeypatch.setattr("app.dependencies.settings.local_auth_enabled", True)
+    factory = async_sessionmaker(bind=test_engine, class_=AsyncSession, expire_on_commit=False)
+    yield factory
+    async with factory() as session:
+        user = await UserRepository(session).get_by_sub(SUB)
+        if user is not None:
+            await UserRepository(session).delete(user)
+            await session.commit()
+    user_cache.clear()
+
+
+async def _authenticate(factory):
+    """Run get_current_user in its own committed session, like one request."""
+    token = issue_local_token(SUB, "cache-user@example.com", "Cache User")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    async with factory() as session:
+        user = await get_current_user(credentials, session)
+        await session.commit()
+        return user
+
+
+def _count_queries(test_engine):
+    queries = []
+
+    def _count(*args):
+        queries.append(args)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", _count)
+    return queries, lambda: event.remove(test_engine.sync_engine, "before_cursor_execute", _count)
+
+
+@pytest.mark.asyncio
+async def test_repeat_requests_skip_user_query(session_factory, test_engine):
+    await _authenticate(session_factory)  # sign-up
+    await _authenticate(session_factory)  # loads and caches the row
+
+    hits = user_cache.hits
+    queries, stop = _count_queries(test_engine)
+    try:
+        user = await _authenticate(session_factory)
+    finally:
+        stop()
+
+    assert not [q for q in queries if "users" in q[2]]
+    assert user_cache.hits == hits + 1
+    assert user.sub == SUB
+    assert user.display_name == "Cache User"
+
+
+@pytest.mark.asyncio
+async def test_cached_user_is_usable_in_request_session(session_factory):
+    await _authenticate(session_factory)
+    await _authenticate(session_factory)
+
+    token = issue_local_token(SUB, "cache-user@example.com", "Cache User")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    async with session_factory() as session:
+        user = await get_current_user(credentials, session)
+        assert user in session
+        await UserService(session).update(user, UserUpdate(display_name="Renamed"))
+        await session.commit()
+
+    user = await _authenticate(session_factory)
+    assert user.display_name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_user_update_invalidates_entry(session_factory):
+    await _authenticate(session_factory)
+    cached = await _authenticate(session_factory)
+    assert user_cache.backend.get(SUB) is not None
+
+    async with session_factory() as session:
+        user = await UserRepository(session).get(cached.id)
+        await UserService(session).update(user, UserUpdate(base_currency="EUR"))
+        assert user_cache.backend.get(SUB) is not None  # not before the commit
+        await session.commit()
+
+    assert user_cache.backend.get(SUB) is None
+    user = await _authenticate(session_factory)
+    assert user.base_currency == "EUR"
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_write_invalidates_entry(session_factory):
+    await _authenticate(session_factory)
+    cached = await _authenticate(session_factory)
+
+    async with session_factory() as session:
+        user = await UserRepository(session).get(cached.id)
+        await UserRepository(session).update(user, is_admin=not user.is_admin)
+        await session.rollback()
+
+    assert user_cache.backend.get(SUB) is None
+    user = await _authenticate(session_factory)
+    assert user.is_admin == cached.is_admin
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_is_not_served_from_cache(session_factory):
+    await _authenticate(session_factory)
+    cached = await _authenticate(session_factory)
+
+    async with session_factory() as session:
+        repo = UserRepository(session)
+        await repo.delete(await repo.get(cached.id))
+        await session.commit()
+
+    # The next request signs the user up again rather than returning the old row
+    user = await _authenticate(session_factory)
+    assert user.id != cached.id
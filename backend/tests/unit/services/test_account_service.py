@@ -103,8 +103,7 @@ async def test_list_accounts_includes_balance():
     service = AccountService(session)
     acc = make_account()
     service.repo = AsyncMock()
-    service.repo.get_by_user.return_value = [acc]
-    service.repo.compute_balance.return_value = Decimal("1234.56")
+    service.repo.get_with_balances.return_value = [(acc, Decimal("1234.56"))]
 
     # Patch AccountResponse.model_validate to avoid SQLAlchemy attribute issues
     with patch("app.services.account.AccountResponse") as MockResp:
@@ -39,8 +39,7 @@ async def test_viewer_cannot_delete_budget():
 
     # Patch the internal repo
     service.repo = AsyncMock()
-    service.repo.get_by_id_with_categories.return_value = budget
-    service.repo.get_collaborator.return_value = collab
+    service.repo.get_access_map.return_value = {budget.id: collab.role}
 
     with pytest.raises(HTTPException) as exc_info:
         await service.delete_budget(budget.id, viewer_id)
@@ -58,7 +57,8 @@ async def test_owner_can_delete_budget():
     mock_session = AsyncMock()
     service = BudgetService(mock_session)
     service.repo = AsyncMock()
-    service.repo.get_by_id_with_categories.return_value = budget
+    service.repo.get_access_map.return_value = {budget.id: "owner"}
+    service.repo.get.return_value = budget
     service.repo.delete = AsyncMock()
 
     # Should not raise
@@ -76,10 +76,11 @@ async def test_non_collaborator_cannot_access_budget():
     mock_session = AsyncMock()
     service = BudgetService(mock_session)
     service.repo = AsyncMock()
-    service.repo.get_by_id_with_categories.return_value = budget
-    service.repo.get_collaborator.return_value = None
+    service.repo.get_access_map.return_value = {}
+    service.repo.exists.return_value = True
 
     with pytest.raises(HTTPException) as exc_info:
         await service.get_budget(budget.id, stranger_id)
 
     assert exc_info.value.status_code == 403
+    service.repo.get_by_id_with_categories.assert_not_called()
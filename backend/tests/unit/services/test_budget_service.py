@@ -50,7 +50,8 @@ async def test_get_budget_not_found():
     session = AsyncMock()
     service = BudgetService(session)
     service.repo = AsyncMock()
-    service.repo.get_by_id_with_categories.return_value = None
+    service.repo.get_access_map.return_value = {}
+    service.repo.exists.return_value = False
 
     with pytest.raises(HTTPException) as exc:
         await service.get_budget(uuid.uuid4(), uuid.uuid4())
@@ -66,6 +67,7 @@ async def test_update_budget_success():
     updated = make_budget(owner_id)
     updated.name = "Updated"
     service.repo = AsyncMock()
+    service.repo.get_access_map.return_value = {budget.id: "owner"}
     # First call (_require_owner → _require_access) returns budget
     # Second call (reload after update) returns updated
     service.repo.get_by_id_with_categories.side_effect = [budget, updated]
@@ -83,6 +85,7 @@ async def test_update_budget_no_changes():
     service = BudgetService(session)
     budget = make_budget(owner_id)
     service.repo = AsyncMock()
+    service.repo.get_access_map.return_value = {budget.id: "owner"}
     service.repo.get_by_id_with_categories.return_value = budget
 
     result = await service.update_budget(budget.id, owner_id, BudgetUpdate())
@@ -98,10 +101,14 @@ async def test_get_summary_no_categories():
     budget = make_budget(owner_id)
     budget.budget_categories = []
     service.repo = AsyncMock()
+    service.repo.get_access_map.return_value = {budget.id: "owner"}
     service.repo.get_by_id_with_categories.return_value = budget
-    service.repo.get_spending_by_category.return_value = {}
+    service.spend_repo = AsyncMock()
+    service.spend_repo.get_spending.return_value = {}
 
     result = await service.get_summary(budget.id, owner_id)
+    service.spend_repo.get_spending.assert_awaited_once_with([(budget.id, result.period_start)])
+    assert result.period_start == date.today().replace(day=1)
     assert result.total_limit == Decimal("0")
     assert result.total_spent == Decimal("0")
     assert result.categories == []
@@ -118,7 +125,7 @@ async def test_invite_collaborator_already_exists():
     invitee.id = invitee_id
     existing_collab = make_collaborator(invitee_id)
     service.repo = AsyncMock()
-    service.repo.get_by_id_with_categories.return_value = budget
+    service.repo.get_access_map.return_value = {budget.id: "owner"}
     service.repo.get_collaborator.return_value = existing_collab
     service.user_repo = AsyncMock()
     service.user_repo.get_by_email.return_value = invitee
@@ -138,7 +145,7 @@ async def test_remove_collaborator_not_found():
     service = BudgetService(session)
     budget = make_budget(owner_id)
     service.repo = AsyncMock()
-    service.repo.get_by_id_with_categories.return_value = budget
+    service.repo.get_access_map.return_value = {budget.id: "owner"}
     service.repo.get_collaborator.return_value = None
 
     with pytest.raises(HTTPException) as exc:
@@ -153,7 +160,7 @@ async def test_update_collaborator_role_not_found():
     service = BudgetService(session)
     budget = make_budget(owner_id)
     service.repo = AsyncMock()
-    service.repo.get_by_id_with_categories.return_value = budget
+    service.repo.get_access_map.return_value = {budget.id: "owner"}
     service.repo.get_collaborator.return_value = None
 
     with pytest.raises(HTTPException) as exc:
@@ -171,8 +178,36 @@ async def test_list_collaborators():
     budget = make_budget(owner_id)
     collabs = [make_collaborator(uuid.uuid4()), make_collaborator(uuid.uuid4())]
     service.repo = AsyncMock()
-    service.repo.get_by_id_with_categories.return_value = budget
+    service.repo.get_access_map.return_value = {budget.id: "owner"}
     service.repo.list_collaborators.return_value = collabs
 
     result = await service.list_collaborators(budget.id, owner_id)
     assert len(result) == 2
+    service.repo.get_by_id_with_categories.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_summaries_reads_current_period_counters():
+    owner_id = uuid.uuid4()
+    session = AsyncMock()
+    service = BudgetService(session)
+    budgets = [make_budget(owner_id), make_budget(owner_id)]
+    category_id = uuid.uuid4()
+    bc = MagicMock()
+    bc.category_id = category_id
+    bc.limit_amount = Decimal("50")
+    bc.category.name = "Food"
+    budgets[0].budget_categories = [bc]
+    service.repo = AsyncMock()
+    service.repo.get_accessible.return_value = budgets
+    service.spend_repo = AsyncMock()
+    service.spend_repo.get_spending.return_value = {budgets[0].id: {category_id: Decimal("20")}}
+
+    result = await service.get_summaries(owner_id)
+    assert [s.budget_id for s in result] == [b.id for b in budgets]
+    assert result[0].total_remaining == Decimal("30")
+    assert result[1].total_spent == Decimal("0")
+    period_start = date.today().replace(day=1)
+    service.spend_repo.get_spending.assert_awaited_once_with(
+        [(b.id, period_start) for b in budgets]
+    )
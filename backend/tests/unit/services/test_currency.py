@@ -5,7 +5,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.utils.currency import convert, get_rate_or_1
+from app.utils.currency import convert, get_rate_or_1, get_rates_or_1
 
 
 @pytest.mark.asyncio
@@ -51,3 +51,20 @@ async def test_convert():
 
     result = await convert(Decimal("100"), "USD", "GBP", mock_repo)
     assert result == Decimal("200.0")
+
+
+@pytest.mark.asyncio
+async def test_get_rates_resolves_pairs_in_one_lookup():
+    """Bulk lookup applies the same fallbacks as get_rate_or_1."""
+    mock_repo = AsyncMock()
+    mock_repo.get_latest_many.return_value = {("USD", "EUR"): Decimal("0.9")}
+
+    rates = await get_rates_or_1(mock_repo, [("USD", "EUR"), ("USD", "XYZ"), ("EUR", "EUR")])
+
+    assert rates == {
+        ("USD", "EUR"): Decimal("0.9"),
+        ("USD", "XYZ"): Decimal("1"),
+        ("EUR", "EUR"): Decimal("1"),
+    }
+    mock_repo.get_latest_many.assert_awaited_once()
+    assert set(mock_repo.get_latest_many.call_args.args[0]) == {("USD", "EUR"), ("USD", "XYZ")}
@@ -60,6 +60,35 @@ async def test_get_latest_rates_with_data():
     assert result.rates["EUR"] == Decimal("0.92")
 
 
+@pytest.mark.asyncio
+async def test_get_latest_rates_fills_missing_targets_from_pivot():
+    from types import SimpleNamespace
+    from unittest.mock import patch
+
+    from app.services import currency as currency_module
+    from app.services.rate_cache import RateCache
+
+    session = AsyncMock()
+    service = CurrencyService(session)
+    service.rate_repo = AsyncMock()
+    service.rate_repo.get_latest_all.return_value = [
+        make_exchange_rate("USD", "EUR", 0.92, date.today()),
+    ]
+    service.rate_repo.get_history.return_value = [
+        SimpleNamespace(base_currency="EUR", target_currency=target, date=date.today(), rate=rate)
+        for target, rate in (("SEK", Decimal("11")), ("USD", Decimal("2")))
+    ]
+    cache = RateCache(ttl_seconds=60, pivot="EUR")
+    await cache.load(service.rate_repo)
+
+    with patch.object(currency_module, "rate_cache", cache):
+        result = await service.get_latest_rates("USD")
+
+    # Stored rows win; the rest is triangulated
+    assert result.rates["EUR"] == Decimal("0.92")
+    assert result.rates["SEK"] == Decimal("5.5")
+
+
 @pytest.mark.asyncio
 async def test_get_latest_rates_empty():
     session = AsyncMock()
@@ -0,0 +1,127 @@
+"""Unit tests for JWKS fetching and OIDC token validation against a stub issuer."""
+
+import asyncio
+import time
+from functools import cache
+
+import httpx
+import pytest
+import rsa
+from jose import JWTError, jwk, jwt
+
+from app.services import auth
+
+ISSUER = "https://test.example.com/"
+AUDIENCE = "test-audience"
+
+
+@cache  # key generation is slow; reuse keys across tests
+def _new_key(kid: str) -> tuple[str, dict]:
+    _, private = rsa.newkeys(1024)
+    pem = private.save_pkcs1().decode()
+    public = jwk.construct(pem, "RS256").public_key().to_dict()
+    return pem, {**public, "kid": kid, "use": "sig"}
+
+
+class StubIssuer:
+    """Serves discovery and JWKS documents and counts the requests it receives."""
+
+    def __init__(self) -> None:
+        self.signing: dict[str, str] = {}
+        self.published: list[dict] = []
+        self.requests: list[str] = []
+
+    def add_key(self, kid: str, publish: bool = True) -> None:
+        pem, public = _new_key(kid)
+        self.signing[kid] = pem
+        if publish:
+            self.published.append(public)
+
+    def token(self, kid: str, signed_with: str | None = None, **claims) -> str:
+        payload = {"sub": "oidc|1", "iss": ISSUER, "aud": AUDIENCE, "exp": time.time() + 300, **claims}
+        return jwt.encode(payload, self.signing[signed_with or kid], algorithm="RS256", headers={"kid": kid})
+
+    @property
+    def jwks_fetches(self) -> int:
+        return self.requests.count("/jwks")
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        await asyncio.sleep(0)  # let concurrent callers pile up
+        if request.url.path == "/.well-known/openid-configuration":
+            return httpx.Response(200, json={"jwks_uri": "https://test.example.com/jwks"})
+        return httpx.Response(200, json={"keys": list(self.published)})
+
+
+@pytest.fixture
+def issuer(monkeypatch):
+    stub = StubIssuer()
+    stub.add_key("k1")
+    monkeypatch.setattr(auth, "_jwks_cache", {})
+    monkeypatch.setattr(auth, "_jwks_uris", {})
+    monkeypatch.setattr(auth, "_jwks_refreshes", {})
+    monkeypatch.setattr(auth, "_last_early_refresh", {})
+    monkeypatch.setattr(auth, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(stub.handle)))
+    monkeypatch.setattr(auth.settings, "oidc_issuer_url", ISSUER)
+    monkeypatch.setattr(auth.settings, "oidc_audience", AUDIENCE)
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_validations_share_one_fetch(issuer):
+    token = issuer.token("k1")
+    results = await asyncio.gather(*(auth.validate_oidc_token(token) for _ in range(20)))
+
+    assert all(claims["sub"] == "oidc|1" for claims in results)
+    assert issuer.requests == ["/.well-known/openid-configuration", "/jwks"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_forces_one_refresh(issuer):
+    await auth.validate_oidc_token(issuer.token("k1"))
+    issuer.add_key("k2")  # rotation
+
+    claims = await auth.validate_oidc_token(issuer.token("k2"))
+    assert claims["sub"] == "oidc|1"
+    assert issuer.jwks_fetches == 2
+    # Discovery is not repeated for refreshes
+    assert issuer.requests.count("/.well-known/openid-configuration") == 1
+
+
+@pytest.mark.asyncio
+async def test_forced_refreshes_are_rate_limited(issuer):
+    await auth.validate_oidc_token(issuer.token("k1"))
+    issuer.add_key("forged", publish=False)
+    forged = issuer.token("forged")
+
+    for _ in range(5):
+        with pytest.raises(JWTError):
+            await auth.validate_oidc_token(forged)
+    assert issuer.jwks_fetches == 2  # initial fetch + one forced refresh
+
+
+@pytest.mark.asyncio
+async def test_known_kid_with_bad_signature_does_not_refresh(issuer):
+    await auth.validate_oidc_token(issuer.token("k1"))
+    issuer.add_key("other", publish=False)
+
+    with pytest.raises(JWTError):
+        await auth.validate_oidc_token(issuer.token("k1", signed_with="other"))
+    assert issuer.jwks_fetches == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_near_expiry_refresh_in_background(issuer):
+    token = issuer.token("k1")
+    await auth.validate_oidc_token(token)
+    generation = auth.jwks_generation()
+    auth._jwks_cache[ISSUER]["fetched_at"] -= auth.JWKS_REFRESH_AHEAD + 1
+
+    # Served from the cached keys without waiting for the issuer
+    assert (await auth.validate_oidc_token(token))["sub"] == "oidc|1"
+    refresh = auth._jwks_refreshes[ISSUER]
+    await refresh
+
+    assert issuer.jwks_fetches == 2
+    assert auth.jwks_generation() == generation + 1
+    assert time.monotonic() - auth._jwks_cache[ISSUER]["fetched_at"] < auth.JWKS_REFRESH_AHEAD
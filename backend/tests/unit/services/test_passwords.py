@@ -0,0 +1,72 @@
+"""Unit tests for the password hashing thread pool."""
+
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+
+from app.services.passwords import PasswordPool, PasswordPoolFull, hash_password, verify_password
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip():
+    password_hash = await hash_password("s3cret")
+    assert bcrypt.checkpw(b"s3cret", password_hash.encode())
+    assert await verify_password("s3cret", password_hash)
+    assert not await verify_password("wrong", password_hash)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_and_stats_track_depth():
+    pool = PasswordPool(workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        first = asyncio.ensure_future(pool.run(release.wait))
+        while pool.running == 0:
+            await asyncio.sleep(0.001)
+        second = asyncio.ensure_future(pool.run(lambda: "done"))
+        await asyncio.sleep(0)
+        assert pool.stats()["queued"] == 1
+
+        with pytest.raises(PasswordPoolFull):
+            await pool.run(lambda: "rejected")
+
+        release.set()
+        assert await first is True
+        assert await second == "done"
+    finally:
+        release.set()
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["peak_queued"] == 1
+    assert (stats["queued"], stats["running"]) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_calls_give_back_their_slots():
+    pool = PasswordPool(workers=1, max_queue=2)
+    release = threading.Event()
+    try:
+        first = asyncio.ensure_future(pool.run(release.wait))
+        while pool.running == 0:
+            await asyncio.sleep(0.001)
+        queued = [asyncio.ensure_future(pool.run(lambda: "never")) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert pool.stats()["queued"] == 2
+
+        for call in queued:
+            call.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        assert pool.stats()["queued"] == 0
+
+        release.set()
+        assert await first is True
+        assert await pool.run(lambda: "ok") == "ok"
+    finally:
+        release.set()
+        pool.shutdown()
+    assert pool.stats()["rejected"] == 0
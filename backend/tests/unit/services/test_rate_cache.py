@@ -0,0 +1,248 @@
+"""Unit tests for the in-process exchange rate snapshot."""
+
+import asyncio
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.rate_cache import RateCache, RateSeries, RateSnapshot
+from app.utils import currency
+
+YESTERDAY = date.today() - timedelta(days=1)
+
+
+def history_rows(points):
+    """points: {(base, target): [(date, rate), ...]} -> rows sorted like get_history."""
+    return [
+        SimpleNamespace(base_currency=base, target_currency=target, date=day, rate=rate)
+        for (base, target), series in sorted(points.items())
+        for day, rate in sorted(series)
+    ]
+
+
+def make_repo(rates):
+    """Repo whose history holds one rate per pair, dated yesterday."""
+    repo = AsyncMock()
+    repo.get_history.return_value = history_rows(
+        {pair: [(YESTERDAY, rate)] for pair, rate in rates.items()}
+    )
+    return repo
+
+
+@pytest.fixture
+def cache():
+    fresh = RateCache(ttl_seconds=60)
+    with patch.object(currency, "rate_cache", fresh):
+        yield fresh
+
+
+@pytest.mark.asyncio
+async def test_unloaded_cache_falls_through_to_repo(cache):
+    repo = AsyncMock()
+    mock_rate = MagicMock()
+    mock_rate.rate = 1.1
+    repo.get_latest.return_value = mock_rate
+
+    assert await currency.get_rate_or_1(repo, "USD", "EUR") == Decimal("1.1")
+    repo.get_latest.assert_awaited_once()
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_loaded_cache_answers_without_queries(cache):
+    repo = make_repo({("USD", "EUR"): Decimal("0.9")})
+    await cache.load(repo)
+
+    assert await currency.get_rate_or_1(repo, "USD", "EUR") == Decimal("0.9")
+    # A loaded snapshot is complete, so an absent pair means no stored rate
+    assert await currency.get_rate_or_1(repo, "USD", "XYZ") == Decimal("1")
+    rates = await currency.get_rates_or_1(repo, [("USD", "EUR"), ("EUR", "EUR")])
+
+    assert rates == {("USD", "EUR"): Decimal("0.9"), ("EUR", "EUR"): Decimal("1")}
+    repo.get_latest.assert_not_called()
+    repo.get_latest_many.assert_not_called()
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_load_swaps_snapshot(cache):
+    await cache.load(make_repo({("USD", "EUR"): Decimal("0.9")}))
+    before = await cache.snapshot(AsyncMock())
+
+    await cache.load(make_repo({("USD", "EUR"): Decimal("0.8")}))
+
+    assert before.direct == {("USD", "EUR"): Decimal("0.9")}
+    assert (await cache.snapshot(AsyncMock())).direct == {("USD", "EUR"): Decimal("0.8")}
+    assert cache.stats()["reloads"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_reloads_once_in_the_background(cache):
+    await cache.load(make_repo({("USD", "EUR"): Decimal("0.9")}))
+    fresh = make_repo({("USD", "EUR"): Decimal("0.7")})
+    released = asyncio.Event()
+    rows = fresh.get_history.return_value
+
+    async def slow_history(since):
+        await released.wait()
+        return rows
+
+    fresh.get_history.side_effect = slow_history
+    cache.session_factory = MagicMock(return_value=AsyncMock())
+    request_repo = AsyncMock()
+
+    with (
+        patch("app.services.rate_cache.time.monotonic", return_value=10**9),
+        patch("app.services.rate_cache.ExchangeRateRepository", return_value=fresh),
+    ):
+        # Lookups keep getting the old snapshot while one reload runs
+        rates = await asyncio.gather(
+            *(currency.get_rate_or_1(request_repo, "USD", "EUR") for _ in range(5))
+        )
+        assert rates == [Decimal("0.9")] * 5
+        released.set()
+        await cache.start_refresh()
+        assert await currency.get_rate_or_1(request_repo, "USD", "EUR") == Decimal("0.7")
+
+    fresh.get_history.assert_awaited_once()
+    request_repo.get_history.assert_not_called()
+    assert cache.stats()["reloads"] == 2
+
+
+def test_stats_before_load():
+    stats = RateCache(ttl_seconds=60).stats()
+    assert stats["loaded"] is False
+    assert stats["pairs"] == 0
+    assert stats["age_seconds"] is None
+
+
+def test_snapshot_triangulates_through_pivot():
+    snapshot = RateSnapshot(
+        {
+            ("EUR", "USD"): Decimal("1.1"),
+            ("EUR", "JPY"): Decimal("165"),
+            ("EUR", "CHF"): Decimal("0.95"),
+            ("USD", "CHF"): Decimal("0.86"),
+        },
+        pivot="EUR",
+    )
+
+    assert snapshot.get("USD", "JPY") == Decimal("150.00000000")
+    assert snapshot.get("JPY", "EUR") == Decimal("0.00606061")
+    # A stored pair wins over the cross rate
+    assert snapshot.get("USD", "CHF") == Decimal("0.86")
+    assert snapshot.get("USD", "XYZ") is None
+
+
+def test_snapshot_uses_inverse_pivot_quotes():
+    snapshot = RateSnapshot(
+        {("EUR", "USD"): Decimal("1.25"), ("GBP", "EUR"): Decimal("1.2")}, pivot="EUR"
+    )
+
+    assert snapshot.get("GBP", "USD") == Decimal("1.50000000")
+
+
+def test_rates_from_prices_every_known_currency():
+    snapshot = RateSnapshot(
+        {("EUR", "USD"): Decimal("2"), ("EUR", "JPY"): Decimal("300")}, pivot="EUR"
+    )
+
+    assert snapshot.rates_from("USD") == {
+        "EUR": Decimal("0.50000000"),
+        "JPY": Decimal("150.00000000"),
+    }
+    assert snapshot.currencies == 3
+
+
+@pytest.mark.asyncio
+async def test_get_rate_triangulates_when_loaded(cache):
+    repo = make_repo({("EUR", "USD"): Decimal("2"), ("EUR", "NOK"): Decimal("10")})
+    await cache.load(repo)
+
+    assert await currency.get_rate_or_1(repo, "USD", "NOK") == Decimal("5")
+    assert await currency.get_rates_or_1(repo, [("NOK", "USD")]) == {
+        ("NOK", "USD"): Decimal("0.2")
+    }
+    repo.get_latest.assert_not_called()
+
+
+def test_series_bisects_to_rate_in_force():
+    series = RateSeries(
+        [
+            (date(2024, 1, 2), Decimal("1.10")),
+            (date(2024, 1, 5), Decimal("1.20")),
+            (date(2024, 1, 8), Decimal("1.30")),
+        ]
+    )
+
+    assert series.at(date(2024, 1, 5)) == Decimal("1.2")
+    # Weekend: the Friday rate is still in force
+    assert series.at(date(2024, 1, 7)) == Decimal("1.2")
+    assert series.at(date(2030, 1, 1)) == Decimal("1.3")
+    # Before the series starts, its earliest rate is used
+    assert series.at(date(2023, 12, 1)) == Decimal("1.1")
+
+
+def test_series_returns_stored_rates_exactly():
+    rates = [Decimal("0.10000001"), Decimal("149.12345678"), Decimal("1320")]
+    series = RateSeries((date(2024, 1, day), rate) for day, rate in enumerate(rates, start=1))
+
+    assert [series.at(date(2024, 1, day)) for day in (1, 2, 3)] == rates
+    assert str(series.at(date(2024, 1, 2))) == "149.12345678"
+
+
+def test_snapshot_as_of_triangulates_with_historical_rates():
+    since = date(2024, 1, 1)
+    snapshot = RateSnapshot.from_rows(
+        history_rows(
+            {
+                ("EUR", "USD"): [(date(2024, 1, 2), Decimal("1")), (date(2024, 2, 1), Decimal("2"))],
+                ("EUR", "NOK"): [(date(2024, 1, 2), Decimal("10"))],
+            }
+        ),
+        pivot="EUR",
+        since=since,
+    )
+
+    assert snapshot.get("USD", "NOK", date(2024, 1, 15)) == Decimal("10")
+    assert snapshot.get("USD", "NOK", date(2024, 2, 15)) == Decimal("5")
+    assert snapshot.get("USD", "NOK") == Decimal("5")
+    assert snapshot.covers(since) and not snapshot.covers(date(2023, 12, 31))
+
+
+@pytest.mark.asyncio
+async def test_backdated_lookup_uses_history(cache):
+    repo = AsyncMock()
+    repo.get_history.return_value = history_rows(
+        {("USD", "EUR"): [(YESTERDAY - timedelta(days=30), Decimal("0.8")), (YESTERDAY, Decimal("0.9"))]}
+    )
+    await cache.load(repo)
+
+    backdated = YESTERDAY - timedelta(days=10)
+    assert await currency.get_rate_or_1(repo, "USD", "EUR", backdated) == Decimal("0.8")
+    assert await currency.get_rates_or_1(repo, [("USD", "EUR")], on=backdated) == {
+        ("USD", "EUR"): Decimal("0.8")
+    }
+    # Today and future dates use the latest rate
+    assert await currency.get_rate_or_1(repo, "USD", "EUR", date.today()) == Decimal("0.9")
+    repo.get_as_of.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_dates_older_than_history_query_the_repo(cache):
+    repo = make_repo({("USD", "EUR"): Decimal("0.9")})
+    await cache.load(repo)
+    old_rate = MagicMock()
+    old_rate.rate = 0.75
+    repo.get_as_of.return_value = old_rate
+
+    old = date.today() - timedelta(days=cache.history_days + 30)
+    assert await currency.get_rate_or_1(repo, "USD", "EUR", old) == Decimal("0.75")
+    repo.get_as_of.assert_awaited_once_with("USD", "EUR", old)
+
+    # No stored row at all: today's cross rate rather than 1
+    repo.get_as_of.return_value = None
+    assert await currency.get_rate_or_1(repo, "USD", "EUR", old) == Decimal("0.9")
@@ -1,7 +1,7 @@
 """Unit tests for RecurringService."""
 
 import uuid
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock
 
@@ -105,6 +105,23 @@ async def test_update_rule_with_changes():
     assert result is updated
 
 
+@pytest.mark.asyncio
+async def test_resuming_a_paused_rule_skips_missed_occurrences():
+    session = AsyncMock()
+    service = RecurringService(session)
+    existing = make_rule()
+    existing.status = "paused"
+    existing.frequency = "weekly"
+    existing.next_occurrence = date.today() - timedelta(days=40)
+    service.repo = AsyncMock()
+    service.repo.get_by_id_and_user.return_value = existing
+
+    await service.update_rule(existing.id, existing.user_id, RecurringRuleUpdate(status="active"))
+    kwargs = service.repo.update.call_args.kwargs
+    # 40 days back plus six weeks is the first weekly occurrence from today on
+    assert kwargs == {"status": "active", "next_occurrence": date.today() + timedelta(days=2)}
+
+
 @pytest.mark.asyncio
 async def test_delete_rule():
     session = AsyncMock()
@@ -0,0 +1,100 @@
+"""Unit tests for the versioned report cache."""
+
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.report_cache import LRUCacheBackend, ReportCache
+
+
+def make_cache(max_entries=10, ttl_seconds=60):
+    return ReportCache(LRUCacheBackend(max_entries, ttl_seconds))
+
+
+@pytest.mark.asyncio
+async def test_second_lookup_hits():
+    cache = make_cache()
+    user_id = uuid.uuid4()
+    compute = AsyncMock(return_value="report")
+
+    assert await cache.get_or_compute(user_id, "spending", {"a": 1}, compute) == "report"
+    assert await cache.get_or_compute(user_id, "spending", {"a": 1}, compute) == "report"
+
+    compute.assert_awaited_once()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_parameters_and_endpoint_are_part_of_key():
+    cache = make_cache()
+    user_id = uuid.uuid4()
+    compute = AsyncMock(return_value="report")
+
+    await cache.get_or_compute(user_id, "spending", {"a": 1}, compute)
+    await cache.get_or_compute(user_id, "spending", {"a": 2}, compute)
+    await cache.get_or_compute(user_id, "trends", {"a": 1}, compute)
+    await cache.get_or_compute(uuid.uuid4(), "spending", {"a": 1}, compute)
+
+    assert compute.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_user_version_bump_only_invalidates_that_user():
+    cache = make_cache()
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+    compute = AsyncMock(return_value="report")
+    for user_id in (alice, bob):
+        await cache.get_or_compute(user_id, "spending", {}, compute)
+
+    cache.bump_user(alice)
+    await cache.get_or_compute(alice, "spending", {}, compute)
+    await cache.get_or_compute(bob, "spending", {}, compute)
+
+    assert compute.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_global_version_bump_invalidates_everyone():
+    cache = make_cache()
+    compute = AsyncMock(return_value="report")
+    user_id = uuid.uuid4()
+    await cache.get_or_compute(user_id, "net-worth", {}, compute)
+
+    cache.bump_global()
+    await cache.get_or_compute(user_id, "net-worth", {}, compute)
+
+    assert compute.await_count == 2
+
+
+def test_lru_evicts_least_recently_used():
+    backend = LRUCacheBackend(max_entries=2, ttl_seconds=60)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    assert backend.get("a") == 1
+    backend.set("c", 3)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert len(backend) == 2
+
+
+def test_lru_expires_entries_after_ttl():
+    backend = LRUCacheBackend(max_entries=10, ttl_seconds=5)
+    with patch("app.services.report_cache.time.monotonic", return_value=100.0):
+        backend.set("a", 1)
+    with patch("app.services.report_cache.time.monotonic", return_value=104.9):
+        assert backend.get("a") == 1
+    with patch("app.services.report_cache.time.monotonic", return_value=105.0):
+        assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_computes():
+    cache = ReportCache(LRUCacheBackend(10, 60), enabled=False)
+    compute = AsyncMock(return_value="report")
+    await cache.get_or_compute(uuid.uuid4(), "spending", {}, compute)
+    await cache.get_or_compute(uuid.uuid4(), "spending", {}, compute)
+    assert compute.await_count == 2
+    assert cache.stats()["hits"] == 0
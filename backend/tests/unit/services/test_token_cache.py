@@ -0,0 +1,99 @@
+"""Unit tests for the verified-claims cache."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.dependencies import _verify_token
+from app.services.token_cache import ClaimsCache
+
+
+def _claims(exp_in: float = 300, **extra):
+    return {"sub": "oidc|1", "iss": "https://test.example.com/", "exp": time.time() + exp_in, **extra}
+
+
+def test_hit_until_exp():
+    cache = ClaimsCache(max_entries=10)
+    cache.put("token", _claims(), generation=1)
+    assert cache.get("token", 1)["sub"] == "oidc|1"
+    assert cache.get("other", 1) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entry_is_dropped():
+    cache = ClaimsCache(max_entries=10)
+    cache.put("token", _claims(exp_in=-1), generation=1)
+    assert cache.get("token", 1) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_jwks_refresh_bypasses_oidc_entries_only():
+    cache = ClaimsCache(max_entries=10)
+    cache.put("oidc", _claims(), generation=1)
+    cache.put("local", _claims(iss="local"), generation=None)
+    assert cache.get("oidc", 2) is None
+    assert cache.get("local", 2) is not None
+
+
+def test_tokens_without_exp_are_not_cached():
+    cache = ClaimsCache(max_entries=10)
+    cache.put("token", {"sub": "oidc|1"}, generation=1)
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_bound_evicts_oldest():
+    cache = ClaimsCache(max_entries=2)
+    for token in ("a", "b"):
+        cache.put(token, _claims(), generation=1)
+    cache.get("a", 1)
+    cache.put("c", _claims(), generation=1)
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None
+
+
+def test_disabled_cache_never_hits():
+    cache = ClaimsCache(max_entries=10, enabled=False)
+    cache.put("token", _claims(), generation=1)
+    assert cache.get("token", 1) is None
+
+
+@pytest.mark.asyncio
+async def test_repeat_token_skips_verification_until_jwks_refresh():
+    token = "header.payload.signature"
+    validate = AsyncMock(return_value=_claims())
+    with (
+        patch("app.dependencies.claims_cache", ClaimsCache(max_entries=10)),
+        patch("app.dependencies.validate_oidc_token", validate),
+        patch("jose.jwt.get_unverified_claims", return_value={"iss": "https://test.example.com/"}),
+        patch("app.dependencies.jwks_generation", return_value=1) as generation,
+    ):
+        assert (await _verify_token(token))["sub"] == "oidc|1"
+        await _verify_token(token)
+        assert validate.await_count == 1
+
+        generation.return_value = 2
+        await _verify_token(token)
+        assert validate.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_entry_is_tagged_with_the_generation_it_was_validated_under():
+    token = "header.payload.signature"
+    generation = {"current": 1}
+
+    async def validate_with_refresh(_token):
+        # An unknown kid makes validation refetch the JWKS first
+        generation["current"] = 2
+        return _claims()
+
+    validate = AsyncMock(side_effect=validate_with_refresh)
+    with (
+        patch("app.dependencies.claims_cache", ClaimsCache(max_entries=10)),
+        patch("app.dependencies.validate_oidc_token", validate),
+        patch("jose.jwt.get_unverified_claims", return_value={"iss": "https://test.example.com/"}),
+        patch("app.dependencies.jwks_generation", side_effect=lambda: generation["current"]),
+    ):
+        await _verify_token(token)
+        await _verify_token(token)
+        assert validate.await_count == 1
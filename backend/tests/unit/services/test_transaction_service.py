@@ -63,6 +63,7 @@ async def test_create_transaction_snapshots_exchange_rate():
     service = TransactionService(session)
     service.repo = AsyncMock()
     service.rate_repo = AsyncMock()
+    service.effects = AsyncMock()
 
     new_tx = make_transaction()
     service.repo.create.return_value = new_tx
@@ -108,10 +109,12 @@ async def test_delete_transaction():
     service = TransactionService(session)
     existing = make_transaction()
     service.repo = AsyncMock()
+    service.effects = AsyncMock()
     service.repo.get_by_id_and_user.return_value = existing
 
     await service.delete_transaction(existing.id, existing.user_id)
     service.repo.delete.assert_called_once_with(existing)
+    service.effects.apply.assert_called_once_with([existing], sign=-1)
 
 
 @pytest.mark.asyncio
@@ -119,7 +122,7 @@ async def test_list_transactions_uses_paginated_repo():
     session = AsyncMock()
     service = TransactionService(session)
     service.repo = AsyncMock()
-    service.repo.list_paginated.return_value = ([], 0)
+    service.repo.list_paginated.return_value = ([], 0, None)
 
     filters = TransactionFilters(page=1, page_size=20)
     result = await service.list_transactions(uuid.uuid4(), filters)
@@ -128,3 +131,35 @@ async def test_list_transactions_uses_paginated_repo():
     assert result.items == []
     assert result.page == 1
     assert result.pages == 0
+
+
+@pytest.mark.asyncio
+async def test_update_transaction_amount_swaps_ledger_effect():
+    session = AsyncMock()
+    service = TransactionService(session)
+    existing = make_transaction()
+    existing.account_exchange_rate = Decimal("1")
+    service.repo = AsyncMock()
+    service.effects = AsyncMock()
+    service.repo.get_by_id_and_user.return_value = existing
+    service.repo.update.return_value = existing
+
+    await service.update_transaction(existing.id, existing.user_id, TransactionUpdate(amount=Decimal("75")))
+
+    calls = service.effects.apply.call_args_list
+    assert calls[0].args == ([existing],) and calls[0].kwargs == {"sign": -1}
+    assert calls[1].args == ([existing],) and calls[1].kwargs == {}
+
+
+@pytest.mark.asyncio
+async def test_update_transaction_notes_leaves_ledger_untouched():
+    session = AsyncMock()
+    service = TransactionService(session)
+    existing = make_transaction()
+    service.repo = AsyncMock()
+    service.effects = AsyncMock()
+    service.repo.get_by_id_and_user.return_value = existing
+
+    await service.update_transaction(existing.id, existing.user_id, TransactionUpdate(notes="x"))
+
+    service.effects.apply.assert_not_called()
@@ -2,7 +2,7 @@
 
 import pytest
 
-from app.utils.pagination import build_paginated_response
+from app.utils.pagination import build_paginated_response, decode_cursor, encode_cursor
 
 
 def test_paginated_response_single_page():
@@ -38,3 +38,23 @@ def test_paginated_response_last_page():
 def test_paginated_response_zero_page_size():
     result = build_paginated_response([], total=10, page=1, page_size=0)
     assert result.pages == 0
+
+
+def test_paginated_response_without_total():
+    result = build_paginated_response([1, 2], total=None, page=1, page_size=2, next_cursor="abc")
+    assert result.total is None
+    assert result.pages is None
+    assert result.next_cursor == "abc"
+
+
+def test_cursor_round_trip():
+    values = ["2024-03-15", "6f1c2d3e-0000-0000-0000-000000000001"]
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == values
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!!", "bm90IGpzb24", "eyJhIjogMX0"])
+def test_decode_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,34 @@
+"""Unit tests for splitting report ranges into whole and partial months."""
+
+from datetime import date
+
+from app.repositories.reports import split_range
+
+
+def test_whole_months_only():
+    assert split_range(date(2024, 1, 1), date(2024, 3, 31)) == (("2024-01", "2024-03"), [])
+
+
+def test_partial_edges():
+    months, edges = split_range(date(2024, 1, 20), date(2024, 4, 10))
+    assert months == ("2024-02", "2024-03")
+    assert edges == [(date(2024, 1, 20), date(2024, 1, 31)), (date(2024, 4, 1), date(2024, 4, 10))]
+
+
+def test_leap_february_is_whole():
+    assert split_range(date(2024, 2, 1), date(2024, 2, 29)) == (("2024-02", "2024-02"), [])
+
+
+def test_within_single_month():
+    assert split_range(date(2024, 5, 2), date(2024, 5, 30)) == (None, [(date(2024, 5, 2), date(2024, 5, 30))])
+
+
+def test_adjacent_partial_months():
+    assert split_range(date(2024, 5, 2), date(2024, 6, 3)) == (
+        None,
+        [(date(2024, 5, 2), date(2024, 6, 3))],
+    )
+
+
+def test_empty_range():
+    assert split_range(date(2024, 5, 2), date(2024, 5, 1)) == (None, [])
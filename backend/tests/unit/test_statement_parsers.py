@@ -0,0 +1,128 @@
+"""Unit tests for the CSV/OFX/QIF statement parsers."""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.utils.statement_parsers import (
+    ParsedRow,
+    RowError,
+    detect_format,
+    parse_csv,
+    parse_ofx,
+    parse_qif,
+    parse_statement,
+)
+
+
+def test_csv_signed_amount_column():
+    lines = [
+        "Date,Description,Amount,Currency\n",
+        "2024-01-05,Coffee,-3.50,eur\n",
+        "2024-01-06,Salary,\"1,200.00\",\n",
+    ]
+    rows = list(parse_csv(lines))
+    assert rows == [
+        ParsedRow(line=2, date=date(2024, 1, 5), amount=Decimal("-3.50"), currency="EUR", description="Coffee"),
+        ParsedRow(line=3, date=date(2024, 1, 6), amount=Decimal("1200.00"), currency=None, description="Salary"),
+    ]
+
+
+def test_csv_debit_credit_columns_and_date_format():
+    lines = ["Posted Date,Payee,Debit,Credit", "05/01/2024,Shop,12.00,", "06/01/2024,Refund,,4.00"]
+    rows = list(parse_csv(lines, date_format="%d/%m/%Y"))
+    assert [(r.date, r.amount) for r in rows] == [
+        (date(2024, 1, 5), Decimal("-12.00")),
+        (date(2024, 1, 6), Decimal("4.00")),
+    ]
+
+
+def test_csv_bad_row_is_reported_and_parsing_continues():
+    rows = list(parse_csv(["date,amount", "not-a-date,1", "", "2024-02-01,2"]))
+    assert isinstance(rows[0], RowError) and rows[0].line == 2
+    assert isinstance(rows[1], ParsedRow) and rows[1].amount == Decimal("2")
+
+
+def test_csv_decimal_comma_amounts():
+    lines = ["date,amount", '2024-01-01,"12,50"', '2024-01-02,"-1.234,56"', '2024-01-03,"1,234,56"']
+    rows = list(parse_csv(lines))
+    assert [r.amount for r in rows[:2]] == [Decimal("12.50"), Decimal("-1234.56")]
+    assert isinstance(rows[2], RowError) and "Ambiguous amount" in rows[2].detail
+
+
+def test_csv_missing_columns():
+    rows = list(parse_csv(["when,what", "2024-01-01,x"]))
+    assert len(rows) == 1 and isinstance(rows[0], RowError)
+
+
+def test_csv_is_lazy():
+    def lines():
+        yield "date,amount\n"
+        yield "2024-01-01,1\n"
+        raise AssertionError("parser read past the first row")
+
+    assert next(parse_csv(lines())).amount == Decimal("1")
+
+
+def test_ofx_sgml_statement():
+    lines = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<CURDEF>GBP
+<BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240115120000[0:GMT]
+<TRNAMT>-42.10
+<NAME>Grocer
+<MEMO>Weekly shop
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240116<TRNAMT>100.00<NAME>Transfer in</STMTTRN>
+<STMTTRN>
+<TRNAMT>5.00
+</STMTTRN>
+</BANKTRANLIST>
+""".splitlines()
+    rows = list(parse_ofx(lines))
+    assert rows[0] == ParsedRow(
+        line=5, date=date(2024, 1, 15), amount=Decimal("-42.10"), currency="GBP",
+        description="Grocer - Weekly shop",
+    )
+    assert (rows[1].date, rows[1].amount, rows[1].description) == (
+        date(2024, 1, 16), Decimal("100.00"), "Transfer in",
+    )
+    assert isinstance(rows[2], RowError)
+
+
+def test_qif_records():
+    lines = [
+        "!Type:Bank",
+        "D01/15/2024",
+        "T-25.00",
+        "PElectric Co",
+        "^",
+        "D1/16'24",
+        "U1,000.00",
+        "MBonus",
+        "^",
+        "D13/45/2024",
+        "T1",
+        "^",
+    ]
+    rows = list(parse_qif(lines))
+    assert rows[0] == ParsedRow(line=2, date=date(2024, 1, 15), amount=Decimal("-25.00"), description="Electric Co")
+    assert (rows[1].date, rows[1].amount, rows[1].description) == (date(2024, 1, 16), Decimal("1000.00"), "Bonus")
+    assert isinstance(rows[2], RowError) and rows[2].line == 10
+
+
+@pytest.mark.parametrize(
+    "filename, expected",
+    [("stmt.CSV", "csv"), ("a.qfx", "ofx"), ("b.ofx", "ofx"), ("c.qif", "qif"), ("d.pdf", None), (None, None)],
+)
+def test_detect_format(filename, expected):
+    assert detect_format(filename) == expected
+
+
+def test_parse_statement_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        parse_statement("xls", [])
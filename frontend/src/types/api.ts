@@ -4,6 +4,7 @@ export interface PaginatedResponse<T> {
   page: number;
   page_size: number;
   pages: number;
+  next_cursor?: string | null;
 }
 
 export interface ErrorDetail {